@@ -29,6 +29,7 @@
 
 Log("FreeCAD test running...\n\n")
 
+import os
 import sys
 
 import FreeCAD
@@ -36,7 +37,7 @@ import TestApp
 
 testCase = FreeCAD.ConfigGet("TestCase")
 
-testResult = TestApp.TestText(testCase)
+testResult = TestApp.TestText(testCase, os.environ.get("FREECAD_TEST_RESULT_FILE"))
 
 Log("FreeCAD test done\n")
 
@@ -22,6 +22,8 @@
 # *                                                                         *
 # ***************************************************************************
 
+import concurrent.futures
+import multiprocessing
 import os
 import platform
 import shutil
@@ -61,3 +63,16 @@ def get_python_exe() -> str:
     python_exe = python_exe.replace("/", os.path.sep)
     prefs.SetString("ExternalPythonExecutable", python_exe)
     return python_exe
+
+
+def create_process_pool(max_workers=None):
+    """Create a pool of worker processes running the Python interpreter found by
+    get_python_exe(), as FreeCAD itself cannot be used as interpreter for them.
+    Returns a concurrent.futures.ProcessPoolExecutor, or None if no interpreter was found.
+    The functions submitted to the pool must be importable by that interpreter."""
+    python_exe = get_python_exe()
+    if not python_exe:
+        return None
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(python_exe)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
@@ -23,7 +23,10 @@
 
 #include "PreCompiled.h"
 #ifndef _PreComp_
+#include <algorithm>
 #include <cmath>
+#include <map>
+#include <unordered_map>
 #include <vector>
 #endif
 
@@ -138,36 +141,59 @@ void BomObject::saveCustomColumnData()
 void BomObject::generateBOM()
 {
     saveCustomColumnData();
-    clearAll();
     obj_list.clear();
-    size_t row = 0;
-    size_t col = 0;
 
-    // Populate headers
-    for (auto& columnName : columnsNames.getValues()) {
-        setCell(App::CellAddress(row, col), columnName.c_str());
-        ++col;
-    }
-    ++row;
+    // First build the list of entries in a single pass over the tree, then write them.
+    std::vector<BomEntry> entries;
+    RowIndex rowsOfObject;
+    SubTreeCache subTrees;
+    bool hasQuantityCol = hasQuantityColumn();
 
     auto* assembly = getAssembly();
     if (assembly) {
-        addObjectChildrenToBom(assembly->getOutList(), row, "");
+        collectChildren(assembly->getOutList(),
+                        "",
+                        hasQuantityCol,
+                        entries,
+                        rowsOfObject,
+                        subTrees);
     }
     else {
-        addObjectChildrenToBom(getDocument()->getRootObjectsIgnoreLinks(), row, "");
+        collectChildren(getDocument()->getRootObjectsIgnoreLinks(),
+                        "",
+                        hasQuantityCol,
+                        entries,
+                        rowsOfObject,
+                        subTrees);
+    }
+
+    // Custom data, by object name and column name. The first element found is used.
+    std::map<std::pair<std::string, std::string>, std::string> customData;
+    for (auto& el : dataElements) {
+        customData.emplace(std::make_pair(el.objName, el.columnName), el.value);
+    }
+
+    std::vector<std::vector<std::string>> table;
+    table.reserve(entries.size() + 1);
+    table.push_back(columnsNames.getValues());
+    for (auto& entry : entries) {
+        obj_list.push_back(entry.obj);
+        table.push_back(getBomRow(entry, customData));
     }
+
+    writeTable(table);
 }
 
-void BomObject::addObjectChildrenToBom(std::vector<App::DocumentObject*> objs,
-                                       size_t& row,
-                                       std::string index)
+void BomObject::collectChildren(const std::vector<App::DocumentObject*>& objs,
+                                const std::string& parentIndex,
+                                bool hasQuantityCol,
+                                std::vector<BomEntry>& entries,
+                                RowIndex& rowsOfObject,
+                                SubTreeCache& subTrees)
 {
-    int quantityColIndex = getColumnIndex("Quantity");
-    bool hasQuantityCol = hasQuantityColumn();
-
-    size_t siblingsInitialRow = row;
+    size_t siblingsInitialRow = entries.size();
 
+    std::string index = parentIndex;
     if (index != "") {
         index = index + ".";
     }
@@ -190,76 +216,141 @@ void BomObject::addObjectChildrenToBom(std::vector<App::DocumentObject*> objs,
             continue;
         }
 
-        if (hasQuantityCol && row != siblingsInitialRow) {
-            // Check if the object is not already in (case of links). And if so just increment.
+        if (hasQuantityCol) {
+            // Check if the object is already in the rows added since the first sibling (case of
+            // links). And if so just increment.
             // Note: an object can be used in several parts. In which case we do no want to blindly
             // increment.
-            bool found = false;
-            for (size_t i = siblingsInitialRow; i <= row; ++i) {
-                size_t idInList = i - 1;  // -1 for the header
-                if (idInList < obj_list.size() && child == obj_list[idInList]) {
-
-                    int qty = std::stoi(getText(i, quantityColIndex)) + 1;
-                    setCell(App::CellAddress(i, quantityColIndex), std::to_string(qty).c_str());
-                    found = true;
-                    break;
+            auto it = rowsOfObject.find(child);
+            if (it != rowsOfObject.end()) {
+                auto& rows = it->second;
+                auto found = std::lower_bound(rows.begin(), rows.end(), siblingsInitialRow);
+                if (found != rows.end()) {
+                    ++entries[*found].quantity;
+                    continue;
                 }
             }
-            if (found) {
-                continue;
-            }
         }
 
         std::string sub_index = index + std::to_string(sub_i);
         ++sub_i;
 
-        addObjectToBom(child, row, sub_index);
-        ++row;
+        rowsOfObject[child].push_back(entries.size());
+        entries.push_back({child, sub_index, 1});
 
         if ((child->isDerivedFrom<AssemblyObject>() && detailSubAssemblies.getValue())
             || (child->isDerivedFrom<App::Part>() && detailParts.getValue())) {
-            addObjectChildrenToBom(child->getOutList(), row, sub_index);
+            auto cached = subTrees.find(child);
+            if (cached != subTrees.end()) {
+                // The content of a sub-assembly does not depend on where it is used, so the
+                // entries generated for its first occurrence are reused with the new index.
+                for (auto& subEntry : cached->second) {
+                    rowsOfObject[subEntry.obj].push_back(entries.size());
+                    entries.push_back(
+                        {subEntry.obj, sub_index + "." + subEntry.index, subEntry.quantity});
+                }
+                continue;
+            }
+
+            size_t subTreeStart = entries.size();
+            collectChildren(child->getOutList(),
+                            sub_index,
+                            hasQuantityCol,
+                            entries,
+                            rowsOfObject,
+                            subTrees);
+
+            std::vector<BomEntry> subTree(entries.begin() + subTreeStart, entries.end());
+            for (auto& subEntry : subTree) {
+                subEntry.index.erase(0, sub_index.size() + 1);
+            }
+            subTrees.emplace(child, std::move(subTree));
         }
     }
 }
 
-void BomObject::addObjectToBom(App::DocumentObject* obj, size_t row, std::string index)
+std::vector<std::string>
+BomObject::getBomRow(const BomEntry& entry,
+                     const std::map<std::pair<std::string, std::string>, std::string>& customData)
 {
-    obj_list.push_back(obj);
-    size_t col = 0;
+    App::DocumentObject* obj = entry.obj;
+    std::vector<std::string> row;
+    row.reserve(columnsNames.getValues().size());
     for (auto& columnName : columnsNames.getValues()) {
         if (columnName == "Index") {
-            setCell(App::CellAddress(row, col), (std::string("'") + index).c_str());
+            row.push_back(std::string("'") + entry.index);
         }
         else if (columnName == "Name") {
-            setCell(App::CellAddress(row, col), obj->Label.getValue());
+            row.emplace_back(obj->Label.getValue());
         }
         else if (columnName == "File Name") {
-            setCell(App::CellAddress(row, col), obj->getDocument()->getFileName());
+            row.emplace_back(obj->getDocument()->getFileName());
         }
         else if (columnName == "Quantity") {
-            setCell(App::CellAddress(row, col), std::to_string(1).c_str());
+            row.push_back(std::to_string(entry.quantity));
         }
         else if (columnName.starts_with(".")) {
             // Column names that start with a dot are considered property names
             // Extract the property name
             std::string baseName = columnName.substr(1);
-
-            auto propertyValue = getBomPropertyValue(obj, baseName);
-            if (!propertyValue.empty()) {
-                setCell(App::CellAddress(row, col), propertyValue.c_str());
-            }
+            row.push_back(getBomPropertyValue(obj, baseName));
         }
         else {
             // load custom data if any.
-            for (auto& el : dataElements) {
-                if (el.objName == obj->Label.getValue() && el.columnName == columnName) {
-                    setCell(App::CellAddress(row, col), el.value.c_str());
-                    break;
+            auto it =
+                customData.find(std::make_pair(std::string(obj->Label.getValue()), columnName));
+            row.push_back(it != customData.end() ? it->second : std::string());
+        }
+    }
+    return row;
+}
+
+void BomObject::writeTable(const std::vector<std::vector<std::string>>& table)
+{
+    // When the columns did not change, only the cells whose content changed are written, so
+    // that regenerating the BOM after a small change of the assembly stays cheap.
+    auto usedRange = getUsedRange();
+    auto lastUsed = std::get<1>(usedRange);
+    size_t nCols = columnsNames.getValues().size();
+    bool sameLayout = lastUsed.isValid() && static_cast<size_t>(lastUsed.col()) < nCols;
+    for (size_t col = 0; sameLayout && col < nCols; ++col) {
+        sameLayout = getText(0, col) == table[0][col];
+    }
+
+    if (!sameLayout) {
+        clearAll();
+    }
+
+    for (size_t row = 0; row < table.size(); ++row) {
+        for (size_t col = 0; col < table[row].size(); ++col) {
+            const std::string& content = table[row][col];
+            App::CellAddress address(row, col);
+            if (content.empty()) {
+                if (sameLayout && getCell(address)) {
+                    clear(address);
+                }
+                continue;
+            }
+            if (sameLayout) {
+                std::string text = content.front() == '\'' ? content.substr(1) : content;
+                if (getText(row, col) == text) {
+                    continue;
+                }
+            }
+            setCell(address, content.c_str());
+        }
+    }
+
+    if (sameLayout) {
+        // Remove the rows of the previous BOM that are not used anymore.
+        for (int row = static_cast<int>(table.size()); row <= lastUsed.row(); ++row) {
+            for (size_t col = 0; col < nCols; ++col) {
+                App::CellAddress address(row, col);
+                if (getCell(address)) {
+                    clear(address);
                 }
             }
         }
-        ++col;
     }
 }
 
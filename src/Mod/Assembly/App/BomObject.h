@@ -32,6 +32,9 @@
 #include <Mod/Spreadsheet/App/Sheet.h>
 #include <App/PropertyLinks.h>
 
+#include <map>
+#include <unordered_map>
+
 namespace App
 {
 class DocumentObject;
@@ -76,9 +79,6 @@ public:
     App::DocumentObjectExecReturn* execute() override;
 
     void generateBOM();
-    void addObjectToBom(App::DocumentObject* obj, size_t row, std::string index);
-    void
-    addObjectChildrenToBom(std::vector<App::DocumentObject*> objs, size_t& row, std::string index);
     void saveCustomColumnData();
 
     AssemblyObject* getAssembly();
@@ -96,6 +96,28 @@ public:
     std::vector<App::DocumentObject*> obj_list;
 
 private:
+    struct BomEntry
+    {
+        App::DocumentObject* obj;
+        std::string index;
+        int quantity;
+    };
+    // Rows (indexes into the list of entries) of each object, in increasing order.
+    using RowIndex = std::unordered_map<App::DocumentObject*, std::vector<size_t>>;
+    // Entries generated for the children of each detailed sub-assembly or part, with their
+    // index relative to it.
+    using SubTreeCache = std::unordered_map<App::DocumentObject*, std::vector<BomEntry>>;
+
+    void collectChildren(const std::vector<App::DocumentObject*>& objs,
+                         const std::string& parentIndex,
+                         bool hasQuantityCol,
+                         std::vector<BomEntry>& entries,
+                         RowIndex& rowsOfObject,
+                         SubTreeCache& subTrees);
+    std::vector<std::string>
+    getBomRow(const BomEntry& entry,
+              const std::map<std::pair<std::string, std::string>, std::string>& customData);
+    void writeTable(const std::vector<std::vector<std::string>>& table);
     std::string getBomPropertyValue(App::DocumentObject* obj, const std::string& baseName);
 };
 
@@ -213,3 +213,259 @@ class TestCore(unittest.TestCase):
         joint.Proxy.setJointConnectors(joint, refs)
 
         self.assertTrue(box.Placement.isSame(box2.Placement, 1e-6), "'{}'".format(operation))
+
+    def test_simulation_frame_cache(self):
+        """Test playing back and exporting cached simulation frames."""
+        operation = "Simulation frame cache"
+        _msg("  Test '{}'".format(operation))
+
+        import os
+        import tempfile
+        import numpy
+        from CommandCreateSimulation import SimulationFrameCache
+
+        box = self.assembly.newObject("Part::Box", "Box")
+        box2 = self.assembly.newObject("Part::Box", "Box")
+        plc = App.Placement(App.Vector(1, 2, 3), App.Rotation(10, 20, 30))
+
+        placements = numpy.zeros((2, 2, 7))
+        placements[:, :, 6] = 1.0  # identity quaternion
+        placements[1, 1, 0:3] = tuple(plc.Base)
+        placements[1, 1, 3:7] = plc.Rotation.Q
+        frameCache = SimulationFrameCache([box, box2], placements, [0.0, 0.01])
+
+        self.assertEqual(frameCache.numberOfFrames(), 2, "'{}'".format(operation))
+        self.assertTrue(frameCache.applyFrame(1), "'{}'".format(operation))
+        self.assertTrue(box2.Placement.isSame(plc, 1e-9), "'{}'".format(operation))
+        self.assertTrue(box.Placement.isIdentity(), "'{}'".format(operation))
+        self.assertTrue(frameCache.applyFrame(0), "'{}'".format(operation))
+        self.assertTrue(box2.Placement.isIdentity(), "'{}'".format(operation))
+        self.assertFalse(frameCache.applyFrame(2), "'{}'".format(operation))
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = os.path.join(tempDir, "frames.npz")
+            frameCache.export(fileName)
+            with numpy.load(fileName) as data:
+                self.assertTrue(
+                    numpy.allclose(data["placements"], placements), "'{}'".format(operation)
+                )
+                self.assertEqual(
+                    list(data["parts"]), [box.Name, box2.Name], "'{}'".format(operation)
+                )
+
+            fileName = os.path.join(tempDir, "frames.csv")
+            frameCache.export(fileName)
+            table = numpy.loadtxt(fileName, delimiter=",", skiprows=1)
+            self.assertEqual(table.shape, (2, 2 + 2 * 7), "'{}'".format(operation))
+            self.assertAlmostEqual(table[1, 1], 0.01, msg="'{}'".format(operation))
+
+    def test_simulation_revolute_motion(self):
+        """Test caching and exporting the frames of a revolute joint driven by a motion."""
+        operation = "Simulation of a revolute motion"
+        _msg("  Test '{}'".format(operation))
+
+        import os
+        import tempfile
+        import numpy
+        from CommandCreateSimulation import Motion, Simulation, exportSimulation
+
+        box = self.assembly.newObject("Part::Box", "Box")
+        box2 = self.assembly.newObject("Part::Box", "Box")
+        box2.Placement = App.Placement(App.Vector(0, 0, 10), App.Rotation())
+
+        ground = self.jointgroup.newObject("App::FeaturePython", "GroundedJoint")
+        JointObject.GroundedJoint(ground, box)
+
+        joint = self.jointgroup.newObject("App::FeaturePython", "Revolute")
+        JointObject.Joint(joint, JointObject.JointTypes.index("Revolute"))
+        refs = [
+            [self.assembly, [box.Name + ".Face6", box.Name + ".Vertex6"]],
+            [self.assembly, [box2.Name + ".Face5", box2.Name + ".Vertex1"]],
+        ]
+        joint.Proxy.setJointConnectors(joint, refs)
+
+        simulation = UtilsAssembly.getSimulationGroup(self.assembly).newObject(
+            "App::FeaturePython", "Simulation"
+        )
+        Simulation(simulation)
+        simulation.bTimeEnd = 1.0
+        simulation.cTimeStepOutput = 0.1
+        motion = self.assembly.newObject("App::FeaturePython", "Motion")
+        Motion(motion, "Angular", joint, "pi/2*time")
+        simulation.Group = [motion]
+        self.doc.recompute()
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = os.path.join(tempDir, "frames.npz")
+            frameCache = exportSimulation(self.assembly, simulation, fileName)
+            with numpy.load(fileName) as data:
+                self.assertTrue(
+                    numpy.allclose(data["placements"], frameCache.placements),
+                    "'{}'".format(operation),
+                )
+                self.assertTrue(
+                    numpy.allclose(data["times"], frameCache.times), "'{}'".format(operation)
+                )
+
+        self.assertIs(simulation.Proxy.getFrameCache(), frameCache, "'{}'".format(operation))
+        nFrms = frameCache.numberOfFrames()
+        self.assertGreater(nFrms, 1, "'{}'".format(operation))
+        self.assertIn(box2, frameCache.parts, "'{}'".format(operation))
+        self.assertFalse(
+            frameCache.getPlacement(0, box2).isSame(frameCache.getPlacement(nFrms - 1, box2), 1e-6),
+            "'{}' failed: the revolute joint did not move".format(operation),
+        )
+
+        # The cached frames match the ones the solver sets on the parts.
+        cached = frameCache.placements.copy()
+        self.assertTrue(
+            numpy.allclose(
+                type(frameCache).fromAssembly(self.assembly, simulation).placements, cached
+            ),
+            "'{}'".format(operation),
+        )
+        for frm in range(nFrms):
+            self.assembly.updateForFrame(frm)
+            solved = [part.Placement for part in frameCache.parts]
+            self.assembly.updateForFrame((frm + 1) % nFrms)
+            self.assertTrue(frameCache.applyFrame(frm), "'{}'".format(operation))
+            for part, plc in zip(frameCache.parts, solved):
+                self.assertTrue(
+                    part.Placement.isSame(plc, 1e-9),
+                    "'{}' failed at frame {}".format(operation, frm),
+                )
+
+        # Changing the motion drops the cached frames.
+        motion.Formula = "pi*time"
+        self.assertIsNone(simulation.Proxy.getFrameCache(), "'{}'".format(operation))
+
+    def test_bom_generation(self):
+        """Test the rows of a BOM with linked parts and a sub-assembly used twice."""
+        operation = "BOM generation"
+        _msg("  Test '{}'".format(operation))
+
+        def bomRows(bom, nCols, nRows):
+            rows = []
+            for row in range(2, nRows + 2):
+                cells = [bom.getContents("{}{}".format(chr(65 + col), row)) for col in range(nCols)]
+                rows.append([cell[1:] if cell.startswith("'") else cell for cell in cells])
+            return rows
+
+        bolt = self.assembly.newObject("Part::Box", "Bolt")
+        boltLinks = []
+        for i in range(2):
+            link = self.assembly.newObject("App::Link", "BoltLink")
+            link.LinkedObject = bolt
+            boltLinks.append(link)
+
+        subAssembly = self.doc.addObject("Assembly::AssemblyObject", "SubAssembly")
+        subAssembly.newObject("Part::Box", "Pin")
+        subLinks = []
+        for i in range(2):
+            link = self.assembly.newObject("App::Link", "SubAssemblyLink")
+            link.LinkedObject = subAssembly
+            subLinks.append(link)
+
+        bom = self.assembly.newObject("Assembly::BomObject", "Bill of Materials")
+        self.doc.recompute()
+
+        # Repeated link instances are counted in the Quantity column.
+        bom.columnsNames = ["Index", "Name", "Quantity"]
+        bom.recompute()
+        self.assertEqual(
+            bomRows(bom, 3, 4),
+            [
+                ["1", "Bolt", "3"],
+                ["2", "SubAssembly", "2"],
+                ["2.1", "Pin", "1"],
+                ["", "", ""],
+            ],
+            "'{}' failed with quantities".format(operation),
+        )
+
+        # Without Quantity column, every instance of the sub-assembly is detailed.
+        bom.columnsNames = ["Index", "Name"]
+        bom.recompute()
+        self.assertEqual(
+            bomRows(bom, 3, 8),
+            [
+                ["1", "Bolt", ""],
+                ["2", "Bolt", ""],
+                ["3", "Bolt", ""],
+                ["4", "SubAssembly", ""],
+                ["4.1", "Pin", ""],
+                ["5", "SubAssembly", ""],
+                ["5.1", "Pin", ""],
+                ["", "", ""],
+            ],
+            "'{}' failed with repeated sub-assembly".format(operation),
+        )
+
+        # Regenerating after removing parts clears the rows that are not used anymore.
+        self.doc.removeObject(boltLinks[1].Name)
+        self.doc.removeObject(subLinks[1].Name)
+        self.doc.recompute()
+        bom.recompute()
+        self.assertEqual(
+            bomRows(bom, 2, 7),
+            [
+                ["1", "Bolt"],
+                ["2", "Bolt"],
+                ["3", "SubAssembly"],
+                ["3.1", "Pin"],
+                ["", ""],
+                ["", ""],
+                ["", ""],
+            ],
+            "'{}' failed after removing parts".format(operation),
+        )
+
+    def test_vertex_index(self):
+        """Test finding vertex names with the cached vertex index."""
+        operation = "Vertex index"
+        _msg("  Test '{}'".format(operation))
+
+        box = self.assembly.newObject("Part::Box", "Box")
+        self.doc.recompute()
+
+        vertex = box.Shape.Vertexes[3]
+        self.assertEqual(
+            UtilsAssembly.findVertexNameInObject(vertex, box), "Vertex4", "'{}'".format(operation)
+        )
+        index = UtilsAssembly.getVertexIndex(box)
+        self.assertIs(UtilsAssembly.getVertexIndex(box), index, "'{}'".format(operation))
+
+        box.Length = 20
+        self.doc.recompute()
+        self.assertIsNot(UtilsAssembly.getVertexIndex(box), index, "'{}'".format(operation))
+        vertex = box.Shape.Vertexes[5]
+        self.assertEqual(
+            UtilsAssembly.findVertexNameInObject(vertex, box), "Vertex6", "'{}'".format(operation)
+        )
+
+        # Moving the object changes the points of its shape.
+        index = UtilsAssembly.getVertexIndex(box)
+        box.Placement = App.Placement(App.Vector(5, 0, 0), App.Rotation())
+        self.assertIsNot(UtilsAssembly.getVertexIndex(box), index, "'{}'".format(operation))
+        vertex = box.Shape.Vertexes[5]
+        self.assertEqual(
+            UtilsAssembly.findVertexNameInObject(vertex, box), "Vertex6", "'{}'".format(operation)
+        )
+
+        # The cache is bounded, the least recently used indexes are dropped first.
+        boxes = [self.assembly.newObject("Part::Box", "Box") for i in range(2)]
+        self.doc.recompute()
+        maxIndexes = UtilsAssembly.maxVertexIndexes
+        try:
+            UtilsAssembly.maxVertexIndexes = 2
+            UtilsAssembly.getVertexIndex(box)
+            UtilsAssembly.getVertexIndex(boxes[0])
+            UtilsAssembly.getVertexIndex(box)
+            UtilsAssembly.getVertexIndex(boxes[1])
+            self.assertEqual(
+                list(UtilsAssembly.vertexIndexes),
+                [(self.doc.Name, box.Name), (self.doc.Name, boxes[1].Name)],
+                "'{}'".format(operation),
+            )
+        finally:
+            UtilsAssembly.maxVertexIndexes = maxIndexes
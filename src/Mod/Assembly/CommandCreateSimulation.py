@@ -24,6 +24,7 @@
 import re
 import os
 import time
+import numpy
 import FreeCAD as App
 
 from pivy import coin
@@ -163,6 +164,7 @@ class Simulation:
         feaPy.jFramesPerSecond = 30
 
         self.motionsChangedCallback = None
+        self.frameCache = None
 
     def dumps(self):
         return None
@@ -171,6 +173,9 @@ class Simulation:
         return None
 
     def onChanged(self, feaPy, prop):
+        if prop in ("Group", "aTimeStart", "bTimeEnd", "cTimeStepOutput", "fGlobalErrorTolerance"):
+            # The frames generated before no longer match the simulation settings.
+            self.frameCache = None
         if prop == "Group" and hasattr(self, "motionsChangedCallback"):
             if self.motionsChangedCallback is not None:
                 self.motionsChangedCallback()
@@ -189,6 +194,127 @@ class Simulation:
                 return obj
         return None
 
+    def generateFrames(self, feaPy, assembly):
+        """Runs the simulation and caches the placements of all frames, see
+        SimulationFrameCache. Returns the cache."""
+        self.frameCache = SimulationFrameCache.generate(assembly, feaPy)
+        return self.frameCache
+
+    def getFrameCache(self):
+        return getattr(self, "frameCache", None)
+
+
+class SimulationFrameCache:
+    """Placements of the movable parts of an assembly for every frame of a simulation.
+    The placements are generated once from the solver results and stored in an array of
+    shape (frames, parts, 7): position x, y, z followed by the rotation quaternion. Playing
+    back a frame then only sets the cached placements, without querying the solver."""
+
+    def __init__(self, parts, placements, times, joints=()):
+        self.parts = list(parts)
+        self.placements = numpy.asarray(placements, dtype=float)
+        self.times = numpy.asarray(times, dtype=float)
+        self.joints = list(joints)
+
+    @classmethod
+    def generate(cls, assembly, simulation):
+        """Runs the simulation of assembly and reads the placements of the parts in every
+        frame."""
+        assembly.generateSimulation(simulation)
+        return cls.fromAssembly(assembly, simulation)
+
+    @classmethod
+    def fromAssembly(cls, assembly, simulation):
+        "Reads the placements of the parts for every frame of the last generated simulation."
+        parts = UtilsAssembly.getMovablePartsWithin(assembly)
+        nFrms = assembly.numberOfFrames()
+        placements = numpy.empty((nFrms, len(parts), 7))
+        for frm in range(nFrms):
+            assembly.updateForFrame(frm)
+            for i, part in enumerate(parts):
+                plc = part.Placement
+                placements[frm, i, 0:3] = tuple(plc.Base)
+                placements[frm, i, 3:7] = plc.Rotation.Q
+        times = numpy.arange(nFrms) * float(simulation.cTimeStepOutput)
+
+        joints = []
+        for obj in assembly.OutList:
+            if obj.TypeId == "Assembly::JointGroup":
+                joints = obj.Group
+        return cls(parts, placements, times, joints)
+
+    def numberOfFrames(self):
+        return len(self.placements)
+
+    def getPlacement(self, frm, part):
+        "Returns the cached App.Placement of part (index or object) in given frame."
+        if not isinstance(part, int):
+            part = self.parts.index(part)
+        row = self.placements[frm, part]
+        return App.Placement(App.Vector(*row[0:3]), App.Rotation(*row[3:7]))
+
+    def applyFrame(self, frm):
+        """Sets the cached placements of given frame on the parts, and refreshes the
+        joint markers."""
+        if frm < 0 or frm >= len(self.placements):
+            return False
+        for i, part in enumerate(self.parts):
+            plc = self.getPlacement(frm, i)
+            if not part.Placement.isSame(plc, 1e-9):
+                part.Placement = plc
+                part.purgeTouched()
+        for joint in self.joints:
+            # Notify the joint objects that the transform of the coin object changed.
+            if hasattr(joint, "Placement1"):
+                joint.Placement1 = joint.Placement1
+                joint.Placement2 = joint.Placement2
+                joint.purgeTouched()
+        return True
+
+    def partNames(self):
+        return [part.Name for part in self.parts]
+
+    def exportCsv(self, fileName):
+        """Writes the frame table as CSV: one row per frame with the time, followed by
+        x, y, z, q0, q1, q2, q3 of each part."""
+        columns = ["x", "y", "z", "q0", "q1", "q2", "q3"]
+        header = ["frame", "time"]
+        for name in self.partNames():
+            header += [name + "." + col for col in columns]
+        frames = numpy.arange(len(self.placements)).reshape(-1, 1)
+        table = numpy.hstack(
+            (frames, self.times.reshape(-1, 1), self.placements.reshape(len(frames), -1))
+        )
+        fmt = ["%d"] + ["%.17g"] * (table.shape[1] - 1)
+        numpy.savetxt(fileName, table, delimiter=",", header=",".join(header), comments="", fmt=fmt)
+
+    def exportNpz(self, fileName):
+        """Writes the frame table as compressed numpy arrays: times (frames),
+        placements (frames, parts, 7) and parts (names)."""
+        numpy.savez_compressed(
+            fileName,
+            times=self.times,
+            placements=self.placements,
+            parts=numpy.array(self.partNames()),
+        )
+
+    def export(self, fileName):
+        "Writes the frame table as NPZ or CSV, according to the file extension."
+        if fileName.lower().endswith(".npz"):
+            self.exportNpz(fileName)
+        else:
+            self.exportCsv(fileName)
+
+
+def exportSimulation(assembly, simulation, fileName):
+    """Runs the simulation of assembly headless and writes the frame table to fileName
+    (.csv or .npz). Returns the frame cache."""
+    frameCache = SimulationFrameCache.generate(assembly, simulation)
+    frameCache.export(fileName)
+    if hasattr(simulation, "Proxy"):
+        simulation.Proxy.frameCache = frameCache
+    return frameCache
+
 
 class ViewProviderSimulation:
     def __init__(self, vpDoc):
@@ -333,7 +459,12 @@ class Motion:
         return None
 
     def onChanged(self, feaPy, prop):
-        pass
+        if App.isRestoring():
+            return
+        # The frames generated before no longer match the motion.
+        simulation = self.getSimulation(feaPy)
+        if simulation is not None:
+            simulation.Proxy.frameCache = None
 
     def execute(self, feaPy):
         """Do something when doing a recomputation, this method is mandatory"""
@@ -754,266 +885,270 @@ SLOPE defines the steepness of the transition between 0 and H1 and H2 to 0 about
         return self.dialog.exec()
 
 
-######### Create Simulation Task ###########
-class TaskAssemblyCreateSimulation(QtCore.QObject):
-    def __init__(self, simFeaturePy=None):
-        super().__init__()
-        Gui.Selection.clearSelection()
-
-        self.assembly = UtilsAssembly.activeAssembly()
-
-        self.initialPlcs = UtilsAssembly.saveAssemblyPartsPlacements(self.assembly)
-
-        self.doc = self.assembly.Document
-        self.gui_doc = Gui.getDocument(self.doc)
-
-        self.view = self.gui_doc.activeView()
-
-        if not self.assembly or not self.view or not self.doc:
-            return
-
-        self.runKinematicsTimer = QtCore.QTimer()
-        self.runKinematicsTimer.setSingleShot(True)
-        self.runKinematicsTimer.timeout.connect(self.displayLastFrame)
-
-        self.animationTimer = QtCore.QTimer()
-        self.animationTimer.setInterval(50)  # ms
-        self.animationTimer.timeout.connect(self.playAnimation)
-
-        self.form = Gui.PySideUic.loadUi(":/panels/TaskAssemblyCreateSimulation.ui")
-        self.form.motionList.installEventFilter(self)
-        self.setSpinboxPrecision(self.form.TimeStartSpinBox, 9)
-        self.setSpinboxPrecision(self.form.TimeEndSpinBox, 9)
-        self.setSpinboxPrecision(self.form.TimeStepOutputSpinBox, 9)
-        self.setSpinboxPrecision(self.form.GlobalErrorToleranceSpinBox, 9, App.Units.Length)
-        self.form.motionList.itemDoubleClicked.connect(self.onItemDoubleClicked)
-        self.form.TimeStartSpinBox.valueChanged.connect(self.onTimeStartChanged)
-        self.form.TimeEndSpinBox.valueChanged.connect(self.onTimeEndChanged)
-        self.form.TimeStepOutputSpinBox.valueChanged.connect(self.onTimeStepOutputChanged)
-        self.form.GlobalErrorToleranceSpinBox.valueChanged.connect(
-            self.onGlobalErrorToleranceChanged
-        )
-        self.form.RunKinematicsButton.clicked.connect(self.runKinematics)
-        self.form.frameSlider.valueChanged.connect(self.onFrameChanged)
-        self.form.FramesPerSecondSpinBox.valueChanged.connect(self.onFramesPerSecondChanged)
-        self.form.PlayBackwardButton.clicked.connect(self.animationTimerStartBackward)
-        self.form.PlayForwardButton.clicked.connect(self.animationTimerStartForward)
-        self.form.StepBackwardButton.clicked.connect(self.stepBackward)
-        self.form.StepForwardButton.clicked.connect(self.stepForward)
-        self.form.StopButton.clicked.connect(self.stopAnimation)
-        self.form.AddButton.clicked.connect(self.addMotionClicked)
-        self.form.RemoveButton.clicked.connect(self.deleteSelectedMotions)
-        self.form.groupBox_player.hide()
-
-        if simFeaturePy:
-            self.simFeaturePy = simFeaturePy
-            App.setActiveTransaction("Edit " + simFeaturePy.Label + " Simulation")
-            self.onMotionsChanged()
-        else:
-            App.setActiveTransaction("Create Simulation")
-            self.createSimulationObject()
-
-        self.setUiInitialValues()
-
-        self.simFeaturePy.Proxy.setMotionsChangedCallback(self.onMotionsChanged)
-
-        self.currentFrm = 1
-        self.startFrm = 1
-        self.endFrm = 100
-        self.fps = 30
-        self.deltaTime = 1.0 / self.fps
-        self.startTime = time.time()
-        self.index = 0
-
-    def setUiInitialValues(self):
-        self.form.TimeStartSpinBox.setProperty("rawValue", self.simFeaturePy.aTimeStart.Value)
-        self.form.TimeEndSpinBox.setProperty("rawValue", self.simFeaturePy.bTimeEnd.Value)
-        self.form.TimeStepOutputSpinBox.setProperty(
-            "rawValue", self.simFeaturePy.cTimeStepOutput.Value
-        )
-        self.form.GlobalErrorToleranceSpinBox.setProperty(
-            "rawValue", self.simFeaturePy.fGlobalErrorTolerance
-        )
-        self.setFrameValue(0)
-        self.form.FramesPerSecondSpinBox.setValue(self.simFeaturePy.jFramesPerSecond)
-
-    def setSpinboxPrecision(self, spinbox, precision, unit=App.Units.TimeSpan):
-        q = App.Units.Quantity()
-        q.Unit = unit
-        q.Format = {"Precision": precision}
-        spinbox.setProperty("value", q)
-
-    def accept(self):
-        self.deactivate()
-        UtilsAssembly.restoreAssemblyPartsPlacements(self.assembly, self.initialPlcs)
-        App.closeActiveTransaction()
-        return True
+if App.GuiUp:
 
-    def reject(self):
-        self.deactivate()
-        App.closeActiveTransaction(True)
-        return True
+    ######### Create Simulation Task ###########
+    class TaskAssemblyCreateSimulation(QtCore.QObject):
+        def __init__(self, simFeaturePy=None):
+            super().__init__()
+            Gui.Selection.clearSelection()
 
-    def deactivate(self):
-        self.animationTimer.stop()
-        self.simFeaturePy.Proxy.setMotionsChangedCallback(None)
-        if Gui.Control.activeDialog():
-            Gui.Control.closeDialog()
+            self.assembly = UtilsAssembly.activeAssembly()
 
-    def onTimeStartChanged(self, quantity):
-        self.simFeaturePy.aTimeStart = self.form.TimeStartSpinBox.property("rawValue")
+            self.initialPlcs = UtilsAssembly.saveAssemblyPartsPlacements(self.assembly)
 
-    def onTimeEndChanged(self, quantity):
-        self.simFeaturePy.bTimeEnd = self.form.TimeEndSpinBox.property("rawValue")
+            self.doc = self.assembly.Document
+            self.gui_doc = Gui.getDocument(self.doc)
 
-    def onTimeStepOutputChanged(self, quantity):
-        self.simFeaturePy.cTimeStepOutput = self.form.TimeStepOutputSpinBox.property("rawValue")
+            self.view = self.gui_doc.activeView()
 
-    def onGlobalErrorToleranceChanged(self, quantity):
-        self.simFeaturePy.fGlobalErrorTolerance = self.form.GlobalErrorToleranceSpinBox.property(
-            "rawValue"
-        )
-
-    def onItemDoubleClicked(self, item):
-        row = self.form.motionList.row(item)
-        if row < len(self.simFeaturePy.Group):
-            motion = self.simFeaturePy.Group[row]
-            motion.ViewObject.Proxy.openEditDialog()
-            self.onMotionsChanged()
-
-    def createSimulationObject(self):
-        sim_group = UtilsAssembly.getSimulationGroup(self.assembly)
-        self.simFeaturePy = sim_group.newObject("App::FeaturePython", "Simulation")
-        Simulation(self.simFeaturePy)
-        ViewProviderSimulation(self.simFeaturePy.ViewObject)
-
-    def createMotionObject(self, motionType, joint, formula):
-        motion = self.assembly.newObject("App::FeaturePython", "Motion")
-        Motion(motion, motionType, joint, formula)
-        ViewProviderMotion(motion.ViewObject)
-
-        listOfMotions = self.simFeaturePy.Group
-        listOfMotions.append(motion)
-        self.simFeaturePy.Group = listOfMotions
-
-    def onMotionsChanged(self):
-        self.form.motionList.clear()
-        for motion in self.simFeaturePy.Group:
-            self.form.motionList.addItem(motion.Label)
-
-    def runKinematics(self):
-        self.assembly.generateSimulation(self.simFeaturePy)
-        nFrms = self.assembly.numberOfFrames()
-        self.form.frameSlider.setMaximum(nFrms - 1)
-        self.setFrameValue(nFrms - 1)
-        self.form.groupBox_player.show()
-
-    def onFrameChanged(self, val):
-        self.assembly.updateForFrame(val)
-        self.form.FrameLabel.setText(translate("Assembly", "Frame" + " " + str(val)))
-        time = float(val * self.simFeaturePy.cTimeStepOutput)
-        self.form.FrameTimeLabel.setText(f"{time:.2f} s")
-
-    def onFramesPerSecondChanged(self):
-        self.simFeaturePy.jFramesPerSecond = self.form.FramesPerSecondSpinBox.value()
-
-    def playBackward(self):
-        pass
+            if not self.assembly or not self.view or not self.doc:
+                return
 
-    def animationTimerStartForward(self):
-        self.direction = 1
-        self.animationTimerStart()
+            self.runKinematicsTimer = QtCore.QTimer()
+            self.runKinematicsTimer.setSingleShot(True)
+            self.runKinematicsTimer.timeout.connect(self.displayLastFrame)
 
-    def animationTimerStartBackward(self):
-        self.direction = -1
-        self.animationTimerStart()
+            self.animationTimer = QtCore.QTimer()
+            self.animationTimer.setInterval(50)  # ms
+            self.animationTimer.timeout.connect(self.playAnimation)
 
-    def animationTimerStart(self):
-        self.animationTimer.stop()
-        self.currentFrm = self.form.frameSlider.value()
-        self.startFrm = 1
-        self.endFrm = self.form.frameSlider.maximum()
-        if self.startFrm >= self.endFrm:
-            return
+            self.form = Gui.PySideUic.loadUi(":/panels/TaskAssemblyCreateSimulation.ui")
+            self.form.motionList.installEventFilter(self)
+            self.setSpinboxPrecision(self.form.TimeStartSpinBox, 9)
+            self.setSpinboxPrecision(self.form.TimeEndSpinBox, 9)
+            self.setSpinboxPrecision(self.form.TimeStepOutputSpinBox, 9)
+            self.setSpinboxPrecision(self.form.GlobalErrorToleranceSpinBox, 9, App.Units.Length)
+            self.form.motionList.itemDoubleClicked.connect(self.onItemDoubleClicked)
+            self.form.TimeStartSpinBox.valueChanged.connect(self.onTimeStartChanged)
+            self.form.TimeEndSpinBox.valueChanged.connect(self.onTimeEndChanged)
+            self.form.TimeStepOutputSpinBox.valueChanged.connect(self.onTimeStepOutputChanged)
+            self.form.GlobalErrorToleranceSpinBox.valueChanged.connect(
+                self.onGlobalErrorToleranceChanged
+            )
+            self.form.RunKinematicsButton.clicked.connect(self.runKinematics)
+            self.form.frameSlider.valueChanged.connect(self.onFrameChanged)
+            self.form.FramesPerSecondSpinBox.valueChanged.connect(self.onFramesPerSecondChanged)
+            self.form.PlayBackwardButton.clicked.connect(self.animationTimerStartBackward)
+            self.form.PlayForwardButton.clicked.connect(self.animationTimerStartForward)
+            self.form.StepBackwardButton.clicked.connect(self.stepBackward)
+            self.form.StepForwardButton.clicked.connect(self.stepForward)
+            self.form.StopButton.clicked.connect(self.stopAnimation)
+            self.form.AddButton.clicked.connect(self.addMotionClicked)
+            self.form.RemoveButton.clicked.connect(self.deleteSelectedMotions)
+            self.form.groupBox_player.hide()
+
+            if simFeaturePy:
+                self.simFeaturePy = simFeaturePy
+                App.setActiveTransaction("Edit " + simFeaturePy.Label + " Simulation")
+                self.onMotionsChanged()
+            else:
+                App.setActiveTransaction("Create Simulation")
+                self.createSimulationObject()
+
+            self.setUiInitialValues()
+
+            self.simFeaturePy.Proxy.setMotionsChangedCallback(self.onMotionsChanged)
+
+            self.currentFrm = 1
+            self.startFrm = 1
+            self.endFrm = 100
+            self.fps = 30
+            self.deltaTime = 1.0 / self.fps
+            self.startTime = time.time()
+            self.index = 0
+
+        def setUiInitialValues(self):
+            self.form.TimeStartSpinBox.setProperty("rawValue", self.simFeaturePy.aTimeStart.Value)
+            self.form.TimeEndSpinBox.setProperty("rawValue", self.simFeaturePy.bTimeEnd.Value)
+            self.form.TimeStepOutputSpinBox.setProperty(
+                "rawValue", self.simFeaturePy.cTimeStepOutput.Value
+            )
+            self.form.GlobalErrorToleranceSpinBox.setProperty(
+                "rawValue", self.simFeaturePy.fGlobalErrorTolerance
+            )
+            self.setFrameValue(0)
+            self.form.FramesPerSecondSpinBox.setValue(self.simFeaturePy.jFramesPerSecond)
+
+        def setSpinboxPrecision(self, spinbox, precision, unit=App.Units.TimeSpan):
+            q = App.Units.Quantity()
+            q.Unit = unit
+            q.Format = {"Precision": precision}
+            spinbox.setProperty("value", q)
+
+        def accept(self):
+            self.deactivate()
+            UtilsAssembly.restoreAssemblyPartsPlacements(self.assembly, self.initialPlcs)
+            App.closeActiveTransaction()
+            return True
+
+        def reject(self):
+            self.deactivate()
+            App.closeActiveTransaction(True)
+            return True
+
+        def deactivate(self):
+            self.animationTimer.stop()
+            self.simFeaturePy.Proxy.setMotionsChangedCallback(None)
+            if Gui.Control.activeDialog():
+                Gui.Control.closeDialog()
+
+        def onTimeStartChanged(self, quantity):
+            self.simFeaturePy.aTimeStart = self.form.TimeStartSpinBox.property("rawValue")
+
+        def onTimeEndChanged(self, quantity):
+            self.simFeaturePy.bTimeEnd = self.form.TimeEndSpinBox.property("rawValue")
+
+        def onTimeStepOutputChanged(self, quantity):
+            self.simFeaturePy.cTimeStepOutput = self.form.TimeStepOutputSpinBox.property("rawValue")
+
+        def onGlobalErrorToleranceChanged(self, quantity):
+            self.simFeaturePy.fGlobalErrorTolerance = (
+                self.form.GlobalErrorToleranceSpinBox.property("rawValue")
+            )
 
-        self.fps = self.simFeaturePy.jFramesPerSecond
-        self.deltaTime = 1.0 / self.fps
-        self.startTime = time.time()
-        self.index = self.currentFrm
-        self.animationTimer.setInterval(self.deltaTime * 1000)  # ms
-        self.animationTimer.start()
-
-    def playAnimation(self):
-        range_ = self.endFrm - self.startFrm
-        offset = self.currentFrm - self.startFrm
-        count = int((time.time() - self.startTime) / self.deltaTime)
-        self.index = ((self.direction * count + offset) % range_) + self.startFrm
-        self.setFrameValue(self.index)
-
-    def displayLastFrame(self):
-        nFrms = self.assembly.numberOfFrames()
-        self.setFrameValue(nFrms - 1)
-
-    def stepBackward(self):
-        self.animationTimer.stop()
-
-        nextFrm = self.form.frameSlider.value() - 1
-        if nextFrm < 1:
-            nextFrm = self.form.frameSlider.maximum()  # wraparound
-        self.setFrameValue(nextFrm)
-
-    def stepForward(self):
-        self.animationTimer.stop()
-
-        nextFrm = self.form.frameSlider.value() + 1
-        if nextFrm > self.form.frameSlider.maximum():
-            nextFrm = 1  # wraparound
-        self.setFrameValue(nextFrm)
-
-    def setFrameValue(self, val):
-        if val < 1:
-            val = 1
-        if val > self.form.frameSlider.maximum():
-            val = self.form.frameSlider.maximum()
-
-        self.form.frameSlider.setValue(val)
-
-    def stopAnimation(self):
-        self.animationTimer.stop()
-
-    def addMotionClicked(self):
-        dialog = MotionEditDialog(self.assembly)
-        if dialog.exec_():
-            self.createMotionObject(dialog.motionType, dialog.joint, dialog.formula)
-
-    # Taskbox keyboard event handler
-    def eventFilter(self, watched, event):
-        if self.form is not None and watched == self.form.motionList:
-            if event.type() == QtCore.QEvent.ShortcutOverride:
-                if event.key() == QtCore.Qt.Key_Delete:
-                    event.accept()
-                    return True  # Indicate that the event has been handled
-                return False
-
-            elif event.type() == QtCore.QEvent.KeyPress:
-                if event.key() == QtCore.Qt.Key_Delete:
-                    self.deleteSelectedMotions()
-                    return True  # Consume the event
-
-        return super().eventFilter(watched, event)
-
-    def deleteSelectedMotions(self):
-        selected_indexes = self.form.motionList.selectedIndexes()
-        sorted_indexes = sorted(selected_indexes, key=lambda x: x.row(), reverse=True)
-        for index in sorted_indexes:
-            row = index.row()
+        def onItemDoubleClicked(self, item):
+            row = self.form.motionList.row(item)
             if row < len(self.simFeaturePy.Group):
                 motion = self.simFeaturePy.Group[row]
-                # First remove the link from the viewObj
-                self.simFeaturePy.Group.remove(motion)
-                # Delete the object
-                motion.Document.removeObject(motion.Name)
-
+                motion.ViewObject.Proxy.openEditDialog()
+                self.onMotionsChanged()
+
+        def createSimulationObject(self):
+            sim_group = UtilsAssembly.getSimulationGroup(self.assembly)
+            self.simFeaturePy = sim_group.newObject("App::FeaturePython", "Simulation")
+            Simulation(self.simFeaturePy)
+            ViewProviderSimulation(self.simFeaturePy.ViewObject)
+
+        def createMotionObject(self, motionType, joint, formula):
+            motion = self.assembly.newObject("App::FeaturePython", "Motion")
+            Motion(motion, motionType, joint, formula)
+            ViewProviderMotion(motion.ViewObject)
+
+            listOfMotions = self.simFeaturePy.Group
+            listOfMotions.append(motion)
+            self.simFeaturePy.Group = listOfMotions
+
+        def onMotionsChanged(self):
+            self.form.motionList.clear()
+            for motion in self.simFeaturePy.Group:
+                self.form.motionList.addItem(motion.Label)
+
+        def runKinematics(self):
+            frameCache = self.simFeaturePy.Proxy.generateFrames(self.simFeaturePy, self.assembly)
+            nFrms = frameCache.numberOfFrames()
+            self.form.frameSlider.setMaximum(nFrms - 1)
+            self.setFrameValue(nFrms - 1)
+            self.form.groupBox_player.show()
+
+        def onFrameChanged(self, val):
+            frameCache = self.simFeaturePy.Proxy.getFrameCache()
+            if frameCache is not None:
+                frameCache.applyFrame(val)
+            else:
+                self.assembly.updateForFrame(val)
+            self.form.FrameLabel.setText(translate("Assembly", "Frame" + " " + str(val)))
+            time = float(val * self.simFeaturePy.cTimeStepOutput)
+            self.form.FrameTimeLabel.setText(f"{time:.2f} s")
+
+        def onFramesPerSecondChanged(self):
+            self.simFeaturePy.jFramesPerSecond = self.form.FramesPerSecondSpinBox.value()
+
+        def playBackward(self):
+            pass
+
+        def animationTimerStartForward(self):
+            self.direction = 1
+            self.animationTimerStart()
+
+        def animationTimerStartBackward(self):
+            self.direction = -1
+            self.animationTimerStart()
+
+        def animationTimerStart(self):
+            self.animationTimer.stop()
+            self.currentFrm = self.form.frameSlider.value()
+            self.startFrm = 1
+            self.endFrm = self.form.frameSlider.maximum()
+            if self.startFrm >= self.endFrm:
+                return
+
+            self.fps = self.simFeaturePy.jFramesPerSecond
+            self.deltaTime = 1.0 / self.fps
+            self.startTime = time.time()
+            self.index = self.currentFrm
+            self.animationTimer.setInterval(self.deltaTime * 1000)  # ms
+            self.animationTimer.start()
+
+        def playAnimation(self):
+            range_ = self.endFrm - self.startFrm
+            offset = self.currentFrm - self.startFrm
+            count = int((time.time() - self.startTime) / self.deltaTime)
+            self.index = ((self.direction * count + offset) % range_) + self.startFrm
+            self.setFrameValue(self.index)
+
+        def displayLastFrame(self):
+            nFrms = self.assembly.numberOfFrames()
+            self.setFrameValue(nFrms - 1)
+
+        def stepBackward(self):
+            self.animationTimer.stop()
+
+            nextFrm = self.form.frameSlider.value() - 1
+            if nextFrm < 1:
+                nextFrm = self.form.frameSlider.maximum()  # wraparound
+            self.setFrameValue(nextFrm)
+
+        def stepForward(self):
+            self.animationTimer.stop()
+
+            nextFrm = self.form.frameSlider.value() + 1
+            if nextFrm > self.form.frameSlider.maximum():
+                nextFrm = 1  # wraparound
+            self.setFrameValue(nextFrm)
+
+        def setFrameValue(self, val):
+            if val < 1:
+                val = 1
+            if val > self.form.frameSlider.maximum():
+                val = self.form.frameSlider.maximum()
+
+            self.form.frameSlider.setValue(val)
+
+        def stopAnimation(self):
+            self.animationTimer.stop()
+
+        def addMotionClicked(self):
+            dialog = MotionEditDialog(self.assembly)
+            if dialog.exec_():
+                self.createMotionObject(dialog.motionType, dialog.joint, dialog.formula)
+
+        # Taskbox keyboard event handler
+        def eventFilter(self, watched, event):
+            if self.form is not None and watched == self.form.motionList:
+                if event.type() == QtCore.QEvent.ShortcutOverride:
+                    if event.key() == QtCore.Qt.Key_Delete:
+                        event.accept()
+                        return True  # Indicate that the event has been handled
+                    return False
+
+                elif event.type() == QtCore.QEvent.KeyPress:
+                    if event.key() == QtCore.Qt.Key_Delete:
+                        self.deleteSelectedMotions()
+                        return True  # Consume the event
+
+            return super().eventFilter(watched, event)
+
+        def deleteSelectedMotions(self):
+            selected_indexes = self.form.motionList.selectedIndexes()
+            sorted_indexes = sorted(selected_indexes, key=lambda x: x.row(), reverse=True)
+            for index in sorted_indexes:
+                row = index.row()
+                if row < len(self.simFeaturePy.Group):
+                    motion = self.simFeaturePy.Group[row]
+                    # First remove the link from the viewObj
+                    self.simFeaturePy.Group.remove(motion)
+                    # Delete the object
+                    motion.Document.removeObject(motion.Name)
 
-if App.GuiUp:
     Gui.addCommand("Assembly_CreateSimulation", CommandCreateSimulation())
@@ -22,6 +22,7 @@
 # **************************************************************************/
 
 import math
+import numpy
 
 import FreeCAD as App
 import Part
@@ -37,6 +38,12 @@ __title__ = "Assembly utilitary functions"
 __author__ = "Ondsel"
 __url__ = "https://www.freecad.org"
 
+# Vertex indexes of the objects picked for joints, see getVertexIndex.
+# Key = (document name, object name), value = VertexIndex. The least recently used
+# entries are dropped beyond maxVertexIndexes.
+vertexIndexes = {}
+maxVertexIndexes = 32
+
 
 def activePartOrAssembly():
     doc = Gui.ActiveDocument
@@ -427,6 +434,7 @@ def findElementClosestVertex(ref, mousePos):
         return ""
 
     obj = getObject(ref)
+    shape = obj.Shape
 
     # We need mousePos to be in the same lcs as obj
     plc = App.Placement()
@@ -442,7 +450,7 @@ def findElementClosestVertex(ref, mousePos):
         return element_name
 
     elif elt_type == "Edge":
-        edge = obj.Shape.getElement(element_name)
+        edge = shape.getElement(element_name)
         curve = edge.Curve
         if curve.TypeId == "Part::GeomCircle":
             # For centers, as they are not shape vertexes, we return the element name.
@@ -462,14 +470,12 @@ def findElementClosestVertex(ref, mousePos):
             # If line center is closest then we have no vertex name to set so we put element name
             return element_name
 
-        vertexes = edge.Vertexes
-
-        vertex_name = findVertexNameInObject(vertexes[closest_vertex_index], obj)
+        vertex_name = getVertexIndex(obj, shape).findName(edge_points[closest_vertex_index])
 
         return vertex_name
 
     elif elt_type == "Face":
-        face = obj.Shape.getElement(element_name)
+        face = shape.getElement(element_name)
         surface = face.Surface
         _type = surface.TypeId
         if _type == "Part::GeomSphere" or _type == "Part::GeomTorus":
@@ -488,7 +494,7 @@ def findElementClosestVertex(ref, mousePos):
 
             elif _type == "Part::GeomCylinder" and curve.TypeId == "Part::GeomBSplineCurve":
                 # handle special case of 2 cylinder intersecting.
-                for j, facej in enumerate(obj.Shape.Faces):
+                for j, facej in enumerate(shape.Faces):
                     surfacej = facej.Surface
                     if (elt_index - 1) != j and surfacej.TypeId == "Part::GeomCylinder":
                         for edgej in facej.Edges:
@@ -507,9 +513,10 @@ def findElementClosestVertex(ref, mousePos):
 
         # Handle the face vertexes
         face_points = []
+        face_vertexes = face.Vertexes
 
         if _type != "Part::GeomCylinder" and _type != "Part::GeomCone":
-            face_points = getPointsFromVertexes(face.Vertexes)
+            face_points = getPointsFromVertexes(face_vertexes)
 
         # We also allow users to select the center of gravity.
         if _type == "Part::GeomCylinder" or _type == "Part::GeomCone":
@@ -533,11 +540,11 @@ def findElementClosestVertex(ref, mousePos):
         if _type == "Part::GeomCylinder" or _type == "Part::GeomCone":
             return element_name
 
-        if closest_vertex_index == len(face.Vertexes):
+        if closest_vertex_index == len(face_vertexes):
             # If center of gravity then we have no vertex name to set so we put element name
             return element_name
 
-        vertex_name = findVertexNameInObject(face.Vertexes[closest_vertex_index], obj)
+        vertex_name = getVertexIndex(obj, shape).findName(face_points[closest_vertex_index])
 
         return vertex_name
 
@@ -552,27 +559,57 @@ def getPointsFromVertexes(vertexes):
 
 
 def findClosestPointToMousePos(candidates_points, mousePos):
-    closest_point_index = None
-    point_min_length = None
+    if len(candidates_points) == 0:
+        return None, None
 
-    for i, point in enumerate(candidates_points):
-        length = (mousePos - point).Length
-        if closest_point_index is None or length < point_min_length:
-            closest_point_index = i
-            point_min_length = length
+    points = numpy.array([tuple(point) for point in candidates_points], dtype=float)
+    lengths = numpy.linalg.norm(points - tuple(mousePos), axis=1)
+    closest_point_index = int(numpy.argmin(lengths))
 
-    return closest_point_index, point_min_length
+    return closest_point_index, float(lengths[closest_point_index])
 
 
-def findVertexNameInObject(vertex, obj):
-    for i, _ in enumerate(obj.Shape.Vertexes):
-        vertexName = "Vertex" + str(i + 1)
+class VertexIndex:
+    """The points of the vertexes of a shape, in an array, to find vertex names without
+    walking the shape."""
 
-        if (
-            obj.Shape.getElement(vertexName).Point == vertex.Point
-        ):  # Don't use the vtx param from enumerate's 2nd output to avoid hasher warning
-            return vertexName
-    return ""
+    def __init__(self, shape):
+        # The shape is kept so that isSame() cannot match a new shape reusing its memory.
+        self.shape = shape
+        points = [tuple(vtx.Point) for vtx in shape.Vertexes]
+        self.points = numpy.array(points, dtype=float).reshape(-1, 3)
+
+    def isValid(self, shape):
+        return self.shape.isSame(shape)
+
+    def findName(self, point):
+        """Returns the name of the first vertex at point, with the same tolerance as the
+        comparison of App.Vector, or "" if there is none."""
+        if len(self.points) == 0:
+            return ""
+        eps = numpy.finfo(float).eps
+        matches = numpy.flatnonzero(numpy.all(numpy.abs(self.points - tuple(point)) <= eps, axis=1))
+        if len(matches) == 0:
+            return ""
+        return "Vertex" + str(matches[0] + 1)
+
+
+def getVertexIndex(obj, shape=None):
+    """Returns the VertexIndex of obj, building it again only when the shape of obj changed."""
+    if shape is None:
+        shape = obj.Shape
+    key = (obj.Document.Name, obj.Name)
+    index = vertexIndexes.pop(key, None)
+    if index is None or not index.isValid(shape):
+        index = VertexIndex(shape)
+    vertexIndexes[key] = index
+    while len(vertexIndexes) > maxVertexIndexes:
+        del vertexIndexes[next(iter(vertexIndexes))]
+    return index
+
+
+def findVertexNameInObject(vertex, obj):
+    return getVertexIndex(obj).findName(vertex.Point)
 
 
 def color_from_unsigned(c):
@@ -25,6 +25,8 @@
 import math
 from datetime import datetime
 
+import numpy
+
 import FreeCAD
 import DraftGeomUtils
 import DraftVecUtils
@@ -38,6 +40,11 @@ import WorkingPlane
 TOLERANCE = 0.0001 # smaller than this, two points are considered equal
 DISCRETIZE = 4 # the number of segments in which arcs must be subdivided
 ROTATIONS = [0,90,180,270] # the possible rotations to try
+ENGINE = "nofit" # the nesting engine to use, "nofit" or "raster"
+RESOLUTION = 0 # the size of the raster cells, 0 means automatic (see CELLS)
+CELLS = 400 # the number of raster cells along the longest container side
+CORES = 0 # the number of worker processes, 0 means all available, 1 means no worker
+PARALLEL_MIN = 16 # the minimum number of shapes to use worker processes
 
 class Nester:
 
@@ -46,7 +53,9 @@ class Nester:
 
         """Nester([container,shapes]): Creates a nester object with a container
            shape and a list of other shapes to nest into it. Container and
-           shapes must be Part.Faces.
+           shapes must be Part.Faces. Several containers can be given as a list,
+           they are filled in order. When all are full, copies of the last one
+           are used.
 
            Typical workflow:
 
@@ -62,13 +71,28 @@ class Nester:
            Nester.TOLERANCE = 0.0001
            Nester.DISCRETIZE = 4
            Nester.ROTATIONS = [0,90,180,270]
+           Nester.ENGINE = "nofit"
+           Nester.RESOLUTION = 0
+           Nester.CORES = 0
+
+           The "raster" engine places the shapes on a grid of RESOLUTION
+           cells, and evaluates the rotations of each shape in worker
+           processes. The "nofit" engine computes exact no-fit polygons
+           with OCC booleans, but is much slower and supports only one
+           container.
            """
 
         self.objects = None
-        self.container = container
+        self.containers = []
+        self.container = None
+        if isinstance(container,list):
+            for c in container:
+                self.addContainer(c)
+        elif container is not None:
+            self.addContainer(container)
         self.shapes = shapes
         self.results = [] # storage for the different results
-        self.indexedFaces = None
+        self.indexedfaces = None
         self.running = True
         self.progress = 0
         self.setCounter = None # optionally define a setCounter(value) function where value is a %
@@ -92,17 +116,25 @@ class Nester:
 
     def addContainer(self,container):
 
-        """addContainer(object): adds a FreeCAD DocumentObject as the container"""
+        """addContainer(object): adds a FreeCAD DocumentObject or a face as
+        a container. Containers are filled in the order they were added"""
 
         if hasattr(container,'Shape'):
-            self.container = container.Shape
+            container = container.Shape
+        if isinstance(container,Part.Shape):
+            if container.Faces:
+                container = container.Faces[0]
+            self.containers.append(container)
+            self.container = self.containers[0]
 
     def clear(self):
 
-        """clear(): Removes all objects and shape from the nester"""
+        """clear(): Removes all objects, shapes and containers from the nester"""
 
         self.objects = None
         self.shapes = None
+        self.containers = []
+        self.container = None
 
     def stop(self):
 
@@ -130,11 +162,16 @@ class Nester:
            shapes, each primary list being one filled container, or None
            if the operation failed."""
 
-        # reset abort mechanism and variables
+        if ENGINE == "nofit":
+            return self.runNoFit()
+        return self.runRaster()
 
-        self.running = True
-        self.progress = 0
-        starttime = datetime.now()
+    def prepare(self):
+
+        """prepare(): internal function that checks the container and shapes,
+        and returns the normal of the container and a list of [hashCode,face]
+        pairs with discretized faces, ordered by area, or None if the
+        shapes are not suitable for nesting"""
 
         # general conformity tests
 
@@ -145,10 +182,15 @@ class Nester:
         if not self.shapes:
             print("Empty shapes. Aborting")
             return
-        if not isinstance(self.container,Part.Face):
-            print("Container is not a face. Aborting")
-            return
+        for container in self.containers:
+            if not isinstance(container,Part.Face):
+                print("Container is not a face. Aborting")
+                return
         normal = self.container.normalAt(0,0)
+        for container in self.containers[1:]:
+            if container.normalAt(0,0).cross(normal).Length > TOLERANCE:
+                print("One of the containers is not parallel to the first one. Aborting")
+                return
         for s in self.shapes:
             if not self.update():
                 return
@@ -170,9 +212,6 @@ class Nester:
         # LONG-TERM TODO
         # add genetic algo to swap pieces, and check if the result is better
 
-        # track progresses
-        step = 100.0/(len(self.shapes)*len(ROTATIONS))
-
         # store hashCode together with the face so we can change the order
         # and still identify the original face, so we can calculate a transform afterwards
         self.indexedfaces = [[shape.hashCode(),shape] for shape in self.shapes]
@@ -213,7 +252,30 @@ class Nester:
                     print("Face distretizing failed. Aborting")
                 return
             nfaces.append([face[0],f])
-        faces = nfaces
+        return normal,nfaces
+
+    def runNoFit(self):
+
+        """runNoFit(): Runs a nesting operation with the no-fit polygon engine.
+           Returns a list of lists of shapes, each primary list being one
+           filled container, or None if the operation failed."""
+
+        # reset abort mechanism and variables
+
+        self.running = True
+        self.progress = 0
+        starttime = datetime.now()
+
+        if len(self.containers) > 1:
+            print("Several containers are only supported by the raster engine. Aborting")
+            return
+        prepared = self.prepare()
+        if not prepared:
+            return
+        normal,faces = prepared
+
+        # track progresses
+        step = 100.0/(len(self.shapes)*len(ROTATIONS))
 
         # container for sheets with a first, empty sheet
         sheets = [[]]
@@ -574,6 +636,181 @@ class Nester:
         return sheets
 
 
+    def runRaster(self):
+
+        """runRaster(): Runs a nesting operation with the raster engine.
+           Returns a list of lists of shapes, each primary list being one
+           filled container, or None if the operation failed."""
+
+        # reset abort mechanism and variables
+
+        self.running = True
+        self.progress = 0
+        starttime = datetime.now()
+
+        prepared = self.prepare()
+        if not prepared:
+            return
+        normal,faces = prepared
+
+        # all the computations are done in the plane of the first container
+        wp = WorkingPlane.PlaneBase()
+        wp.align_to_point_and_axis(self.container.CenterOfMass,normal)
+        cell = RESOLUTION
+        if not cell:
+            bb = self.container.BoundBox
+            for container in self.containers[1:]:
+                bb.add(container.BoundBox)
+            cell = max(bb.XLength,bb.YLength,bb.ZLength)/CELLS
+
+        # one raster of occupied cells per container
+        grids = []
+        for container in self.containers:
+            polygon = self.getPolygon(container,wp)
+            origin = polygon.min(axis=0)
+            shape = numpy.maximum(numpy.ceil((polygon.max(axis=0)-origin)/cell-TOLERANCE),1).astype(int)
+            grids.append([origin,~rasterize(polygon-origin,cell,(shape[1],shape[0]),inner=True)])
+
+        # sheets contain [hashcode,face] pairs, rasters [origin,grid] pairs
+        sheets = [[] for container in self.containers]
+        rasters = [[origin,grid.copy()] for origin,grid in grids]
+
+        executor = None
+        if (CORES != 1) and (len(faces) >= PARALLEL_MIN):
+            executor = getExecutor(CORES)
+
+        print("Everything OK (",datetime.now()-starttime,")")
+
+        # main loop
+
+        try:
+            facenumber = 1
+            facesnumber = len(faces)
+            while faces:
+
+                if not self.update():
+                    return
+
+                print("Placing piece",facenumber,"/",facesnumber,": ",end="")
+                hashcode,face = faces.pop()
+
+                # rasterize each rotation of the piece
+                rotations = []
+                for rotation in ROTATIONS:
+                    rotface = face.copy()
+                    if rotation:
+                        rotface.rotate(rotface.CenterOfMass,normal,rotation)
+                    polygon = self.getPolygon(rotface,wp)
+                    base = polygon.min(axis=0)
+                    shape = numpy.maximum(numpy.ceil((polygon.max(axis=0)-base)/cell-TOLERANCE),1).astype(int)
+                    mask = rasterize(polygon-base,cell,(shape[1],shape[0]))
+                    rotations.append([rotface,base,mask])
+
+                # find the first position of each rotation on each sheet
+                # that has enough free cells left
+                candidates = []
+                for sheetnumber,(origin,grid) in enumerate(rasters):
+                    free = grid.size-numpy.count_nonzero(grid)
+                    for rotnumber,(rotface,base,mask) in enumerate(rotations):
+                        if numpy.count_nonzero(mask) <= free:
+                            candidates.append([sheetnumber,rotnumber])
+                positions = None
+                if executor:
+                    try:
+                        positions = list(executor.map(findRasterPosition,
+                                                      [rasters[c[0]][1] for c in candidates],
+                                                      [rotations[c[1]][2] for c in candidates]))
+                    except Exception as e:
+                        print("Worker processes failed, evaluating placements serially:",repr(e))
+                        executor.shutdown(wait=False)
+                        executor = None
+                if positions is None:
+                    positions = [findRasterPosition(rasters[c[0]][1],rotations[c[1]][2]) for c in candidates]
+                solution = None
+                for (sheetnumber,rotnumber),position in zip(candidates,positions):
+                    if position is not None:
+                        # fill the sheets in order, keep the pieces as far left as possible
+                        key = (sheetnumber,position[0]+rotations[rotnumber][2].shape[1],position[0],position[1])
+                        if (solution is None) or (key < solution[0]):
+                            solution = [key,sheetnumber,rotnumber,position]
+
+                if solution is None:
+                    # no space left, start a new sheet with a copy of the last container
+                    origin,grid = grids[-1]
+                    for rotnumber,(rotface,base,mask) in enumerate(rotations):
+                        position = findRasterPosition(grid,mask)
+                        if position is not None:
+                            solution = [None,len(sheets),rotnumber,position]
+                            break
+                    else:
+                        print("One face doesn't fit in the container. Aborting")
+                        return
+                    print("Creating new sheet, ",end="")
+                    sheets.append([])
+                    rasters.append([origin,grid.copy()])
+
+                # place the piece
+                sheetnumber,rotnumber,(i,j) = solution[1:]
+                origin,grid = rasters[sheetnumber]
+                rotface,base,mask = rotations[rotnumber]
+                delta = origin+numpy.array([i,j])*cell-base
+                rotface.translate(wp.u.multiply(delta[0]).add(wp.v.multiply(delta[1])))
+                grid[j:j+mask.shape[0],i:i+mask.shape[1]] |= mask
+                sheets[sheetnumber].append([hashcode,rotface])
+                print("adding piece to sheet",sheetnumber+1)
+
+                self.progress = 100.0*facenumber/facesnumber
+                facenumber += 1
+        finally:
+            # the workers only live as long as this run
+            if executor:
+                executor.shutdown(wait=False)
+
+        for sheetnumber,utilization in enumerate(self.getUtilization(sheets)):
+            print("Sheet",sheetnumber+1,":",round(utilization*100,1),"% used")
+        print("Run time:",datetime.now()-starttime)
+        self.results.append(sheets)
+        return sheets
+
+    def getPolygon(self,face,wp):
+
+        """getPolygon(face,wp): returns the vertices of the outer wire
+        of a face, in the coordinates of the given working plane,
+        as a numpy array of x,y pairs"""
+
+        points = []
+        for v in face.OuterWire.OrderedVertexes:
+            p = wp.get_local_coords(v.Point)
+            points.append((p.x,p.y))
+        return numpy.array(points,dtype=float)
+
+    def getSheetContainer(self,sheetnumber):
+
+        """getSheetContainer(sheetnumber): returns the container of the given
+        sheet, and the offset to display that sheet. The sheets that don't
+        have their own container use a copy of the last one"""
+
+        extra = max(0,sheetnumber-len(self.containers)+1)
+        container = self.containers[min(sheetnumber,len(self.containers)-1)]
+        offset = FreeCAD.Vector(1.1*container.BoundBox.XLength*extra,0,0)
+        return container,offset
+
+    def getUtilization(self,result=None):
+
+        """getUtilization([result]): returns, for each sheet of the given
+        result or of the last computed result if none is given, the ratio
+        between the area of the placed pieces and the area of the container"""
+
+        if not result:
+            result = []
+            if self.results:
+                result = self.results[-1]
+        utilization = []
+        for sheetnumber,sheet in enumerate(result):
+            container = self.getSheetContainer(sheetnumber)[0]
+            utilization.append(sum([face[1].Area for face in sheet])/container.Area)
+        return utilization
+
     def order(self,face,right=False):
 
         """order(face,[right]): returns a list of vertices
@@ -624,17 +861,16 @@ class Nester:
             result = []
             if self.results:
                 result = self.results[-1]
-        offset = FreeCAD.Vector(0,0,0)
         feats = []
-        for sheet in result:
-            shapes = [self.container.OuterWire]
+        for sheetnumber,sheet in enumerate(result):
+            container,offset = self.getSheetContainer(sheetnumber)
+            shapes = [container.OuterWire]
             shapes.extend([face[1] for face in sheet])
             comp = Part.makeCompound(shapes)
             comp.translate(offset)
             o = FreeCAD.ActiveDocument.addObject("Part::Feature","Nest")
             o.Shape = comp
             feats.append(o)
-            offset = offset.add(FreeCAD.Vector(1.1*self.container.BoundBox.XLength,0,0))
         FreeCAD.ActiveDocument.recompute()
         return feats
 
@@ -653,8 +889,8 @@ class Nester:
             if self.results:
                 result = self.results[-1]
         d = {}
-        offset = FreeCAD.Vector(0,0,0)
-        for sheet in result:
+        for sheetnumber,sheet in enumerate(result):
+            offset = self.getSheetContainer(sheetnumber)[1]
             for face in sheet:
                 orig = None
                 for pair in self.indexedfaces:
@@ -663,14 +899,13 @@ class Nester:
                 if not orig:
                     print("error: hashCode mismatch between original and transformed face")
                     return
-                shape = face[1]
+                shape = face[1].copy()
                 if offset.Length:
                     shape.translate(offset)
                 deltav = shape.Faces[0].CenterOfMass.sub(orig.Faces[0].CenterOfMass)
                 rot = FreeCAD.Rotation(orig.Vertexes[0].Point.sub(orig.Faces[0].CenterOfMass),shape.Vertexes[0].Point.sub(shape.Faces[0].CenterOfMass))
                 pla = FreeCAD.Placement(deltav,rot)
                 d[face[0]] = pla
-            offset = offset.add(FreeCAD.Vector(1.1*self.container.BoundBox.XLength,0,0))
         return d
 
     def apply(self,result=None):
@@ -695,6 +930,69 @@ class Nester:
                     print("error: hashCode mismatch with original object")
 
 
+def rasterize(polygon,cell,shape,inner=False):
+
+    """rasterize(polygon,cell,shape,[inner]): returns a boolean array of the given
+    (rows,columns) shape, marking the cells of size cell covered by a polygon
+    given as a numpy array of x,y pairs, relative to the corner of the raster.
+    If inner is True, only the cells fully inside the polygon are marked"""
+
+    rows,cols = shape
+    px,py = numpy.meshgrid((numpy.arange(cols)+0.5)*cell,(numpy.arange(rows)+0.5)*cell)
+    inside = numpy.zeros(shape,dtype=bool)
+    border = numpy.zeros(shape,dtype=bool)
+    for (x1,y1),(x2,y2) in zip(polygon,numpy.roll(polygon,-1,axis=0)):
+        # even-odd test of the cell centers
+        if y1 != y2:
+            inside ^= ((y1 > py) != (y2 > py)) & (px < (x2-x1)*(py-y1)/(y2-y1)+x1)
+        # cells crossed by the edge. Points lying on the grid lines only
+        # touch the cells, they are skipped
+        n = int(max(abs(x2-x1),abs(y2-y1))*4/cell)+2
+        t = numpy.linspace(0,1,n)
+        x = (x1+(x2-x1)*t)/cell
+        y = (y1+(y2-y1)*t)/cell
+        i = numpy.floor(x).astype(int)
+        j = numpy.floor(y).astype(int)
+        keep = (i >= 0) & (i < cols) & (j >= 0) & (j < rows)
+        keep &= (abs(x-numpy.round(x)) > 1e-6) & (abs(y-numpy.round(y)) > 1e-6)
+        border[j[keep],i[keep]] = True
+    if inner:
+        return inside & ~border
+    return inside | border
+
+
+def findRasterPosition(grid,mask):
+
+    """findRasterPosition(grid,mask): returns the (column,row) position of the
+    leftmost, then lowest, placement of a boolean mask on a boolean grid of
+    occupied cells where no occupied cell is covered, or None. The overlap of
+    all the placements is computed at once as a correlation with FFT"""
+
+    rows,cols = grid.shape
+    h,w = mask.shape
+    if (h > rows) or (w > cols):
+        return None
+    fgrid = numpy.fft.rfft2(grid.astype(float))
+    fmask = numpy.fft.rfft2(mask.astype(float),s=grid.shape)
+    overlap = numpy.fft.irfft2(fgrid*numpy.conj(fmask),s=grid.shape)[:rows-h+1,:cols-w+1]
+    free = numpy.argwhere((overlap < 0.5).T)
+    if not len(free):
+        return None
+    return int(free[0][0]),int(free[0][1])
+
+
+def getExecutor(cores):
+
+    """getExecutor(cores): returns a new pool of worker processes to evaluate
+    placements, or None if no Python interpreter could be found to run them"""
+
+    from freecad.utils import create_process_pool
+    executor = create_process_pool(cores or None)
+    if not executor:
+        print("No Python interpreter found, placements will be evaluated serially")
+    return executor
+
+
 def test():
 
     "runs a test with selected shapes, container selected last"
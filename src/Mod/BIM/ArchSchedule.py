@@ -58,13 +58,39 @@ VERBOSE = True # change this for silent recomputes
 
 class _ArchScheduleDocObserver:
 
-    "doc observer to monitor all recomputes"
+    """doc observer to monitor all recomputes, and record the objects
+    changed since the last execution of the schedule"""
 
     # https://forum.freecad.org/viewtopic.php?style=3&p=553377#p553377
 
     def __init__(self, doc, schedule):
         self.doc = doc
         self.schedule = schedule
+        self.reset()
+        self.structure = True
+
+    def reset(self):
+        self.changed = set() # names of the objects changed since the last execution
+        self.structure = False # True if objects were created or deleted, or links changed
+
+    def slotCreatedObject(self, obj):
+        if obj.Document == self.doc:
+            self.structure = True
+
+    def slotDeletedObject(self, obj):
+        if obj.Document == self.doc:
+            self.structure = True
+
+    def slotChangedObject(self, obj, prop):
+        if obj.Document != self.doc:
+            return
+        self.changed.add(obj.Name)
+        try:
+            if obj.getTypeIdOfProperty(prop).startswith("App::PropertyLink"):
+                # group contents, bases, additions... may have changed
+                self.structure = True
+        except Exception:
+            pass
 
     def slotRecomputedDocument(self, doc):
         if doc != self.doc:
@@ -181,9 +207,10 @@ class _ArchSchedule:
                     FreeCAD.ActiveDocument.removeObject(sp.Name)
                     self.spreadsheet = None
         elif prop == "AutoUpdate":
+            # without observer, the next execution evaluates all the objects again
             if obj.AutoUpdate:
                 if getattr(self, "docObserver", None) is None:
-                    self.docObserver = _ArchScheduleDocObserver(FreeCAD.ActiveDocument, obj)
+                    self.docObserver = _ArchScheduleDocObserver(obj.Document, obj)
                     FreeCAD.addDocumentObserver(self.docObserver)
             elif getattr(self, "docObserver", None) is not None:
                 FreeCAD.removeDocumentObserver(self.docObserver)
@@ -234,6 +261,23 @@ class _ArchSchedule:
             if len(obj.Operation) != len(p):
                 return
 
+        # only the objects changed since the last execution need to be evaluated
+        # again, unless objects were created or deleted. changed is None if unknown
+        observer = getattr(self, "docObserver", None)
+        changed = None
+        if observer is not None and not observer.structure and hasattr(self, "index"):
+            changed = observer.changed
+            if hasattr(self, "data") and self.is_up_to_date(obj, changed):
+                observer.reset()
+                return
+        if changed is None:
+            self.index = {} # (objects, filter) : [candidate names, matching names, array names]
+            self.values = {} # (name, value) : evaluated value
+        else:
+            for key in [k for k in self.values if k[0] in changed]:
+                del self.values[key]
+        self.ifcrows = False
+
         self.data = {} # store all results in self.data, so it lives even without spreadsheet
         self.li = 1 # row index - starts at 2 to leave 2 blank rows for the title
 
@@ -252,45 +296,19 @@ class _ArchSchedule:
 
             # build set of valid objects
 
-            objs = obj.Objects[i]
             val = obj.Value[i]
             unit = obj.Unit[i]
             details = obj.DetailedResults
-            ifcfile = None
             elts = None
             if val:
-                import Draft
-                import Arch
-                if objs:
-                    objs = objs.split(";")
-                    objs = [FreeCAD.ActiveDocument.getObject(o) for o in objs]
-                    objs = [o for o in objs if o is not None]
-                else:
-                    if hasattr(getattr(FreeCAD.ActiveDocument, "Proxy", None), "ifcfile"):
-                        ifcfile = FreeCAD.ActiveDocument.Proxy.ifcfile
-                    objs = FreeCAD.ActiveDocument.Objects
-                if len(objs) == 1:
-                    if hasattr(objs[0], "StepId"):
-                        from nativeifc import ifc_tools
-                        ifcfile = ifc_tools.get_ifcfile(objs[0])
-                    # remove object itself if the object is a group
-                    if objs[0].isDerivedFrom("App::DocumentObjectGroup"):
-                        objs = objs[0].Group
-                objs = Draft.get_group_contents(objs)
-                objs = self.expandArrays(objs)
-                # Remove included objects (e.g. walls that are part of another wall,
-                # base geometry, etc)
-                objs = Arch.pruneIncluded(objs, strict=True, silent=True)
-                # Remove all schedules and spreadsheets:
-                objs = [o for o in objs if Draft.get_type(o) not in ["Schedule", "Spreadsheet::Sheet"]]
+                objs, ifcfile = self.get_objects(obj.Objects[i], obj.Filter[i], changed)
 
                 # filter elements
 
-                if obj.Filter[i]:
-                    if ifcfile:
+                if ifcfile:
+                    self.ifcrows = True
+                    if obj.Filter[i]:
                         elts = self.get_ifc_elements(ifcfile, obj.Filter[i])
-                    else:
-                        objs = self.apply_filter(objs, obj.Filter[i])
 
                 # perform operation: count or retrieve property
 
@@ -302,6 +320,79 @@ class _ArchSchedule:
 
         self.setSpreadsheetData(obj)
         self.save_ifc_props(obj)
+        if observer is not None:
+            observer.reset()
+
+    def is_up_to_date(self, obj, changed):
+        """Returns True if none of the objects used by this schedule changed"""
+
+        if self.ifcrows or (obj.Name in changed):
+            return False
+        for candidates, names, arrays in self.index.values():
+            if not (changed.isdisjoint(candidates) and changed.isdisjoint(arrays)):
+                return False
+        return True
+
+    def get_objects(self, objs, filters, changed=None):
+        """Returns the objects matching the given objects and filter columns,
+        and the IFC file to use instead of them, if any. Matching objects are
+        stored in self.index and reused if the given changed object names
+        are not None. Only the changed objects are filtered again, unless an
+        array multiplying them changed."""
+
+        doc = FreeCAD.ActiveDocument
+        index = self.index.get((objs, filters))
+        if (index is not None) and (changed is not None) and changed.isdisjoint(index[2]):
+            candidates, names, arrays = index
+            if filters and not changed.isdisjoint(candidates):
+                matching = set(names)
+                for name in changed.intersection(candidates):
+                    if self.apply_filter([doc.getObject(name)], filters):
+                        matching.add(name)
+                    else:
+                        matching.discard(name)
+                names = [n for n in candidates if n in matching]
+                index[1] = names
+            return [doc.getObject(n) for n in names], None
+
+        import Draft
+        import Arch
+        key = (objs, filters)
+        ifcfile = None
+        if objs:
+            objs = objs.split(";")
+            objs = [doc.getObject(o) for o in objs]
+            objs = [o for o in objs if o is not None]
+        else:
+            if hasattr(getattr(doc, "Proxy", None), "ifcfile"):
+                ifcfile = doc.Proxy.ifcfile
+            objs = doc.Objects
+        if len(objs) == 1:
+            if hasattr(objs[0], "StepId"):
+                from nativeifc import ifc_tools
+                ifcfile = ifc_tools.get_ifcfile(objs[0])
+            # remove object itself if the object is a group
+            if objs[0].isDerivedFrom("App::DocumentObjectGroup"):
+                objs = objs[0].Group
+        if ifcfile:
+            # IFC elements are filtered by get_ifc_elements
+            return [], ifcfile
+        objs = Draft.get_group_contents(objs)
+        # the arrays set the number of times their elements are counted
+        arrays = set()
+        for o in objs:
+            arrays.update(p.Name for p in o.InList if Draft.getType(p) == "Array")
+        objs = self.expandArrays(objs)
+        # Remove included objects (e.g. walls that are part of another wall,
+        # base geometry, etc)
+        objs = Arch.pruneIncluded(objs, strict=True, silent=True)
+        # Remove all schedules and spreadsheets:
+        objs = [o for o in objs if Draft.get_type(o) not in ["Schedule", "Spreadsheet::Sheet"]]
+        candidates = [o.Name for o in objs]
+        if filters:
+            objs = self.apply_filter(objs, filters)
+        self.index[key] = [candidates, [o.Name for o in objs], arrays]
+        return objs, None
 
     def apply_filter(self, objs, filters):
         """Applies the given filters to the given list of objects"""
@@ -431,16 +522,22 @@ class _ArchSchedule:
             # format value
             dv = params.get_param("Decimals",path="Units")
             fs = "{:."+str(dv)+"f}" # format string
+            values = getattr(self, "values", {}) # values of unchanged objects
             for o in objs:
                 if VERBOSE:
                     l = o.Name+" ("+o.Label+"):"
                     print (l+(40-len(l))*" ",end="")
                 try:
-                    d = o
-                    for v in vals:
-                        d = getattr(d,v)
-                    if hasattr(d,"Value"):
-                        d = d.Value
+                    key = (o.Name, ".".join(vals))
+                    if key in values:
+                        d = values[key]
+                    else:
+                        d = o
+                        for v in vals:
+                            d = getattr(d,v)
+                        if hasattr(d,"Value"):
+                            d = d.Value
+                        values[key] = d
                 except Exception:
                     t = translate("Arch","Unable to retrieve value from object")
                     FreeCAD.Console.PrintWarning(t+": "+o.Name+"."+".".join(vals)+"\n")
@@ -691,6 +788,15 @@ class _ViewProviderArchSchedule:
                                self.edit)
         menu.addAction(actionEdit)
 
+        if self.Object.AutoUpdate is False:
+            actionUpdate = QtGui.QAction(QtGui.QIcon(":/icons/view-refresh.svg"),
+                                         translate("Arch", "Update"),
+                                         menu)
+            QtCore.QObject.connect(actionUpdate,
+                                   QtCore.SIGNAL("triggered()"),
+                                   self.update)
+            menu.addAction(actionUpdate)
+
         if self.Object.CreateSpreadsheet is True:
             msg = translate("Arch", "Remove spreadsheet")
         else:
@@ -706,6 +812,10 @@ class _ViewProviderArchSchedule:
     def edit(self):
         FreeCADGui.ActiveDocument.setEdit(self.Object, 0)
 
+    def update(self):
+        # only the objects changed since the last update are evaluated again
+        self.Object.Proxy.execute(self.Object)
+
     def toggleSpreadsheet(self):
         self.Object.CreateSpreadsheet = not self.Object.CreateSpreadsheet
 
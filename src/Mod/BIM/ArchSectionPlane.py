@@ -91,11 +91,16 @@ def getSectionData(source):
     return objs,cutplane,onlySolids,clip,direction
 
 
-def getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,groupSshapesByObject=False):
+def getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,groupSshapesByObject=False,cache=None):
 
     """
     returns a list of shapes (visible, hidden, cut lines...)
-    obtained from performing a series of booleans against the given cut plane
+    obtained from performing a series of booleans against the given cut plane.
+    If a cache dictionary is given, the cut results of each shape are stored in
+    it and reused on next calls if neither the shape nor the cut plane changed
+    (see getCutCacheKey). Unused results are discarded from it, and hit
+    statistics are kept in its "hits" and "misses" keys. The cache is not used
+    with joinArch, as the joined shapes are new copies or fusions on every call.
     """
 
     import Part
@@ -152,27 +157,37 @@ def getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,groupSshapesB
 
     cutface,cutvolume,invcutvolume = ArchCommands.getCutVolume(cutplane,shapes,clip)
     shapes = []
+    if (cache is not None) and joinArch:
+        cache["shapes"] = {}
+        cache = None
+    if cache is not None:
+        cached = cache.setdefault("shapes",{})
+        cache["shapes"] = {}
+        cache.setdefault("hits",0)
+        cache.setdefault("misses",0)
     for o, shapeList in objectShapes:
         tmpSshapes = []
         for sh in shapeList:
             for sub in (sh.SubShapes if sh.ShapeType == "Compound" else [sh]):
                 if cutvolume:
-                    if sub.Volume < 0:
-                        sub = sub.reversed() # Use reversed as sub is immutable.
-                    c = sub.cut(cutvolume)
-                    s = sub.section(cutface)
-                    try:
-                        wires = DraftGeomUtils.findWires(s.Edges)
-                        for w in wires:
-                            f = Part.Face(w)
-                            tmpSshapes.append(f)
-                    except Part.OCCError:
-                        #print "ArchView: unable to get a face"
-                        tmpSshapes.append(s)
-                    shapes.extend(c.SubShapes if c.ShapeType == "Compound" else [c])
-                    if showHidden:
-                        c = sub.cut(invcutvolume)
-                        hshapes.extend(c.SubShapes if c.ShapeType == "Compound" else [c])
+                    key = None
+                    if cache is not None:
+                        # the source shape is kept with its results, so its
+                        # hashCode cannot be reused by another shape meanwhile
+                        key = getCutCacheKey(sub,cutplane,clip,showHidden)
+                        entry = cached.get(key)
+                        if entry and entry[0].isSame(sub):
+                            cache["hits"] += 1
+                        else:
+                            cache["misses"] += 1
+                            entry = (sub,cutShape(sub,cutface,cutvolume,invcutvolume,showHidden))
+                        cache["shapes"][key] = entry
+                        vsh,ssh,hsh = entry[1]
+                    else:
+                        vsh,ssh,hsh = cutShape(sub,cutface,cutvolume,invcutvolume,showHidden)
+                    shapes.extend(vsh)
+                    tmpSshapes.extend(ssh)
+                    hshapes.extend(hsh)
                 else:
                     shapes.append(sub)
 
@@ -188,6 +203,51 @@ def getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,groupSshapesB
         return shapes,hshapes,sshapes,cutface,cutvolume,invcutvolume
 
 
+def cutShape(sub,cutface,cutvolume,invcutvolume,showHidden):
+
+    """returns the visible shapes, section faces and hidden shapes
+    obtained by cutting a single shape with the given cut volumes"""
+
+    import Part
+    import DraftGeomUtils
+    sshapes = []
+    hshapes = []
+    if sub.Volume < 0:
+        sub = sub.reversed() # Use reversed as sub is immutable.
+    c = sub.cut(cutvolume)
+    s = sub.section(cutface)
+    try:
+        wires = DraftGeomUtils.findWires(s.Edges)
+        for w in wires:
+            f = Part.Face(w)
+            sshapes.append(f)
+    except Part.OCCError:
+        #print "ArchView: unable to get a face"
+        sshapes.append(s)
+    vshapes = c.SubShapes if c.ShapeType == "Compound" else [c]
+    if showHidden:
+        c = sub.cut(invcutvolume)
+        hshapes = c.SubShapes if c.ShapeType == "Compound" else [c]
+    return vshapes,sshapes,hshapes
+
+
+def getCutCacheKey(sub,cutplane,clip,showHidden):
+
+    """returns a key identifying the cut of a shape by a cut plane. The cut volume
+    always encloses all the cut shapes, so the result of the cut of a shape only
+    depends on that shape and on the cut plane, not on the other shapes. The
+    hashCode of the shape is not unique over time, a cached result must also be
+    checked with isSame() against the shape it was computed from"""
+
+    bb = cutplane.BoundBox
+    return (sub.hashCode(),
+            tuple(sub.Placement.toMatrix().A),
+            tuple(cutplane.Placement.toMatrix().A),
+            (bb.XMin,bb.YMin,bb.ZMin,bb.XMax,bb.YMax,bb.ZMax),
+            bool(clip),
+            bool(showHidden))
+
+
 def getFillForObject(o, defaultFill, source):
 
     """returns a color tuple from an object's material"""
@@ -412,11 +472,19 @@ def getSVG(source,
             # invcutvolume = source.Proxy.shapecache[5] # Unused
             objectSshapes = source.Proxy.shapecache[6]
         else:
+            cutcache = None
+            if hasattr(source,"Proxy"):
+                if not getattr(source.Proxy,"cutcache",None):
+                    source.Proxy.cutcache = {}
+                cutcache = source.Proxy.cutcache
             if showFill:
-                vshapes,hshapes,sshapes,cutface,cutvolume,invcutvolume,objectSshapes = getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,True)
+                vshapes,hshapes,sshapes,cutface,cutvolume,invcutvolume,objectSshapes = getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,True,cache=cutcache)
             else:
-                vshapes,hshapes,sshapes,cutface,cutvolume,invcutvolume = getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden)
+                vshapes,hshapes,sshapes,cutface,cutvolume,invcutvolume = getCutShapes(objs,cutplane,onlySolids,clip,joinArch,showHidden,cache=cutcache)
                 objectSshapes = []
+            if cutcache:
+                FreeCAD.Console.PrintLog("ArchSectionPlane: cut cache of "+source.Label+": "
+                                         +str(cutcache["hits"])+" hits, "+str(cutcache["misses"])+" misses\n")
             source.Proxy.shapecache = [vshapes,hshapes,sshapes,cutface,cutvolume,invcutvolume,objectSshapes]
 
         if should_update_svg_cache:
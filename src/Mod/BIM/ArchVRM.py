@@ -33,8 +33,11 @@
 #  It is used by the "Solid" mode of Arch views in TechDraw and Drawing,
 #  and is called from ArchSectionPlane code.
 
+import heapq
 import math
 
+import numpy
+
 import FreeCAD
 import ArchCommands
 import DraftVecUtils
@@ -93,6 +96,8 @@ class Renderer:
         self.joined = False
         self.sections = []
         self.hiddenEdges = []
+        self.sorting = False
+        self.flatfaces = {}
 
     def setWorkingPlane(self,wp):
         "sets a Draft WorkingPlane or Placement for this renderer"
@@ -188,27 +193,44 @@ class Renderer:
         self.faces = faces
         self.trimmed = True
 
+    def getLocalCoords(self,points):
+        "returns the coordinates on the WP of a list of points, as a numpy array"
+        mtx = FreeCAD.Matrix(self.wp.u,self.wp.v,self.wp.axis,self.wp.position).inverse()
+        mtx = numpy.array(mtx.A,dtype=float).reshape(4,4)
+        pts = numpy.array([tuple(p) for p in points],dtype=float).reshape(-1,3)
+        return pts @ mtx[:3,:3].T + mtx[:3,3]
+
+    def getWirePoints(self,face):
+        "returns the points of the sorted edges of each wire of a face, and the number of points per wire"
+        points = []
+        counts = []
+        for w in face[0].Wires:
+            edges = Part.__sortEdges__(w.Edges)
+            points.extend(e.Vertexes[0].Point for e in edges)
+            counts.append(len(edges))
+        return points,counts
+
+    def makePolygons(self,coords,counts):
+        "returns closed polygons from an array of coordinates, split by the given counts"
+        wires = []
+        start = 0
+        for count in counts:
+            verts = [FreeCAD.Vector(*c) for c in coords[start:start+count].tolist()]
+            start += count
+            if len(verts) > 1:
+                verts.append(verts[0])
+                wires.append(Part.makePolygon(verts))
+        return wires
+
     def projectFace(self,face):
         "projects a single face on the WP"
         #print("VRM: projectFace start: ",len(face[0].Vertexes)," verts, ",len(face[0].Edges)," edges")
-        wires = []
         if not face[0].Wires:
             if DEBUG: print("Error: Unable to project face on the WP")
             return None
         norm = face[0].normalAt(0,0)
-        for w in face[0].Wires:
-            verts = []
-            edges = Part.__sortEdges__(w.Edges)
-            #print(len(edges)," edges after sorting")
-            for e in edges:
-                v = e.Vertexes[0].Point
-                #print(v)
-                v = self.wp.get_local_coords(v)
-                verts.append(v)
-            verts.append(verts[0])
-            if len(verts) > 2:
-                #print("new wire with ",len(verts))
-                wires.append(Part.makePolygon(verts))
+        points,counts = self.getWirePoints(face)
+        wires = self.makePolygons(self.getLocalCoords(points),counts)
         try:
             sh = ArchCommands.makeFace(wires)
         except Exception:
@@ -232,22 +254,48 @@ class Renderer:
 
     def flattenFace(self,face):
         "Returns a face where all vertices have Z = 0"
-        wires = []
-        for w in face[0].Wires:
-            verts = []
-            edges = Part.__sortEdges__(w.Edges)
-            for e in edges:
-                v = e.Vertexes[0].Point
-                verts.append(FreeCAD.Vector(v.x,v.y,0))
-            verts.append(verts[0])
-            wires.append(Part.makePolygon(verts))
+        if id(face) in self.flatfaces:
+            return self.flatfaces[id(face)]
+        points,counts = self.getWirePoints(face)
+        coords = numpy.array([tuple(p) for p in points],dtype=float).reshape(-1,3)
+        coords[:,2] = 0
         try:
-            sh = Part.Face(wires)
+            sh = Part.Face(self.makePolygons(coords,counts))
         except Part.OCCError:
             if DEBUG: print("Error: Unable to flatten face")
-            return None
+            flat = None
         else:
-            return [sh]+face[1:]
+            flat = [sh]+face[1:]
+        if self.sorting:
+            # faces don't change during sorting, so their flattened version can be reused
+            self.flatfaces[id(face)] = flat
+        return flat
+
+    def getOverlaps(self,faces):
+        """Returns a dictionary giving, for the id of each of the given faces,
+        a dictionary of the other faces whose XY bounding boxes overlap its own,
+        by id. Faces whose bounding boxes don't overlap can't hide each other,
+        so only those need to be compared. The boxes are swept along X, keeping
+        the boxes crossing the sweep line in a heap ordered by their XMax."""
+        boxes = []
+        for f in faces:
+            b = f[0].BoundBox
+            boxes.append((b.XMin,b.XMax,b.YMin,b.YMax))
+        overlaps = {id(f):{} for f in faces}
+        active = []
+        for i in sorted(range(len(faces)),key=lambda i: boxes[i][0]):
+            xmin,xmax,ymin,ymax = boxes[i]
+            # drop the boxes that end before this one starts
+            while active and active[0][0] < xmin:
+                heapq.heappop(active)
+            f1 = faces[i]
+            for _,j in active:
+                if boxes[j][2] <= ymax and boxes[j][3] >= ymin:
+                    f2 = faces[j]
+                    overlaps[id(f1)][id(f2)] = f2
+                    overlaps[id(f2)][id(f1)] = f1
+            heapq.heappush(active,(xmax,i))
+        return overlaps
 
     def cut(self,cutplane,hidden=False):
         "Cuts through the shapes with a given cut plane and builds section faces"
@@ -460,21 +508,25 @@ class Renderer:
                         s = fs
                 objs.append([s,col])
 
-    def findPosition(self,f1,faces):
-        "Finds the position of a face in a list of faces"
+    def findPosition(self,f1,faces,candidates=None):
+        """Finds the position of a face in a list of faces. If candidates, some of
+        these faces, are given, only those are compared, for ex. the ones whose
+        bounding boxes overlap the face (see getOverlaps)"""
         l = None
         h = None
-        for f2 in faces:
+        if candidates is None:
+            candidates = faces
+        for f2 in candidates:
             if DEBUG: print("comparing face",str(self.faces.index(f1))," with face",str(self.faces.index(f2)))
             r = self.compare(f1,f2)
             if r == 1:
-                l = faces.index(f2)
+                i = faces.index(f2)
+                if l is None or i > l:
+                    l = i
             elif r == 2:
-                if h is None:
-                    h = faces.index(f2)
-                else:
-                    if faces.index(f2) < h:
-                        h = faces.index(f2)
+                i = faces.index(f2)
+                if h is None or i < h:
+                    h = i
         if l is not None:
             return l + 1
         elif h is not None:
@@ -495,17 +547,30 @@ class Renderer:
         if not self.oriented:
             self.reorient()
             if DEBUG: print("Done reorientation")
-        faces = self.faces[:]
+        # faces that could not be projected would be discarded by compare()
+        faces = [f for f in self.faces if f]
+        overlaps = self.getOverlaps(faces)
+        self.sorting = True
+        self.flatfaces = {}
         if DEBUG: print("sorting ",len(self.faces)," faces")
         sfaces = []
+        # the ids of the faces in sfaces
+        placed = set()
         loopcount = 0
         notfoundstack = 0
         while faces:
             if DEBUG: print("loop ", loopcount)
             f1 = faces[0]
+            if not overlaps[id(f1)]:
+                # this face cannot hide or be hidden by any other, its position doesn't matter
+                faces.remove(f1)
+                sfaces.insert(0,f1)
+                placed.add(id(f1))
+                continue
             if sfaces and (notfoundstack < len(faces)):
                 if DEBUG: print("using ordered stack, notfound = ",notfoundstack)
-                p = self.findPosition(f1,sfaces)
+                candidates = [f2 for k,f2 in overlaps[id(f1)].items() if k in placed]
+                p = self.findPosition(f1,sfaces,candidates)
                 if p is None:
                     # no position found, we move the face to the end of the pile
                     faces.remove(f1)
@@ -515,20 +580,24 @@ class Renderer:
                     # position found, we insert it
                     faces.remove(f1)
                     sfaces.insert(p,f1)
+                    placed.add(id(f1))
                     notfoundstack = 0
             else:
                 # either there is no stack, or no more face can be compared
                 # find a root, 2 faces that can be compared
                 if DEBUG: print("using unordered stack, notfound = ",notfoundstack)
                 for f2 in faces[1:]:
+                    if id(f2) not in overlaps[id(f1)]:
+                        continue
                     if DEBUG: print("comparing face",str(self.faces.index(f1))," with face",str(self.faces.index(f2)))
                     r = self.compare(f1,f2)
-                    print("comparison result:",r)
+                    if DEBUG: print("comparison result:",r)
                     if r == 1:
                         faces.remove(f2)
                         sfaces.append(f2)
                         faces.remove(f1)
                         sfaces.append(f1)
+                        placed.update((id(f1),id(f2)))
                         notfoundstack = 0
                         break
                     elif r == 2:
@@ -536,6 +605,7 @@ class Renderer:
                         sfaces.append(f1)
                         faces.remove(f2)
                         sfaces.append(f2)
+                        placed.update((id(f1),id(f2)))
                         notfoundstack = 0
                         break
                     elif r == 31:
@@ -555,6 +625,8 @@ class Renderer:
                 break
 
         if DEBUG: print("done Z sorting. ", len(sfaces), " faces retained, ", len(self.faces)-len(sfaces), " faces lost.")
+        self.sorting = False
+        self.flatfaces = {}
         self.faces = sfaces
         self.sorted = True
         if DEBUG: print("\n\n======> Finished sort\n\n")
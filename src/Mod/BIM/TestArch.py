@@ -47,4 +47,8 @@ from bimtests.TestArchReference import TestArchReference
 from bimtests.TestArchSchedule import TestArchSchedule
 from bimtests.TestArchTruss import TestArchTruss
 from bimtests.TestArchComponent import TestArchComponent
+from bimtests.TestWebGL import TestWebGL
+from bimtests.TestArchNesting import TestArchNesting
+from bimtests.TestArchVRM import TestArchVRM
+from bimtests.TestImportOBJ import TestImportOBJ
 
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 FreeCAD Project Association                        *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Part
+import ArchNesting
+from bimtests import TestArchBase
+
+class TestArchNesting(TestArchBase.TestArchBase):
+
+    def runRaster(self, nester, cores=0):
+        """Runs the raster engine with a coarse raster, and worker processes if
+        cores is given, restoring the nesting settings afterwards."""
+        names = ("ENGINE", "RESOLUTION", "PARALLEL_MIN", "CORES")
+        saved = [getattr(ArchNesting, name) for name in names]
+        ArchNesting.ENGINE, ArchNesting.RESOLUTION = "raster", 10
+        if cores:
+            ArchNesting.PARALLEL_MIN, ArchNesting.CORES = 1, cores
+        try:
+            return nester.run()
+        finally:
+            for name, value in zip(names, saved):
+                setattr(ArchNesting, name, value)
+
+    def test_rasterNesting(self):
+        """Test that the raster engine fills the containers in order."""
+        operation = "Testing raster nesting"
+        self.printTestMessage(operation)
+
+        containers = [Part.makePlane(300, 200), Part.makePlane(100, 100, FreeCAD.Vector(400, 0, 0))]
+        shapes = [Part.makePlane(100, 100, FreeCAD.Vector(-150 * i, -150, 0)) for i in range(8)]
+        nester = ArchNesting.Nester(containers, shapes)
+        sheets = self.runRaster(nester)
+        self.assertIsNotNone(sheets, "Nesting failed.")
+        self.assertEqual([len(sheet) for sheet in sheets], [6, 1, 1])
+        self.assertAlmostEqual(nester.getUtilization()[0], 1.0)
+        for sheet in sheets:
+            for i, piece in enumerate(sheet):
+                for other in sheet[i + 1:]:
+                    self.assertAlmostEqual(piece[1].common(other[1]).Area, 0.0)
+        self.assertEqual(len(nester.getPlacements()), len(shapes))
+
+    def test_rasterNestingWorkersFail(self):
+        """Test that the raster engine places the pieces serially if the workers fail."""
+        operation = "Testing raster nesting with failing workers"
+        self.printTestMessage(operation)
+
+        from concurrent.futures.process import BrokenProcessPool
+        from unittest import mock
+
+        class BrokenExecutor:
+            stopped = False
+
+            def __init__(self, workers):
+                pass
+
+            def map(self, *args):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, wait=True):
+                BrokenExecutor.stopped = True
+
+        containers = [Part.makePlane(300, 200)]
+        shapes = [Part.makePlane(100, 100, FreeCAD.Vector(-150 * i, -150, 0)) for i in range(6)]
+        nester = ArchNesting.Nester(containers, shapes)
+        with mock.patch("freecad.utils.create_process_pool", BrokenExecutor):
+            sheets = self.runRaster(nester, cores=2)
+        self.assertIsNotNone(sheets, "Nesting failed.")
+        self.assertEqual([len(sheet) for sheet in sheets], [6])
+        self.assertTrue(BrokenExecutor.stopped, "The broken pool was not shut down.")
+
+    def test_rasterNestingExecutor(self):
+        """Test that a run uses one pool of worker processes and shuts it down."""
+        operation = "Testing the nesting worker pool"
+        self.printTestMessage(operation)
+
+        from unittest import mock
+
+        created = []
+
+        class SerialExecutor:
+            def __init__(self, workers):
+                self.workers = workers
+                self.calls = 0
+                self.stopped = False
+                created.append(self)
+
+            def map(self, function, *iterables):
+                self.calls += 1
+                return map(function, *iterables)
+
+            def shutdown(self, wait=True):
+                self.stopped = True
+
+        containers = [Part.makePlane(300, 200)]
+        shapes = [Part.makePlane(100, 100, FreeCAD.Vector(-150 * i, -150, 0)) for i in range(6)]
+        serial = self.runRaster(ArchNesting.Nester(containers, list(shapes)))
+        with mock.patch("freecad.utils.create_process_pool", SerialExecutor):
+            sheets = self.runRaster(ArchNesting.Nester(containers, shapes), cores=2)
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].workers, 2)
+        self.assertEqual(created[0].calls, len(shapes))
+        self.assertTrue(created[0].stopped, "The pool was not shut down after the run.")
+        self.assertEqual(
+            [[p[1].CenterOfMass for p in sheet] for sheet in sheets],
+            [[p[1].CenterOfMass for p in sheet] for sheet in serial],
+        )
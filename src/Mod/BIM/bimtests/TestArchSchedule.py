@@ -34,4 +34,55 @@ class TestArchSchedule(TestArchBase.TestArchBase):
 
         obj = Arch.makeSchedule()
         self.assertIsNotNone(obj, "makeSchedule failed to create an object")
-        self.assertEqual(obj.Label, "Schedule", "Incorrect default label for Schedule")
\ No newline at end of file
+        self.assertEqual(obj.Label, "Schedule", "Incorrect default label for Schedule")
+
+    def test_scheduleUpdates(self):
+        """Test that schedules follow changes of their objects, also when deferred."""
+        operation = "Testing schedule updates..."
+        self.printTestMessage(operation)
+
+        wall1 = Arch.makeWall(length=1000)
+        wall2 = Arch.makeWall(length=1000)
+        obj = Arch.makeSchedule()
+        obj.Operation = ["Walls length"]
+        obj.Value = ["Length"]
+        obj.Unit = [""]
+        obj.Objects = [""]
+        obj.Filter = ["IfcType:Wall"]
+        obj.AutoUpdate = True
+        self.document.recompute()
+        self.assertEqual(obj.Proxy.data["B2"], "2000.0")
+
+        wall2.Length = 1500
+        self.document.recompute()
+        self.assertEqual(obj.Proxy.data["B2"], "2500.0", "Schedule was not updated after a change")
+
+        obj.AutoUpdate = False
+        wall1.Length = 500
+        self.document.recompute()
+        self.assertEqual(obj.Proxy.data["B2"], "2500.0", "Deferred schedule was updated")
+        obj.Proxy.execute(obj)
+        self.assertEqual(obj.Proxy.data["B2"], "2000.0", "Deferred schedule was not updated on request")
+        self.assertIsNone(obj.Proxy.docObserver, "Document observer was not removed")
+
+    def test_scheduleArrayUpdates(self):
+        """Test that schedules follow changes of the arrays of their objects."""
+        operation = "Testing schedule updates of arrays..."
+        self.printTestMessage(operation)
+
+        import Draft
+        wall = Arch.makeWall(length=1000)
+        array = Draft.make_ortho_array(wall, n_x=3, n_y=1, n_z=1)
+        obj = Arch.makeSchedule()
+        obj.Operation = ["Walls count"]
+        obj.Value = ["Count"]
+        obj.Unit = [""]
+        obj.Objects = [""]
+        obj.Filter = ["IfcType:Wall"]
+        obj.AutoUpdate = True
+        self.document.recompute()
+        self.assertEqual(obj.Proxy.data["B2"], "3")
+
+        array.NumberX = 4
+        self.document.recompute()
+        self.assertEqual(obj.Proxy.data["B2"], "4", "Schedule was not updated after an array change")
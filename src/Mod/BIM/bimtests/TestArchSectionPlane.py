@@ -34,4 +34,41 @@ class TestArchSectionPlane(TestArchBase.TestArchBase):
 
         section_plane = Arch.makeSectionPlane(name="TestSectionPlane")
         self.assertIsNotNone(section_plane, "makeSectionPlane failed to create a section plane object.")
-        self.assertEqual(section_plane.Label, "TestSectionPlane", "Section plane label is incorrect.")
\ No newline at end of file
+        self.assertEqual(section_plane.Label, "TestSectionPlane", "Section plane label is incorrect.")
+
+    def test_cutCache(self):
+        """Test that the cut results of unchanged objects are reused."""
+        operation = "Testing the section plane cut cache"
+        self.printTestMessage(operation)
+
+        import FreeCAD
+        import ArchSectionPlane
+        box1 = self.document.addObject("Part::Box", "Box1")
+        box2 = self.document.addObject("Part::Box", "Box2")
+        box2.Placement.Base = FreeCAD.Vector(20, 0, 0)
+        section_plane = Arch.makeSectionPlane([box1, box2])
+        section_plane.Placement.Base = FreeCAD.Vector(0, 0, 5)
+        self.document.recompute()
+
+        cache = {}
+        args = ([box1, box2], section_plane.Shape, False, False, False, False)
+        first = ArchSectionPlane.getCutShapes(*args, cache=cache)
+        self.assertEqual((cache["hits"], cache["misses"]), (0, 2))
+        box2.Length = 5
+        self.document.recompute()
+        second = ArchSectionPlane.getCutShapes(*args, cache=cache)
+        self.assertEqual((cache["hits"], cache["misses"]), (1, 3))
+        self.assertEqual(len(cache["shapes"]), 2, "Unused cut results were not discarded.")
+        self.assertEqual(len(first[0]), len(second[0]))
+
+        # a cached result is only used for the very shape it was computed from
+        for key, (source, result) in list(cache["shapes"].items()):
+            cache["shapes"][key] = (source.copy(), result)
+        ArchSectionPlane.getCutShapes(*args, cache=cache)
+        self.assertEqual((cache["hits"], cache["misses"]), (1, 5))
+
+        # joined shapes are new on every call, they are not cached
+        joinArgs = ([box1, box2], section_plane.Shape, False, False, True, False)
+        ArchSectionPlane.getCutShapes(*joinArgs, cache=cache)
+        self.assertEqual((cache["hits"], cache["misses"]), (1, 5))
+        self.assertEqual(cache["shapes"], {})
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 FreeCAD Project Association                        *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+import FreeCAD
+import Part
+import ArchVRM
+from bimtests import TestArchBase
+
+
+class BruteForceRenderer(ArchVRM.Renderer):
+    """A renderer comparing every face with every other one, as it did
+    before the bounding boxes of the faces were indexed"""
+
+    def getOverlaps(self, faces):
+        return {id(f1): {id(f2): f2 for f2 in faces if f2 is not f1} for f1 in faces}
+
+
+class TestArchVRM(TestArchBase.TestArchBase):
+
+    def makeScene(self):
+        """Returns overlapping boxes at different heights and a separate one"""
+        boxes = []
+        for i in range(4):
+            box = Part.makeBox(10, 10, 10, FreeCAD.Vector(6 * i, 4 * i, 7 * i))
+            boxes.append(box)
+        boxes.append(Part.makeBox(5, 5, 5, FreeCAD.Vector(100, 0, 0)))
+        return boxes
+
+    def makeRenderer(self, renderer):
+        """Returns the given kind of renderer, looking at the scene from an angle"""
+        rotation = FreeCAD.Rotation(FreeCAD.Vector(1, -1, 0), 35)
+        render = renderer()
+        render.setWorkingPlane(FreeCAD.Placement(FreeCAD.Vector(), rotation))
+        render.addShapes(self.makeScene())
+        return render
+
+    def test_getOverlaps(self):
+        """Test that the overlaps index finds the same pairs as comparing all boxes."""
+        operation = "Testing the VRM overlaps index"
+        self.printTestMessage(operation)
+
+        faces = [
+            [Part.makePlane(w, h, FreeCAD.Vector(x, y, 0)), None]
+            for x, y, w, h in [
+                (0, 0, 10, 10),
+                (10, 5, 5, 5),
+                (16, 0, 4, 20),
+                (3, 12, 20, 2),
+                (50, 50, 1, 1),
+                (-5, -5, 6, 6),
+            ]
+        ]
+        overlaps = ArchVRM.Renderer().getOverlaps(faces)
+        for f1 in faces:
+            b1 = f1[0].BoundBox
+            expected = set()
+            for f2 in faces:
+                b2 = f2[0].BoundBox
+                if (
+                    f2 is not f1
+                    and b1.XMin <= b2.XMax
+                    and b1.XMax >= b2.XMin
+                    and b1.YMin <= b2.YMax
+                    and b1.YMax >= b2.YMin
+                ):
+                    expected.add(id(f2))
+            self.assertEqual(set(overlaps[id(f1)]), expected)
+        self.assertEqual(overlaps[id(faces[4])], {})
+
+    def test_sort(self):
+        """Test that the sorted faces and the SVG are the same as when comparing all faces."""
+        operation = "Testing the VRM sort against comparing all faces"
+        self.printTestMessage(operation)
+
+        render = self.makeRenderer(ArchVRM.Renderer)
+        reference = self.makeRenderer(BruteForceRenderer)
+        render.sort()
+        reference.sort()
+        self.assertTrue(render.faces, "No face was sorted.")
+        self.assertEqual(
+            [f[0].CenterOfMass for f in render.faces],
+            [f[0].CenterOfMass for f in reference.faces],
+        )
+        self.assertEqual(render.getViewSVG(), reference.getViewSVG())
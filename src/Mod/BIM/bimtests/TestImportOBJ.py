@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 FreeCAD Project Association                        *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+import os
+import tempfile
+
+import FreeCAD
+import Mesh
+import Part
+from bimtests import TestArchBase
+
+
+class TestImportOBJ(TestArchBase.TestArchBase):
+
+    def test_export(self):
+        """Test the vertices and the face indices exported for a solid and a mesh."""
+        from importers import importOBJ
+
+        operation = "Testing OBJ export..."
+        self.printTestMessage(operation)
+
+        solid = self.document.addObject("Part::Feature", "Solid")
+        solid.Shape = Part.makeBox(10, 20, 30)
+        mesh = self.document.addObject("Mesh::Feature", "Mesh")
+        mesh.Mesh = Mesh.createBox(5, 5, 5)
+        mesh.Placement = FreeCAD.Placement(FreeCAD.Vector(100, 0, 0), FreeCAD.Rotation())
+        self.document.recompute()
+
+        filename = os.path.join(tempfile.gettempdir(), "TestImportOBJ.obj")
+        importOBJ.export([solid, mesh], filename)
+        with open(filename, encoding="utf-8") as f:
+            lines = [line.split() for line in f if line.strip()]
+        os.remove(filename)
+
+        # the vertices shared by the faces are only written once
+        verts = [FreeCAD.Vector(*map(float, line[1:])) for line in lines if line[0] == "v"]
+        normals = [line for line in lines if line[0] == "vn"]
+        faces = [line[1:] for line in lines if line[0] == "f"]
+        self.assertEqual(len(verts), 8 + 8)
+        self.assertEqual(len(normals), 12)
+        self.assertEqual(len(faces), 6 + 12)
+
+        # the faces of the solid point to the vertices of the same face
+        for face, indices in zip(solid.Shape.Faces, faces[:6]):
+            points = [verts[int(i) - 1] for i in indices]
+            self.assertEqual(len(set(map(int, indices))), 4)
+            for point in points:
+                self.assertTrue(any(point.isEqual(v.Point, 1e-6) for v in face.Vertexes))
+
+        # the facets of the mesh point to its own vertices and normals
+        for i, indices in enumerate(faces[6:]):
+            vindices = [int(index.split("//")[0]) for index in indices]
+            nindices = [int(index.split("//")[1]) for index in indices]
+            self.assertTrue(all(9 <= v <= 16 for v in vindices))
+            self.assertEqual(nindices, [i + 1] * 3)
+        used = {int(index.split("//")[0]) for indices in faces[6:] for index in indices}
+        self.assertEqual(used, set(range(9, 17)))
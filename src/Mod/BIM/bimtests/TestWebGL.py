@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 FreeCAD Project Association                        *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+import json
+import os
+import re
+import tempfile
+
+import FreeCAD
+import Part
+from bimtests import TestArchBase
+
+
+class TestWebGL(TestArchBase.TestArchBase):
+
+    def test_compressVerts(self):
+        """Test that compressed verts point to their original values."""
+        from importers import importWebGL
+
+        operation = "Testing WebGL vertex compression..."
+        self.printTestMessage(operation)
+
+        verts = [f"{(i * 7) % 13 / 4:.5f}" for i in range(300)]
+        floats = sorted(set(verts[::5]))
+        indices, floats = importWebGL.compress_verts(verts, floats)
+        self.assertEqual([floats[i] for i in indices], verts)
+        self.assertEqual(len(floats), len(set(floats)))
+
+    def test_export(self):
+        """Test the data written by the export of a few boxes."""
+        from importers import importWebGL
+
+        operation = "Testing WebGL export..."
+        self.printTestMessage(operation)
+
+        camera = (
+            "PerspectiveCamera {\n  viewportMapping ADJUST_CAMERA\n"
+            "  position 30.242626 -51.772324 85.63475\n"
+            "  orientation -0.4146691 0.088459305 -0.90566254  4.7065201\n"
+            "  nearDistance 53.126431\n  farDistance 123.09125\n  aspectRatio 1\n"
+            "  focalDistance 104.53851\n  heightAngle 0.78539819\n\n}"
+        )
+        objs = []
+        for i in range(3):
+            box = Part.makeBox(800, 800, 100 * (i + 1))
+            box.translate(FreeCAD.Vector(i * 1000, 0, 0))
+            obj = self.document.addObject("Part::Feature", "Box")
+            obj.Shape = box
+            objs.append(obj)
+        self.document.recompute()
+
+        def export():
+            filename = os.path.join(tempfile.gettempdir(), "TestWebGL.html")
+            importWebGL.export(objs, filename, camera=camera)
+            with open(filename, encoding="utf-8") as f:
+                html = f.read()
+            os.remove(filename)
+            return json.loads(re.search(r"const data = (.*);\n", html).group(1))
+
+        def decode(string):
+            # inverse of baseEncode: fixed width chunks, least significant digit first
+            if not string:
+                return []
+            width = int(string[0])
+            values = []
+            for i in range(1, len(string), width):
+                chunk = string[i : i + width].strip()
+                values.append(
+                    sum(
+                        importWebGL.base.index(c) * len(importWebGL.base) ** k
+                        for k, c in enumerate(chunk)
+                    )
+                )
+            return values
+
+        data = export()
+        self.assertTrue(data["compressed"])
+        self.assertEqual(data["camera"]["type"], "Perspective")
+        self.assertAlmostEqual(data["camera"]["position_x"], 30.242626, places=4)
+        self.assertEqual([o["name"] for o in data["objects"]], [o.Label for o in objs])
+
+        importWebGL.disableCompression = True
+        try:
+            rawdata = export()
+        finally:
+            importWebGL.disableCompression = False
+        self.assertFalse(rawdata["compressed"])
+        for i, (obj, raw) in enumerate(zip(data["objects"], rawdata["objects"])):
+            # a box is made of 12 triangles
+            self.assertEqual(len(raw["facets"]), 36)
+            self.assertEqual(decode(obj["facets"]), raw["facets"])
+            self.assertEqual(len(decode(obj["verts"])), len(raw["verts"]))
+            self.assertEqual(set(raw["verts"][0::3]), {f"{i * 1000:.5f}", f"{i * 1000 + 800:.5f}"})
+            self.assertEqual(set(raw["verts"][2::3]), {"0.00000", f"{100 * (i + 1):.5f}"})
@@ -1794,8 +1794,8 @@ def createCurve(ifcfile, wire, scaling=1.0):
     if scaling != 1:
         verts = [v.multiply(scaling) for v in verts]
     verts = tuple([tuple(v) for v in verts])
-    pts = ifcfile.createIfcCartesianPointList3D(verts)
-    idc = ifcfile.createIfcIndexedPolyCurve(pts, None, None)
+    pts = ifcbin.createIfcCartesianPointList3D(verts)
+    idc = ifcbin.createIfcIndexedPolyCurve(pts, None, None)
     return idc
 
 
@@ -1843,8 +1843,8 @@ def createCurveWithArcs(ifcfile,wire,scaling=1.0):
             zvc =       ifcbin.createIfcDirection(tuple(zaxis))
             xvc =       ifcbin.createIfcDirection(tuple(xaxis))
             plc =       ifcbin.createIfcAxis2Placement3D(ovc,zvc,xvc)
-            cir =       ifcfile.createIfcCircle(plc,e.Curve.Radius)
-            curve =     ifcfile.createIfcTrimmedCurve(
+            cir =       ifcbin.createIfcCircle(plc,e.Curve.Radius)
+            curve =     ifcbin.createIfcTrimmedCurve(
                 cir,
                 [ifcfile.createIfcParameterValue(p1)],
                 [ifcfile.createIfcParameterValue(p2)],
@@ -1864,10 +1864,10 @@ def createCurveWithArcs(ifcfile,wire,scaling=1.0):
             #print("  polyline:",verts)
             pts =     [ifcbin.createIfcCartesianPoint(tuple(v)) for v in verts]
             curve =   ifcbin.createIfcPolyline(pts)
-        segment = ifcfile.createIfcCompositeCurveSegment("CONTINUOUS",True,curve)
+        segment = ifcbin.createIfcCompositeCurveSegment("CONTINUOUS",True,curve)
         segments.append(segment)
     if segments:
-        pol = ifcfile.createIfcCompositeCurve(segments,False)
+        pol = ifcbin.createIfcCompositeCurve(segments,False)
     return pol
 
 
@@ -1958,7 +1958,7 @@ def getProfile(ifcfile,p):
                     w = Part.Wire(Part.__sortEdges__(w.Edges))
                     pts = [ifcbin.createIfcCartesianPoint(tuple(v.Point)[:2]) for v in w.Vertexes+[w.Vertexes[0]]]
                     innerwires.append(ifcbin.createIfcPolyline(pts))
-        profile = ifcfile.createIfcArbitraryProfileDefWithVoids("AREA",None,outerwire,innerwires)
+        profile = ifcbin.createIfcArbitraryProfileDefWithVoids("AREA",None,outerwire,innerwires)
     else:
         if DraftGeomUtils.hasCurves(p):
             # extruded composite curve
@@ -1968,7 +1968,7 @@ def getProfile(ifcfile,p):
             w = Part.Wire(Part.__sortEdges__(p.Wires[0].Edges))
             pts = [ifcbin.createIfcCartesianPoint(tuple(v.Point)[:2]) for v in w.Vertexes+[w.Vertexes[0]]]
             pol = ifcbin.createIfcPolyline(pts)
-        profile = ifcfile.createIfcArbitraryClosedProfileDef("AREA",None,pol)
+        profile = ifcbin.createIfcArbitraryClosedProfileDef("AREA",None,pol)
     return profile
 
 
@@ -2281,8 +2281,8 @@ def getRepresentation(
                                     for tri in tris[1]:
                                         pts =   [ifcbin.createIfcCartesianPoint(tuple(tris[0][i])) for i in tri]
                                         loop =  ifcbin.createIfcPolyLoop(pts)
-                                        bound = ifcfile.createIfcFaceOuterBound(loop,True)
-                                        face =  ifcfile.createIfcFace([bound])
+                                        bound = ifcbin.createIfcFaceOuterBound(loop,True)
+                                        face =  ifcbin.createIfcFace([bound])
                                         faces.append(face)
                                         fcsolid = Part.Shape() # empty shape so below code is not executed
 
@@ -2305,7 +2305,7 @@ def getRepresentation(
                                     verts.reverse() # inverting verts order if the direction is couterclockwise
                                 pts =   [ifcbin.createIfcCartesianPoint(tuple(v)) for v in verts]
                                 loop =  ifcbin.createIfcPolyLoop(pts)
-                                bound = ifcfile.createIfcFaceOuterBound(loop,True)
+                                bound = ifcbin.createIfcFaceOuterBound(loop,True)
                                 loops.append(bound)
                                 for wire in fcface.Wires:
                                     if wire.hashCode() != fcface.OuterWire.hashCode():
@@ -2317,11 +2317,11 @@ def getRepresentation(
                                                 verts.reverse()
                                             pts =   [ifcbin.createIfcCartesianPoint(tuple(v)) for v in verts]
                                             loop =  ifcbin.createIfcPolyLoop(pts)
-                                            bound = ifcfile.createIfcFaceBound(loop,True)
+                                            bound = ifcbin.createIfcFaceBound(loop,True)
                                             loops.append(bound)
                                         else:
                                             print("Warning: wire with one/no vertex in ", obj.Label)
-                                face =  ifcfile.createIfcFace(loops)
+                                face =  ifcbin.createIfcFace(loops)
                                 faces.append(face)
 
                             if faces:
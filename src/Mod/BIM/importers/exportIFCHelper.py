@@ -235,236 +235,153 @@ class ContextCreator:
         return json.loads(self.project_object.IfcData['complex_attributes'])["RepresentationContexts"]
 
 
+# entity types that the recycler deduplicates on top of the ones it has
+# dedicated methods for. They are never referenced by styled items or
+# relationships, so identical ones can safely be shared
+COMPRESSIBLE_TYPES = (
+    "IfcCircle",
+    "IfcTrimmedCurve",
+    "IfcCompositeCurveSegment",
+    "IfcCompositeCurve",
+    "IfcFaceBound",
+    "IfcFaceOuterBound",
+    "IfcFace",
+    "IfcCartesianPointList3D",
+    "IfcIndexedPolyCurve",
+)
+
+
 class recycler:
 
     "the compression engine - a mechanism to reuse ifc entities if needed"
 
     # this object has some methods identical to corresponding ifcopenshell methods,
-    # but it checks if a similar entity already exists before creating a new one
-    # to compress a new type, just add the necessary method here
+    # but it checks if a similar entity already exists before creating a new one.
+    # Entities are identified by a hash of their type and attributes, referenced
+    # entities being identified by their id. To compress a new type, add it to
+    # COMPRESSIBLE_TYPES, or add a method here if it needs special treatment
 
     def __init__(self,ifcfile,template=True):
 
         self.ifcfile = ifcfile
         self.compress = params.get_param_arch("ifcCompress")
         self.mergeProfiles = params.get_param_arch("ifcMergeProfiles")
-        self.cartesianpoints = {}
-        self.directions = {}
-        self.axis2placement3ds = {}
+        self.entities = {}
         if template: # we are using the default template from exportIFC.py
-            self.cartesianpoints = {(0,0,0):self.ifcfile[8]} # from template
-            self.directions = {(1,0,0):self.ifcfile[6],(0,0,1):self.ifcfile[7],(0,1,0):self.ifcfile[10]} # from template
-            self.axis2placement3ds = {'(0.0, 0.0, 0.0)(0.0, 0.0, 1.0)(1.0, 0.0, 0.0)':self.ifcfile[9]} # from template
-        self.polylines = {}
-        self.polyloops = {}
-        self.propertysinglevalues = {}
-        self.axis2placement2ds = {}
-        self.localplacements = {}
-        self.rgbs = {}
-        self.ssrenderings = {}
-        self.sstyles = {}
-        self.transformationoperators = {}
-        self.psas = {}
+            for i in (6,7,8,9,10):
+                self.store(self.ifcfile[i])
         self.spared = 0
         self.profiledefs = {}
 
-    def createIfcCartesianPoint(self,points):
-        if self.compress and points in self.cartesianpoints:
+    def __getattr__(self,name):
+        if name.startswith("createIfc") and name[6:] in COMPRESSIBLE_TYPES:
+            return lambda *args: self.create(name[6:],*args)
+        raise AttributeError(name)
+
+    def getKey(self,value):
+        "returns a hashable key representing the given attribute value"
+        if isinstance(value,ifcopenshell.entity_instance):
+            if value.id():
+                return value.id()
+            # type instances such as IfcLabel are not stored in the file
+            return (value.is_a(),self.getKey(value.wrappedValue))
+        if isinstance(value,(list,tuple)):
+            return tuple([self.getKey(v) for v in value])
+        return value
+
+    def store(self,entity):
+        "registers an existing entity so it can be reused"
+        self.entities[(entity.is_a(),self.getKey(tuple(entity)))] = entity
+
+    def create(self,ifctype,*args):
+        "creates an entity, or returns an existing one with the same type and attributes"
+        if not self.compress:
+            return self.ifcfile.create_entity(ifctype,*args)
+        key = (ifctype,self.getKey(args))
+        c = self.entities.get(key)
+        if c is not None:
             self.spared += 1
-            return self.cartesianpoints[points]
-        else:
-            c = self.ifcfile.createIfcCartesianPoint(points)
-            if self.compress:
-                self.cartesianpoints[points] = c
             return c
+        c = self.ifcfile.create_entity(ifctype,*args)
+        self.entities[key] = c
+        return c
+
+    def createIfcCartesianPoint(self,points):
+        return self.create("IfcCartesianPoint",points)
 
     def createIfcDirection(self,points):
-        if self.compress and points in self.directions:
-            self.spared += 1
-            return self.directions[points]
-        else:
-            c = self.ifcfile.createIfcDirection(points)
-            if self.compress:
-                self.directions[points] = c
-            return c
+        return self.create("IfcDirection",points)
 
     def createIfcPolyline(self,points):
-        key = "".join([str(p.Coordinates) for p in points])
-        if self.compress and key in self.polylines:
-            self.spared += 1
-            return self.polylines[key]
-        else:
-            c = self.ifcfile.createIfcPolyline(points)
-            if self.compress:
-                self.polylines[key] = c
-            return c
+        return self.create("IfcPolyline",points)
 
     def createIfcPolyLoop(self,points):
-        key = "".join([str(p.Coordinates) for p in points])
-        if self.compress and key in self.polyloops:
-            self.spared += 1
-            return self.polyloops[key]
-        else:
-            c = self.ifcfile.createIfcPolyLoop(points)
-            if self.compress:
-                self.polyloops[key] = c
-            return c
+        return self.create("IfcPolyLoop",points)
 
     def createIfcPropertySingleValue(self,name,ptype,pvalue):
-        key = str(name) + str(ptype) + str(pvalue)
-        if self.compress and key in self.propertysinglevalues:
-            self.spared += 1
-            return self.propertysinglevalues[key]
-        else:
-            if isinstance(pvalue,float) and pvalue < 0.000000001: # remove the exp notation that some bim apps hate
-                pvalue = 0
-            c = self.ifcfile.createIfcPropertySingleValue(name,None,self.ifcfile.create_entity(ptype,pvalue),None)
-            if self.compress:
-                self.propertysinglevalues[key] = c
-            return c
+        if isinstance(pvalue,float) and pvalue < 0.000000001: # remove the exp notation that some bim apps hate
+            pvalue = 0
+        return self.create("IfcPropertySingleValue",name,None,self.ifcfile.create_entity(ptype,pvalue),None)
 
     def createIfcAxis2Placement3D(self,p1=None,p2=None,p3=None):
         if not p1:
             p1 = self.createIfcCartesianPoint((0.0,0.0,0.0))
             p2 = self.createIfcDirection((0.0,0.0,1.0))
             p3 = self.createIfcDirection((1.0,0.0,0.0))
-        if p2:
-            tp2 = str(p2.DirectionRatios)
-        else:
-            tp2 = "None"
-        if p3:
-            tp3 = str(p3.DirectionRatios)
-        else:
-            tp3 = "None"
-        key = str(p1.Coordinates) + tp2 + tp3
-        if self.compress and key in self.axis2placement3ds:
-            self.spared += 1
-            return self.axis2placement3ds[key]
-        else:
-            c = self.ifcfile.createIfcAxis2Placement3D(p1,p2,p3)
-            if self.compress:
-                self.axis2placement3ds[key] = c
-            return c
+        return self.create("IfcAxis2Placement3D",p1,p2,p3)
 
     def createIfcAxis2Placement2D(self,p1,p2):
-        key = str(p1.Coordinates) + str(p2.DirectionRatios)
-        if self.compress and key in self.axis2placement2ds:
-            self.spared += 1
-            return self.axis2placement2ds[key]
-        else:
-            c = self.ifcfile.createIfcAxis2Placement2D(p1,p2)
-            if self.compress:
-                self.axis2placement2ds[key] = c
-            return c
+        return self.create("IfcAxis2Placement2D",p1,p2)
 
     def createIfcLocalPlacement(self,gpl=None):
         if not gpl:
             gpl = self.createIfcAxis2Placement3D()
-        key = str(gpl.Location.Coordinates) + str(gpl.Axis.DirectionRatios) + str(gpl.RefDirection.DirectionRatios)
-        if self.compress and key in self.localplacements:
-            self.spared += 1
-            return self.localplacements[key]
-        else:
-            c = self.ifcfile.createIfcLocalPlacement(None,gpl)
-            if self.compress:
-                self.localplacements[key] = c
-            return c
+        return self.create("IfcLocalPlacement",None,gpl)
 
     def createIfcColourRgb(self,r,g,b):
-        key = (r,g,b)
-        if self.compress and key in self.rgbs:
-            self.spared += 1
-            return self.rgbs[key]
-        else:
-            c = self.ifcfile.createIfcColourRgb(None,r,g,b)
-            if self.compress:
-                self.rgbs[key] = c
-            return c
+        return self.create("IfcColourRgb",None,r,g,b)
 
     def createIfcSurfaceStyleRendering(self,col,alpha=1):
-        key = (col.Red,col.Green,col.Blue,alpha)
-        if self.compress and key in self.ssrenderings:
-            self.spared += 1
-            return self.ssrenderings[key]
-        else:
-            if alpha == 1:
-                alpha = None
-            c = self.ifcfile.createIfcSurfaceStyleRendering(col,alpha,None,None,None,None,None,None,"FLAT")
-            if self.compress:
-                self.ssrenderings[key] = c
-            return c
+        if alpha == 1:
+            alpha = None
+        return self.create("IfcSurfaceStyleRendering",col,alpha,None,None,None,None,None,None,"FLAT")
 
     def createIfcCartesianTransformationOperator3D(self,axis1,axis2,origin,scale,axis3):
-        key = str(axis1.DirectionRatios) + str(axis2.DirectionRatios) + str(origin.Coordinates) + str(scale) + str(axis3.DirectionRatios)
-        if self.compress and key in self.transformationoperators:
-            self.spared += 1
-            return self.transformationoperators[key]
-        else:
-            c = self.ifcfile.createIfcCartesianTransformationOperator3D(axis1,axis2,origin,scale,axis3)
-            if self.compress:
-                self.transformationoperators[key] = c
-            return c
+        return self.create("IfcCartesianTransformationOperator3D",axis1,axis2,origin,scale,axis3)
 
     def createIfcSurfaceStyle(self,name,r,g,b,a=1):
-        if name:
-            key = name + str((r,g,b))
-        else:
-            key = str((r,g,b))
-        if self.compress and key in self.sstyles:
-            self.spared += 1
-            return self.sstyles[key]
-        else:
-            col = self.createIfcColourRgb(r,g,b)
-            ssr = self.createIfcSurfaceStyleRendering(col,a)
-            c = self.ifcfile.createIfcSurfaceStyle(name,"BOTH",[ssr])
-            if self.compress:
-                self.sstyles[key] = c
-            return c
+        col = self.createIfcColourRgb(r,g,b)
+        ssr = self.createIfcSurfaceStyleRendering(col,a)
+        return self.create("IfcSurfaceStyle",name,"BOTH",[ssr])
 
     def createIfcPresentationStyleAssignment(self,name,r,g,b,a=1,ifc4=False):
-        if name:
-            key = name+str((r,g,b,a))
-        else:
-            key = str((r,g,b,a))
-        if self.compress and key in self.psas:
-            self.spared += 1
-            return self.psas[key]
-        else:
-            iss = self.createIfcSurfaceStyle(name,r,g,b,a)
-            if ifc4:
-                c = iss
-            else:
-                c = self.ifcfile.createIfcPresentationStyleAssignment([iss])
-            if self.compress:
-                self.psas[key] = c
-            return c
-
-    def createIfcRectangleProfileDef(self,name,mode,pt,b,h):
-        key = "RECT"+str(name)+str(mode)+str(pt)+str(b)+str(h)
+        iss = self.createIfcSurfaceStyle(name,r,g,b,a)
+        if ifc4:
+            return iss
+        return self.create("IfcPresentationStyleAssignment",[iss])
+
+    def createProfileDef(self,ifctype,*args):
+        "profiles are only merged if the corresponding preference is set"
+        key = (ifctype,self.getKey(args))
         if self.compress and self.mergeProfiles and key in self.profiledefs:
             return self.profiledefs[key]
         else:
-            c = self.ifcfile.createIfcRectangleProfileDef(name,mode,pt,b,h)
+            c = self.ifcfile.create_entity(ifctype,*args)
             if self.compress and self.mergeProfiles:
                 self.profiledefs[key] = c
             return c
 
+    def createIfcRectangleProfileDef(self,name,mode,pt,b,h):
+        return self.createProfileDef("IfcRectangleProfileDef",name,mode,pt,b,h)
+
     def createIfcCircleProfileDef(self,name,mode,pt,r):
-        key = "CIRC"+str(name)+str(mode)+str(pt)+str(r)
-        if self.compress and self.mergeProfiles and key in self.profiledefs:
-            return self.profiledefs[key]
-        else:
-            c = self.ifcfile.createIfcCircleProfileDef(name,mode,pt,r)
-            if self.compress and self.mergeProfiles:
-                self.profiledefs[key] = c
-            return c
+        return self.createProfileDef("IfcCircleProfileDef",name,mode,pt,r)
 
     def createIfcEllipseProfileDef(self,name,mode,pt,majr,minr):
-        key = "ELLI"+str(name)+str(mode)+str(pt)+str(majr)+str(minr)
-        if self.compress and self.mergeProfiles and key in self.profiledefs:
-            return self.profiledefs[key]
-        else:
-            c = self.ifcfile.createIfcEllipseProfileDef(name,mode,pt,majr,minr)
-            if self.compress and self.mergeProfiles:
-                self.profiledefs[key] = c
-            return c
+        return self.createProfileDef("IfcEllipseProfileDef",name,mode,pt,majr,minr)
+
+    def createIfcArbitraryClosedProfileDef(self,name,mode,curve):
+        return self.createProfileDef("IfcArbitraryClosedProfileDef",name,mode,curve)
+
+    def createIfcArbitraryProfileDefWithVoids(self,name,mode,outer,inner):
+        return self.createProfileDef("IfcArbitraryProfileDefWithVoids",name,mode,outer,inner)
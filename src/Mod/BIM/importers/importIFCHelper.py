@@ -31,21 +31,19 @@ import ArchIFC
 
 from draftutils import params
 from draftutils.messages import _msg, _wrn
+from importers.importIFCRecords import (
+    PREDEFINED_RGB,
+    getColorFromMaterial,
+    getColorFromProduct,
+    getColorFromStyledItem,
+    getParents,
+    predefined_to_rgb,
+)
 
 if FreeCAD.GuiUp:
     import FreeCADGui as Gui
 
 
-PREDEFINED_RGB = {"black": (0, 0, 0),
-                  "red": (1.0, 0, 0),
-                  "green": (0, 1.0, 0),
-                  "blue": (0, 0, 1.0),
-                  "yellow": (1.0, 1.0, 0),
-                  "magenta": (1.0, 0, 1.0),
-                  "cyan": (0, 1.0, 1.0),
-                  "white": (1.0, 1.0, 1.0)}
-
-
 DEBUG_prod_repr = False
 DEBUG_prod_colors = False
 
@@ -428,28 +426,6 @@ def buildRelMaterialColors(ifcfile, prodrepr):
     pass
 
 
-def getColorFromProduct(product):
-
-    if product.Representation:
-        for rep in product.Representation.Representations:
-            for item in rep.Items:
-                for style in item.StyledByItem:
-                    color = getColorFromStyledItem(style)
-                    if color:
-                        return color
-
-
-def getColorFromMaterial(material):
-
-    if material.HasRepresentation:
-        rep = material.HasRepresentation[0]
-        if hasattr(rep,"Representations") and rep.Representations:
-            rep = rep.Representations[0]
-            if rep.is_a("IfcStyledRepresentation"):
-                return getColorFromStyledItem(rep)
-    return None
-
-
 def color2colorRGB(color_data):
 
     if color_data is None:
@@ -464,137 +440,6 @@ def color2colorRGB(color_data):
     return color_rgb
 
 
-def getColorFromStyledItem(styled_item):
-    """Get color from the IfcStyledItem.
-
-    Returns
-    -------
-    float, float, float, int
-        A tuple with the red, green, blue, and transparency values.
-        If the `IfcStyledItem` is a `IfcDraughtingPreDefinedColour`
-        the transparency is set to 0.
-        The first three values range from 0 to 1.0, while the transparency
-        varies from 0 to 100.
-
-    None
-        Return `None` if `styled_item` is not of type `'IfcStyledItem'`
-        or if there is any other problem getting a color.
-    """
-
-    if styled_item.is_a("IfcStyledRepresentation"):
-        styled_item = styled_item.Items[0]
-
-    if not styled_item.is_a("IfcStyledItem"):
-        return None
-
-    rgb_color = None
-    transparency = None
-    col = None
-
-    # The `IfcStyledItem` holds presentation style information for products,
-    # either explicitly for an `IfcGeometricRepresentationItem` being part of
-    # an `IfcShapeRepresentation` assigned to a product, or by assigning
-    # presentation information to `IfcMaterial` being assigned
-    # as other representation for a product.
-
-    # In current IFC release (IFC2x3) only one presentation style
-    # assignment shall be assigned.
-    # In IFC4 `IfcPresentationStyleAssignment` is deprecated
-    # In IFC4 multiple styles are assigned to style in 'IfcStyleItem' instead
-
-    # print(ifcfile[p])
-    # print(styled_item)
-    # print(styled_item.Styles)
-    if len(styled_item.Styles) == 0:
-        # IN IFC2x3, only one element in `Styles` should be available.
-        _wrn("No 'Style' in 'IfcStyleItem', do nothing.")
-        # ca 100x in 210_King_Merged.ifc
-        # Empty styles, #4952778=IfcStyledItem(#4952779,(),$)
-        # this is an error in the IFC file in my opinion
-    else:
-        # never seen an ifc with more than one Styles in IfcStyledItem
-        # the above seems to only apply for IFC2x3, IFC4 can have them
-        # see https://forum.freecad.org/viewtopic.php?f=39&t=33560&p=437056#p437056
-
-        # Get the `IfcPresentationStyleAssignment`, there should only be one,
-        if styled_item.Styles[0].is_a('IfcPresentationStyleAssignment'):
-            assign_style = styled_item.Styles[0]
-        else:
-            # `IfcPresentationStyleAssignment` is deprecated in IFC4,
-            # in favor of `IfcStyleAssignmentSelect`
-            assign_style = styled_item
-        # print(assign_style)  # IfcPresentationStyleAssignment
-
-        # `IfcPresentationStyleAssignment` can hold various kinds and counts
-        # of styles, see `IfcPresentationStyleSelect`
-        if assign_style.Styles[0].is_a("IfcSurfaceStyle"):
-            _style = assign_style.Styles[0]
-            # Schependomlaan and Nova and others
-            # `IfcSurfaceStyleRendering`
-            # print(_style.Styles[0])
-            # `IfcColourRgb`
-            rgb_color = _style.Styles[0].SurfaceColour
-            # print(rgb_color)
-            if (_style.Styles[0].is_a('IfcSurfaceStyleShading')
-                    and hasattr(_style.Styles[0], 'Transparency')
-                    and _style.Styles[0].Transparency):
-                transparency = _style.Styles[0].Transparency * 100
-        elif assign_style.Styles[0].is_a("IfcCurveStyle"):
-            if (len(assign_style.Styles) == 2
-                    and assign_style.Styles[1].is_a("IfcSurfaceStyle")):
-                # Allplan, new IFC export started in 2017
-                # `IfcDraughtingPreDefinedColour`
-                # print(assign_style.Styles[0].CurveColour)
-                # TODO: check this; on index 1, is this what we need?!
-                rgb_color = assign_style.Styles[1].Styles[0].SurfaceColour
-                # print(rgb_color)
-            else:
-                # 2x Annotations in 210_King_Merged.ifc
-                # print(ifcfile[p])
-                # print(assign_style.Styles[0])
-                # print(assign_style.Styles[0].CurveColour)
-                rgb_color = assign_style.Styles[0].CurveColour
-
-    if rgb_color:
-        if rgb_color.is_a('IfcDraughtingPreDefinedColour'):
-            if DEBUG_prod_colors:
-                _msg("  '{}'= ".format(rgb_color.Name))
-
-            col = predefined_to_rgb(rgb_color)
-
-            if col:
-                col = col + (0, )
-        else:
-            col = (rgb_color.Red,
-                   rgb_color.Green,
-                   rgb_color.Blue,
-                   int(transparency) if transparency else 0)
-    else:
-        col = None
-
-    if DEBUG_prod_colors:
-        _msg("  {}".format(col))
-
-    return col
-
-
-def predefined_to_rgb(rgb_color):
-    """Transform a predefined color name to its [r, g, b] representation.
-
-    TODO: at the moment it doesn't handle 'by layer'.
-    See: `IfcDraughtingPreDefinedColour` and `IfcPresentationLayerWithStyle`.
-    """
-    name = rgb_color.Name.lower()
-    if name not in PREDEFINED_RGB:
-        _wrn("Color name not in 'IfcDraughtingPreDefinedColour'.")
-
-        if name == 'by layer':
-            _wrn("'IfcDraughtingPreDefinedColour' set 'by layer'; "
-                 "currently not handled, set to 'None'.")
-        return None
-
-    return PREDEFINED_RGB[name]
-
 # ************************************************************************************************
 # property related methods
 
@@ -1069,20 +914,6 @@ def applyColorDict(doc,colordict=None):
         print("No valid color dict to apply")
 
 
-def getParents(ifcobj):
-    """finds the parent entities of an IFC entity"""
-
-    parentlist = []
-    if hasattr(ifcobj,"ContainedInStructure"):
-        for rel in ifcobj.ContainedInStructure:
-            parentlist.append(rel.RelatingStructure)
-    elif hasattr(ifcobj,"Decomposes"):
-        for rel in ifcobj.Decomposes:
-            if rel.is_a("IfcRelAggregates"):
-                parentlist.append(rel.RelatingObject)
-    return parentlist
-
-
 def createAnnotation(annotation,doc,ifcscale,preferences):
     """creates an annotation object"""
 
@@ -0,0 +1,290 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 Yorik van Havre <yorik@uncreated.net>              *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Extraction of IFC data that does not need FreeCAD
+
+The worker processes of the multicore importer import this module to turn
+IFC entities into compact records (see getProductRecord). It only depends on
+ifcopenshell, so the workers do not load FreeCAD or the Arch modules.
+importIFCHelper re-exports its functions."""
+
+PREDEFINED_RGB = {"black": (0, 0, 0),
+                  "red": (1.0, 0, 0),
+                  "green": (0, 1.0, 0),
+                  "blue": (0, 0, 1.0),
+                  "yellow": (1.0, 1.0, 0),
+                  "magenta": (1.0, 0, 1.0),
+                  "cyan": (0, 1.0, 1.0),
+                  "white": (1.0, 1.0, 1.0)}
+
+
+DEBUG_prod_colors = False
+
+
+def getColorFromProduct(product):
+
+    if product.Representation:
+        for rep in product.Representation.Representations:
+            for item in rep.Items:
+                for style in item.StyledByItem:
+                    color = getColorFromStyledItem(style)
+                    if color:
+                        return color
+
+
+def getColorFromMaterial(material):
+
+    if material.HasRepresentation:
+        rep = material.HasRepresentation[0]
+        if hasattr(rep,"Representations") and rep.Representations:
+            rep = rep.Representations[0]
+            if rep.is_a("IfcStyledRepresentation"):
+                return getColorFromStyledItem(rep)
+    return None
+
+
+def getColorFromStyledItem(styled_item):
+    """Get color from the IfcStyledItem.
+
+    Returns
+    -------
+    float, float, float, int
+        A tuple with the red, green, blue, and transparency values.
+        If the `IfcStyledItem` is a `IfcDraughtingPreDefinedColour`
+        the transparency is set to 0.
+        The first three values range from 0 to 1.0, while the transparency
+        varies from 0 to 100.
+
+    None
+        Return `None` if `styled_item` is not of type `'IfcStyledItem'`
+        or if there is any other problem getting a color.
+    """
+
+    if styled_item.is_a("IfcStyledRepresentation"):
+        styled_item = styled_item.Items[0]
+
+    if not styled_item.is_a("IfcStyledItem"):
+        return None
+
+    rgb_color = None
+    transparency = None
+    col = None
+
+    # The `IfcStyledItem` holds presentation style information for products,
+    # either explicitly for an `IfcGeometricRepresentationItem` being part of
+    # an `IfcShapeRepresentation` assigned to a product, or by assigning
+    # presentation information to `IfcMaterial` being assigned
+    # as other representation for a product.
+
+    # In current IFC release (IFC2x3) only one presentation style
+    # assignment shall be assigned.
+    # In IFC4 `IfcPresentationStyleAssignment` is deprecated
+    # In IFC4 multiple styles are assigned to style in 'IfcStyleItem' instead
+
+    # print(ifcfile[p])
+    # print(styled_item)
+    # print(styled_item.Styles)
+    if len(styled_item.Styles) == 0:
+        # IN IFC2x3, only one element in `Styles` should be available.
+        print("No 'Style' in 'IfcStyleItem', do nothing.")
+        # ca 100x in 210_King_Merged.ifc
+        # Empty styles, #4952778=IfcStyledItem(#4952779,(),$)
+        # this is an error in the IFC file in my opinion
+    else:
+        # never seen an ifc with more than one Styles in IfcStyledItem
+        # the above seems to only apply for IFC2x3, IFC4 can have them
+        # see https://forum.freecad.org/viewtopic.php?f=39&t=33560&p=437056#p437056
+
+        # Get the `IfcPresentationStyleAssignment`, there should only be one,
+        if styled_item.Styles[0].is_a('IfcPresentationStyleAssignment'):
+            assign_style = styled_item.Styles[0]
+        else:
+            # `IfcPresentationStyleAssignment` is deprecated in IFC4,
+            # in favor of `IfcStyleAssignmentSelect`
+            assign_style = styled_item
+        # print(assign_style)  # IfcPresentationStyleAssignment
+
+        # `IfcPresentationStyleAssignment` can hold various kinds and counts
+        # of styles, see `IfcPresentationStyleSelect`
+        if assign_style.Styles[0].is_a("IfcSurfaceStyle"):
+            _style = assign_style.Styles[0]
+            # Schependomlaan and Nova and others
+            # `IfcSurfaceStyleRendering`
+            # print(_style.Styles[0])
+            # `IfcColourRgb`
+            rgb_color = _style.Styles[0].SurfaceColour
+            # print(rgb_color)
+            if (_style.Styles[0].is_a('IfcSurfaceStyleShading')
+                    and hasattr(_style.Styles[0], 'Transparency')
+                    and _style.Styles[0].Transparency):
+                transparency = _style.Styles[0].Transparency * 100
+        elif assign_style.Styles[0].is_a("IfcCurveStyle"):
+            if (len(assign_style.Styles) == 2
+                    and assign_style.Styles[1].is_a("IfcSurfaceStyle")):
+                # Allplan, new IFC export started in 2017
+                # `IfcDraughtingPreDefinedColour`
+                # print(assign_style.Styles[0].CurveColour)
+                # TODO: check this; on index 1, is this what we need?!
+                rgb_color = assign_style.Styles[1].Styles[0].SurfaceColour
+                # print(rgb_color)
+            else:
+                # 2x Annotations in 210_King_Merged.ifc
+                # print(ifcfile[p])
+                # print(assign_style.Styles[0])
+                # print(assign_style.Styles[0].CurveColour)
+                rgb_color = assign_style.Styles[0].CurveColour
+
+    if rgb_color:
+        if rgb_color.is_a('IfcDraughtingPreDefinedColour'):
+            if DEBUG_prod_colors:
+                print("  '{}'= ".format(rgb_color.Name))
+
+            col = predefined_to_rgb(rgb_color)
+
+            if col:
+                col = col + (0, )
+        else:
+            col = (rgb_color.Red,
+                   rgb_color.Green,
+                   rgb_color.Blue,
+                   int(transparency) if transparency else 0)
+    else:
+        col = None
+
+    if DEBUG_prod_colors:
+        print("  {}".format(col))
+
+    return col
+
+
+def predefined_to_rgb(rgb_color):
+    """Transform a predefined color name to its [r, g, b] representation.
+
+    TODO: at the moment it doesn't handle 'by layer'.
+    See: `IfcDraughtingPreDefinedColour` and `IfcPresentationLayerWithStyle`.
+    """
+    name = rgb_color.Name.lower()
+    if name not in PREDEFINED_RGB:
+        print("Color name not in 'IfcDraughtingPreDefinedColour'.")
+
+        if name == 'by layer':
+            print("'IfcDraughtingPreDefinedColour' set 'by layer'; "
+                 "currently not handled, set to 'None'.")
+        return None
+
+    return PREDEFINED_RGB[name]
+
+
+def getParents(ifcobj):
+    """finds the parent entities of an IFC entity"""
+
+    parentlist = []
+    if hasattr(ifcobj,"ContainedInStructure"):
+        for rel in ifcobj.ContainedInStructure:
+            parentlist.append(rel.RelatingStructure)
+    elif hasattr(ifcobj,"Decomposes"):
+        for rel in ifcobj.Decomposes:
+            if rel.is_a("IfcRelAggregates"):
+                parentlist.append(rel.RelatingObject)
+    return parentlist
+
+
+# (filename, ifcfile) opened in a worker process. It lives as long as the worker,
+# which the multicore importer shuts down at the end of each import.
+_recordfile = None
+
+
+def getProductRecords(filename, ids):
+    """Returns compact records (see getProductRecord) of the IFC entities
+    with the given ids. Meant to be run in a worker process by the multicore
+    importer: the file is opened and indexed once per worker and reused
+    for all the following calls."""
+
+    global _recordfile
+
+    import ifcopenshell
+
+    if not _recordfile or _recordfile[0] != filename:
+        _recordfile = (filename, ifcopenshell.open(filename))
+    ifcfile = _recordfile[1]
+    return [getProductRecord(ifcfile.by_id(i)) for i in ids]
+
+
+def getProductRecord(ifcobj):
+    """Returns a dictionary describing an IFC product or spatial element,
+    containing only plain values that can be passed between processes:
+    id, type, name, attributes, properties, layers, material, parents,
+    openings and color."""
+
+    record = {
+        "id": ifcobj.id(),
+        "type": ifcobj.is_a(),
+        "name": ifcobj.Name,
+        "attributes": {},
+        "properties": {},
+        "layers": [],
+        "material": None,
+        "parents": [p.id() for p in getParents(ifcobj)],
+        "openings": [],
+        "color": None,
+    }
+
+    # attributes
+    for attr, value in ifcobj.get_info(include_identifier=False, recursive=False).items():
+        if attr != "type" and isinstance(value, (str, int, float)):
+            record["attributes"][attr] = value
+
+    # properties
+    for prel in getattr(ifcobj, "IsDefinedBy", []):
+        if prel.is_a("IfcRelDefinesByProperties"):
+            pset = prel.RelatingPropertyDefinition
+            if pset.is_a("IfcPropertySet"):
+                for prop in pset.HasProperties:
+                    if hasattr(prop, "NominalValue"):
+                        propname = prop.Name + ";;" + pset.Name
+                        v = [p.strip("'") for p in str(prop.NominalValue).strip(")").split(")")]
+                        record["properties"][propname] = ";;".join(v)
+
+    # layers and color
+    if getattr(ifcobj, "Representation", None):
+        for rep in ifcobj.Representation.Representations:
+            for layer in rep.LayerAssignments:
+                record["layers"].append((layer.id(), layer.Name))
+        record["color"] = getColorFromProduct(ifcobj)
+
+    # material
+    for association in getattr(ifcobj, "HasAssociations", []):
+        if association.is_a("IfcRelAssociatesMaterial"):
+            material = association.RelatingMaterial
+            if material.is_a("IfcMaterialList"):
+                material = material.Materials[0]  # take the first one for now...
+            if material.is_a("IfcMaterial"):
+                color = getColorFromMaterial(material)
+                record["material"] = (material.id(), material.Name, color)
+
+    # openings
+    for rel in getattr(ifcobj, "HasOpenings", None) or []:
+        record["openings"].append(rel.RelatedOpeningElement.id())
+
+    return record
@@ -22,8 +22,15 @@
 # *                                                                         *
 # ***************************************************************************
 
-"""FreeCAD IFC importer - Multicore version"""
+"""FreeCAD IFC importer - Multicore version
 
+Geometry is produced by the multithreaded IfcOpenShell iterator. Attributes,
+properties, layers, materials and relationships of each product are extracted
+into compact records (see importIFCRecords.getProductRecord), by a pool of
+worker processes if more than one core is allowed, so the main thread only
+has to create document objects from them."""
+
+import concurrent.futures
 import os
 import sys
 import time
@@ -36,6 +43,7 @@ import Draft
 from FreeCAD import Base
 
 from importers import importIFCHelper
+from importers import importIFCRecords
 
 # global dicts to store ifc object/freecad object relationships
 
@@ -45,6 +53,8 @@ objects = {} #ifcid : Arch_Component
 subs = {} #host_ifcid: [child_ifcid,...]
 adds = {} #host_ifcid: [child_ifcid,...]
 colors = {} # objname : (r,g,b)
+records = {} # ifcid : record
+recordstream = None # iterator yielding records computed by the worker pool
 
 
 def open(filename):
@@ -54,9 +64,12 @@ def open(filename):
     return insert(filename)
 
 
-def insert(filename,docname=None,preferences=None):
+def insert(filename,docname=None,preferences=None,workers=True):
 
-    """imports the contents of an IFC file in the given document"""
+    """imports the contents of an IFC file in the given document. If workers
+    is True and more than one core is allowed in the preferences, records are
+    extracted by a pool of worker processes, otherwise on the main thread.
+    The pool only lives for the duration of the import"""
 
     import ifcopenshell
     from ifcopenshell import geom
@@ -67,11 +80,15 @@ def insert(filename,docname=None,preferences=None):
     global objects
     global adds
     global subs
+    global records
+    global recordstream
     layers = {}
     materials = {}
     objects = {}
     adds = {}
     subs = {}
+    records = {}
+    recordstream = None
 
     # statistics
     starttime = time.time() # in seconds
@@ -104,18 +121,25 @@ def insert(filename,docname=None,preferences=None):
     productscount = len(ifcfile.by_type("IfcProduct"))
     progressbar.start("Importing "+str(productscount)+" products...",productscount)
     cores = preferences["MULTICORE"]
+    if workers and cores > 1:
+        ids = [e.id() for e in ifcfile.by_type("IfcProduct")]
+        ids.extend([e.id() for e in ifcfile.by_type("IfcProject")])
+        recordstream = streamRecords(filename,ids,cores)
     iterator = ifcopenshell.geom.iterator(settings,ifcfile,cores)
     iterator.initialize()
     count = 0
 
     # process objects
-    for item in iterator:
-        brep = item.geometry.brep_data
-        ifcproduct = ifcfile.by_id(item.guid)
-        obj = createProduct(ifcproduct,brep)
-        progressbar.next(True)
-        writeProgress(count,productscount,starttime)
-        count += 1
+    try:
+        for item in iterator:
+            brep = item.geometry.brep_data
+            record = getRecord(ifcfile,item.id)
+            obj = createProduct(ifcfile,record,brep)
+            progressbar.next(True)
+            writeProgress(count,productscount,starttime)
+            count += 1
+    finally:
+        closeRecordStream()
 
     # process 2D annotations
     annotations = ifcfile.by_type("IfcAnnotation")
@@ -141,8 +165,81 @@ def insert(filename,docname=None,preferences=None):
     return FreeCAD.ActiveDocument
 
 
-def writeProgress(count=None,total=None,starttime=None):
+def getPool(cores):
+
+    """returns a new pool of worker processes to extract records, or None
+    if no Python interpreter could be found to run the workers"""
+
+    from freecad.utils import create_process_pool
+    pool = create_process_pool(cores)
+    if not pool:
+        print("No Python interpreter found, IFC records will be extracted serially")
+    return pool
+
+
+def streamRecords(filename,ids,cores):
+
+    """submits the extraction of the records of the given entity ids
+    to a new pool of worker processes, and yields them as they are returned.
+    The pool is shut down when the stream ends or is closed, which also
+    releases the IFC file opened by the workers"""
+
+    executor = getPool(cores)
+    if not executor:
+        return
+    futures = []
+    try:
+        size = max(1,len(ids)//(cores*8))
+        for i in range(0,len(ids),size):
+            futures.append(executor.submit(importIFCRecords.getProductRecords,filename,ids[i:i+size]))
+        for future in concurrent.futures.as_completed(futures):
+            for record in future.result():
+                yield record
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def closeRecordStream():
 
+    """stops the worker pool if the record stream is still running"""
+
+    global recordstream
+
+    if recordstream:
+        recordstream.close()
+        recordstream = None
+
+
+def getRecord(ifcfile,ifcid):
+
+    """returns the record of the given entity, waiting for the workers
+    if it has not arrived yet, or computing it here if there are no workers.
+    If the workers fail (the pool is broken, the interpreter cannot import
+    the records module, a record cannot be transferred...) the remaining
+    records are computed here"""
+
+    global records
+    global recordstream
+
+    while recordstream and not ifcid in records:
+        try:
+            record = next(recordstream)
+        except StopIteration:
+            recordstream = None
+            break
+        except Exception as e:
+            print("IFC worker processes failed, extracting records serially:",repr(e))
+            recordstream = None
+            break
+        records[record["id"]] = record
+    if not ifcid in records:
+        records[ifcid] = importIFCRecords.getProductRecord(ifcfile.by_id(ifcid))
+    return records[ifcid]
+
+
+def writeProgress(count=None,total=None,starttime=None):
     """write progress to console"""
 
     if not FreeCAD.GuiUp:
@@ -161,43 +258,42 @@ def writeProgress(count=None,total=None,starttime=None):
         sys.stdout.write(fstring.format(hashes, int(r*100),eta))
 
 
-def createProduct(ifcproduct,brep):
+def createProduct(ifcfile,record,brep):
 
-    """creates an Arch object from an IFC product"""
+    """creates an Arch object from an IFC product record"""
 
     import Part
 
     shape = Part.Shape()
     shape.importBrepFromString(brep,False)
     shape.scale(1000.0) # IfcOpenShell outputs in meters
-    if ifcproduct.is_a("IfcSpace"):
+    if record["type"] == "IfcSpace":
         obj = Arch.makeSpace()
     else:
         obj = Arch.makeComponent()
     obj.Shape = shape
-    objects[ifcproduct.id()] = obj
-    setAttributes(obj,ifcproduct)
-    setProperties(obj,ifcproduct)
-    createLayer(obj,ifcproduct)
-    createMaterial(obj,ifcproduct)
-    createModelStructure(obj,ifcproduct)
-    setRelationships(obj,ifcproduct)
-    setColor(obj,ifcproduct)
+    objects[record["id"]] = obj
+    setAttributes(obj,record)
+    setProperties(obj,record)
+    createLayer(obj,record)
+    createMaterial(obj,record)
+    createModelStructure(ifcfile,obj,record)
+    setRelationships(obj,record)
+    setColor(obj,record)
     return obj
 
 
-def setAttributes(obj,ifcproduct):
+def setAttributes(obj,record):
 
     """sets the IFC attributes of a component"""
 
-    ifctype = ArchIFC.uncamel(ifcproduct.is_a())
-    if ifcproduct.Name:
-        obj.Label = ifcproduct.Name
+    ifctype = ArchIFC.uncamel(record["type"])
+    if record["name"]:
+        obj.Label = record["name"]
     if ifctype in ArchIFC.IfcTypes:
         obj.IfcType = ifctype
-    for attr in dir(ifcproduct):
+    for attr,value in record["attributes"].items():
         if attr in obj.PropertiesList:
-            value = getattr(ifcproduct,attr)
             if value:
                 try:
                     setattr(obj,attr,value)
@@ -205,98 +301,85 @@ def setAttributes(obj,ifcproduct):
                     pass
 
 
-def setProperties(obj,ifcproduct):
+def setProperties(obj,record):
 
     """sets the IFC properties of a component"""
 
-    props = obj.IfcProperties
-    for prel in ifcproduct.IsDefinedBy:
-        if prel.is_a("IfcRelDefinesByProperties"):
-            pset = prel.RelatingPropertyDefinition
-            if pset.is_a("IfcPropertySet"):
-                for prop in pset.HasProperties:
-                    if hasattr(prop,"NominalValue"):
-                        propname = prop.Name+";;"+pset.Name
-                        v = [p.strip("'") for p in str(prop.NominalValue).strip(")").split(")")]
-                        propvalue = ";;".join(v)
+    if record["properties"] and isinstance(getattr(obj,"IfcProperties",None),dict):
+        props = obj.IfcProperties
+        props.update(record["properties"])
+        obj.IfcProperties = props
 
 
-def setColor(obj,ifcproduct):
+def setColor(obj,record):
 
     """sets the color of an object"""
 
     global colors
 
-    color = importIFCHelper.getColorFromProduct(ifcproduct)
+    color = record["color"]
     colors[obj.Name] = color
     if FreeCAD.GuiUp and color:
         obj.ViewObject.ShapeColor = color[:3]
 
 
-def createLayer(obj,ifcproduct):
+def createLayer(obj,record):
 
     """sets the layer of a component"""
 
     global layers
 
-    if ifcproduct.Representation:
-        for rep in ifcproduct.Representation.Representations:
-            for layer in rep.LayerAssignments:
-                if not layer.id() in layers:
-                    layers[layer.id()] = Draft.make_layer(layer.Name)
-                layers[layer.id()].Proxy.addObject(layers[layer.id()],obj)
+    for layerid,name in record["layers"]:
+        if not layerid in layers:
+            layers[layerid] = Draft.make_layer(name)
+        layers[layerid].Proxy.addObject(layers[layerid],obj)
 
 
-def createMaterial(obj,ifcproduct):
+def createMaterial(obj,record):
 
     """sets the material of a component"""
 
     global materials
 
-    for association in ifcproduct.HasAssociations:
-        if association.is_a("IfcRelAssociatesMaterial"):
-            material = association.RelatingMaterial
-            if material.is_a("IfcMaterialList"):
-                material = material.Materials[0] # take the first one for now...
-            if material.is_a("IfcMaterial"):
-                if not material.id() in materials:
-                    color = importIFCHelper.getColorFromMaterial(material)
-                    materials[material.id()] = Arch.makeMaterial(material.Name,color=color)
-                obj.Material = materials[material.id()]
+    if record["material"]:
+        materialid,name,color = record["material"]
+        if not materialid in materials:
+            materials[materialid] = Arch.makeMaterial(name,color=color)
+        obj.Material = materials[materialid]
 
 
-def createModelStructure(obj,ifcobj):
+def createModelStructure(ifcfile,obj,record):
 
     """sets the parent containers of an IFC object"""
 
     global objects
 
-    for parent in importIFCHelper.getParents(ifcobj):
-        if not parent.id() in objects:
-            if parent.is_a("IfcProject"):
+    for parentid in record["parents"]:
+        if not parentid in objects:
+            parent = getRecord(ifcfile,parentid)
+            if parent["type"] == "IfcProject":
                 parentobj = Arch.makeProject()
-            elif parent.is_a("IfcSite"):
+            elif parent["type"] == "IfcSite":
                 parentobj = Arch.makeSite()
             else:
                 parentobj = Arch.makeBuildingPart()
             setAttributes(parentobj,parent)
             setProperties(parentobj,parent)
-            createModelStructure(parentobj,parent)
-            objects[parent.id()] = parentobj
-        if hasattr(objects[parent.id()].Proxy,"addObject"):
-            objects[parent.id()].Proxy.addObject(objects[parent.id()],obj)
+            createModelStructure(ifcfile,parentobj,parent)
+            objects[parentid] = parentobj
+        if hasattr(objects[parentid].Proxy,"addObject"):
+            objects[parentid].Proxy.addObject(objects[parentid],obj)
 
 
-def setRelationships(obj,ifcobj):
+def setRelationships(obj,record):
 
     """sets additions/subtractions"""
 
     global adds
     global subs
 
-    if hasattr(ifcobj,"HasOpenings") and ifcobj.HasOpenings:
-        for rel in ifcobj.HasOpenings:
-            subs.setdefault(ifcobj.id(),[]).append(rel.RelatedOpeningElement)
+    if record["openings"]:
+        subs.setdefault(record["id"],[]).extend(record["openings"])
 
     # TODO: assemblies & booleans
 
@@ -312,7 +395,7 @@ def processRelationships():
                     if val in objects:
                         if hasattr(objects[key],dom[1]):
                             g = getattr(objects[key],dom[1])
-                            g.append(val)
+                            g.append(objects[val])
                             setattr(objects[key],dom[1],g)
 
 def storeColorDict():
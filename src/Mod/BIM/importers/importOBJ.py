@@ -55,9 +55,11 @@ else:
     # \endcond
 
 
-def findVert(aVertex,aList):
-    "finds aVertex in aList, returns index"
+def findVert(aVertex,aList,index=None):
+    "finds aVertex in aList, returns index. If given, index is a dict built by getVertIndex"
     p = Draft.precision()
+    if index is not None:
+        return index.get((round(aVertex.X,p),round(aVertex.Y,p),round(aVertex.Z,p)))
     for i in range(len(aList)):
         if round(aVertex.X,p) == round(aList[i].X,p):
             if round(aVertex.Y,p) == round(aList[i].Y,p):
@@ -65,6 +67,14 @@ def findVert(aVertex,aList):
                     return i
     return None
 
+def getVertIndex(aList):
+    "returns a dict of rounded coordinates:first index of the vertices of aList, to be used with findVert"
+    p = Draft.precision()
+    index = {}
+    for i, v in enumerate(aList):
+        index.setdefault((round(v.X,p),round(v.Y,p),round(v.Z,p)),i)
+    return index
+
 def getIndices(obj,shape,offsetv,offsetvn):
     "returns a list with 2 lists: vertices and face indexes, offset with the given amount"
     p = Draft.precision()
@@ -101,13 +111,15 @@ def getIndices(obj,shape,offsetv,offsetvn):
         for i, vn in enumerate(mesh.Topology[1]):
             flist.append(" "+str(vn[0]+offsetv)+"//"+str(i+offsetvn)+" "+str(vn[1]+offsetv)+"//"+str(i+offsetvn)+" "+str(vn[2]+offsetv)+"//"+str(i+offsetvn)+" ")
     else:
-        for v in shape.Vertexes:
+        vertexes = shape.Vertexes
+        index = getVertIndex(vertexes)
+        for v in vertexes:
             vlist.append(" "+str(round(v.X,p))+" "+str(round(v.Y,p))+" "+str(round(v.Z,p)))
         if not shape.Faces:
             for e in shape.Edges:
                 if DraftGeomUtils.geomType(e) == "Line":
-                    ei = " " + str(findVert(e.Vertexes[0],shape.Vertexes) + offsetv)
-                    ei += " " + str(findVert(e.Vertexes[-1],shape.Vertexes) + offsetv)
+                    ei = " " + str(findVert(e.Vertexes[0],vertexes,index) + offsetv)
+                    ei += " " + str(findVert(e.Vertexes[-1],vertexes,index) + offsetv)
                     elist.append(ei)
         for f in shape.Faces:
             if len(f.Wires) > 1:
@@ -117,7 +129,7 @@ def getIndices(obj,shape,offsetv,offsetvn):
                     fi = ""
                     for vi in fdata:
                         vdata = Part.Vertex(tris[0][vi])
-                        fi += " " + str(findVert(vdata,shape.Vertexes) + offsetv)
+                        fi += " " + str(findVert(vdata,vertexes,index) + offsetv)
                     flist.append(fi)
             else:
                 fi = ""
@@ -127,7 +139,7 @@ def getIndices(obj,shape,offsetv,offsetvn):
                     edges.reverse()
                 for e in edges:
                     v = e.Vertexes[0 if e.Orientation == "Forward" else 1]
-                    ind = findVert(v,shape.Vertexes)
+                    ind = findVert(v,vertexes,index)
                     if ind is None:
                         return None,None,None,None
                     fi += " " + str(ind + offsetv)
@@ -250,14 +262,10 @@ def export(exportList,filename,colors=None):
                         materials.append(("color_" + mn,obj.ViewObject.ShapeColor,obj.ViewObject.Transparency))
 
             # write geometry
-            for v in vlist:
-                outfile.write("v" + v + "\n")
-            for vn in vnlist:
-                outfile.write("vn" + vn + "\n")
-            for e in elist:
-                outfile.write("l" + e + "\n")
-            for f in flist:
-                outfile.write("f" + f + "\n")
+            outfile.writelines(["v" + v + "\n" for v in vlist])
+            outfile.writelines(["vn" + vn + "\n" for vn in vnlist])
+            outfile.writelines(["l" + e + "\n" for e in elist])
+            outfile.writelines(["f" + f + "\n" for f in flist])
 
     outfile.close()
     FreeCAD.Console.PrintMessage(translate("Arch","Successfully written") + " " + filename + "\n")
@@ -966,18 +966,26 @@ def compress_floats(floats: list[str]) -> str:
     """
     fullstr = json.dumps(floats, separators=(",", ":"))
     fullstr = fullstr.replace("[", "").replace("]", "").replace('"', "")
-    floatStr = ""
     baseFloatCt = len(baseFloat)
     baseCt = len(base)
-    for fs in range(0, len(fullstr), 7):  # chunks of 7 chars, skip the first one
-        str7 = fullstr[fs : (fs + 7)]
-        quotient = 0
-        for s in range(len(str7)):
-            quotient += baseFloat.find(str7[s]) * pow(baseFloatCt, (6 - s))
-        for v in range(4):
-            floatStr += base[quotient % baseCt]
-            quotient = int(quotient / baseCt)
-    return floatStr
+
+    # base13 digit of each char, -1 for unknown chars like str.find()
+    table = np.full(256, -1, dtype=np.int64)
+    table[np.frombuffer(baseFloat.encode("ascii"), dtype=np.uint8)] = np.arange(baseFloatCt)
+    digits = table[np.frombuffer(fullstr.encode("ascii", "replace"), dtype=np.uint8)]
+
+    # chunks of 7 chars, the last one padded with zeros
+    digits = np.concatenate([digits, np.zeros(-digits.size % 7, dtype=np.int64)])
+    powers = baseFloatCt ** np.arange(6, -1, -1, dtype=np.int64)
+    quotients = digits.reshape(-1, 7) @ powers
+
+    # 4 base90 chars per chunk
+    chars = np.empty((quotients.size, 4), dtype=np.int64)
+    for v in range(4):
+        chars[:, v] = quotients % baseCt
+        quotients = (quotients / baseCt).astype(np.int64)
+    baseChars = np.frombuffer(base.encode("ascii"), dtype=np.uint8)
+    return baseChars[chars.ravel()].tobytes().decode("ascii")
 
 
 def compress_wires(wires: list[list[str]], floats: list[str]) -> tuple[list[list[str]], list[str]]:
@@ -1001,30 +1009,25 @@ def compress_verts(verts: list[str], floats: list[str]) -> tuple[list[int], list
     floats_v, ind, verts_v = np.unique(verts, return_index=True, return_inverse=True)
 
     # Reorder as np.unique orders the resulting array (needed for facet matching)
-    floats_v = floats_v[ind.argsort()]
-    reindex = dict(zip(ind.argsort(), np.arange(ind.size)))
-    verts_v = np.vectorize(lambda entry: reindex[entry])(verts_v)
-
-    # Get repeated indexes already existing from previous steps
-    v_in_w = np.nonzero(np.isin(floats_v, floats))[0]
-    w_in_v = np.nonzero(np.isin(floats, floats_v))[0]
-    v_in_w2 = np.where(~np.isin(floats_v, floats))
+    order = ind.argsort()
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    floats_v = floats_v[order]
+    verts_v = rank[verts_v.ravel()]
 
-    # Order values the same
-    v_in_w = v_in_w[floats_v[v_in_w].argsort()]
-    w_in_v = w_in_v[np.array(floats)[w_in_v].argsort()]
-
-    # Replace repeated indexes that exist in floats
+    # Reuse the indexes of values already existing in floats, and append the others
     new_index = len(floats)
-    verts_v += new_index
-    for vw, wv in zip(v_in_w + new_index, w_in_v):
-        verts_v[verts_v == vw] = wv
-
-    # Remove indexes of repeated entries in floats_v
-    for vw in (v_in_w + new_index)[v_in_w.argsort()][::-1]:
-        verts_v[verts_v > vw] -= 1
+    if new_index:
+        floats_a = np.array(floats)
+        sorter = floats_a.argsort()
+        pos = np.minimum(np.searchsorted(floats_a, floats_v, sorter=sorter), new_index - 1)
+        found = floats_a[sorter[pos]] == floats_v
+        target = np.where(found, sorter[pos], new_index + np.cumsum(~found) - 1)
+    else:
+        found = np.zeros(floats_v.size, dtype=bool)
+        target = np.arange(floats_v.size)
 
-    return verts_v.tolist(), np.concatenate([floats, floats_v[v_in_w2]]).tolist()
+    return target[verts_v].tolist(), np.concatenate([floats, floats_v[~found]]).tolist()
 
 
 def baseEncode(arr: list[int]) -> str:
@@ -1034,19 +1037,24 @@ def baseEncode(arr: list[int]) -> str:
     if len(arr) == 0:
         return ""
 
-    longest = 0
-    output = []
     baseCt = len(base)
-    for v in range(len(arr)):
-        buffer = ""
-        quotient = arr[v]
-        while True:
-            buffer += base[quotient % baseCt]
-            quotient = int(quotient / baseCt)
-            if quotient == 0:
-                break
-        output.append(buffer)
-        if len(buffer) > longest:
-            longest = len(buffer)
-    output = [("{:>" + str(longest) + "}").format(x) for x in output]  # pad each element
-    return str(longest) + ("").join(output)
+    arr = np.asarray(arr, dtype=np.int64)
+
+    # number of base90 digits of each value
+    lengths = np.ones(arr.size, dtype=np.int64)
+    power = baseCt
+    while power <= arr.max():
+        lengths += arr >= power
+        power *= baseCt
+    longest = int(lengths.max())
+
+    # digits are written least significant first, each element padded to the left
+    baseChars = np.frombuffer(base.encode("ascii"), dtype=np.uint8)
+    output = np.full((arr.size, longest), ord(" "), dtype=np.uint8)
+    rows = np.arange(arr.size)
+    quotients = arr
+    for k in range(longest):
+        mask = lengths > k
+        output[rows[mask], (longest - lengths + k)[mask]] = baseChars[quotients[mask] % baseCt]
+        quotients = quotients // baseCt
+    return str(longest) + output.tobytes().decode("ascii")
@@ -24,8 +24,6 @@
 
 """Diffing tool for NativeIFC project objects"""
 
-import difflib
-
 import ifcopenshell
 
 import FreeCAD
@@ -38,31 +36,125 @@ translate = FreeCAD.Qt.translate
 
 
 def get_diff(proj):
-    """Obtains a diff between the current version and the saved version of a project"""
+    """Obtains a diff between the current version and the saved version of a project.
+    Returns 1 if the project has never been saved, otherwise a diff dictionary as
+    returned by diff_files()"""
 
     if not getattr(proj, "IfcFilePath", None):
-        old = []
         return 1
-    else:
-        # cannot use open() here as it gives different encoding
-        # than ifcopenshell and diff does not work
-        f = ifcopenshell.open(proj.IfcFilePath)
-        old = f.wrapped_data.to_string().split("\n")
+    old = ifcopenshell.open(proj.IfcFilePath)
     if not old:
         return ""
     ifcfile = ifc_tools.get_ifcfile(proj)
     if not ifcfile:
         return ""
-    new = ifcfile.wrapped_data.to_string().split("\n")
-    # diff = difflib.HtmlDiff().make_file(old,new) # UGLY
-    res = [l for l in difflib.unified_diff(old, new, lineterm="")]
-    res = [l for l in res if l.startswith("+") or l.startswith("-")]
-    res = [l for l in res if not l.startswith("+++") and not l.startswith("---")]
-    return "\n".join(res)
+    return diff_files(old, ifcfile)
+
+
+def diff_files(old, new):
+    """Returns an entity-level diff between two ifc files, as a dictionary with
+    "added", "removed" and "modified" lists of entries (see get_entry). Entities are
+    matched by id, or by GlobalId if they were recreated with a different id. Entries
+    that concern properties are also listed under "properties". Returns an empty
+    string if there are no differences"""
+
+    old_hashes, old_guids = index_file(old)
+    new_hashes, new_guids = index_file(new)
+    removed = [i for i in old_hashes if i not in new_hashes]
+    added = [i for i in new_hashes if i not in old_hashes]
+    modified = [
+        (i, i) for i in old_hashes if i in new_hashes and old_hashes[i] != new_hashes[i]
+    ]
+
+    # rooted entities recreated with another id are modified, not removed and added
+    removed_set = set(removed)
+    removed_guids = {g: i for g, i in old_guids.items() if i in removed_set}
+    moved = set()
+    for guid, i in new_guids.items():
+        if guid in removed_guids and i not in old_hashes:
+            modified.append((removed_guids[guid], i))
+            moved.add(removed_guids[guid])
+            moved.add(i)
+    removed = [i for i in removed if i not in moved]
+    added = [i for i in added if i not in moved]
+    if not (removed or added or modified):
+        return ""
+
+    diff = {"added": [], "removed": [], "modified": [], "properties": []}
+    for i in added:
+        diff["added"].append(get_entry(None, new.by_id(i)))
+    for i in removed:
+        diff["removed"].append(get_entry(old.by_id(i), None))
+    for i, j in modified:
+        diff["modified"].append(get_entry(old.by_id(i), new.by_id(j)))
+    for key in ("added", "removed", "modified"):
+        for entry in diff[key]:
+            if entry["property"]:
+                diff["properties"].append(entry)
+    return diff
+
+
+def index_file(ifcfile):
+    """Returns an {id: hash} dictionary of all the entities of an ifc file,
+    where the hash is computed from the entity attributes, and a {GlobalId: id}
+    dictionary of its rooted entities"""
+
+    hashes = {}
+    for line in ifcfile.wrapped_data.to_string().split("\n"):
+        if line.startswith("#"):
+            sid, attributes = line.split("=", 1)
+            hashes[int(sid[1:])] = hash(attributes)
+    guids = {e.GlobalId: e.id() for e in ifcfile.by_type("IfcRoot")}
+    return hashes, guids
+
+
+def get_entry(old, new):
+    """Returns a diff entry describing the change between two versions of an entity,
+    one of them being None if the entity was added or removed. The entry is a
+    dictionary with status, id, type, name, line and property keys. Modified entities also
+    get an attributes key with a list of (name, old value, new value) tuples"""
+
+    entity = new if new else old
+    entry = {
+        "status": "modified" if old and new else "added" if new else "removed",
+        "id": entity.id(),
+        "type": entity.is_a(),
+        "name": getattr(entity, "Name", None) or getattr(entity, "GlobalId", None),
+        "line": str(entity),
+        "property": entity.is_a("IfcProperty"),
+    }
+    if old and new:
+        old_values = get_attribute_values(old)
+        new_values = get_attribute_values(new)
+        entry["attributes"] = [
+            (name, old_values.get(name), value)
+            for name, value in new_values.items()
+            if old_values.get(name) != value
+        ]
+    return entry
+
+
+def get_attribute_values(entity):
+    """Returns a {name: value} dictionary of the attributes of an entity,
+    where referenced entities are replaced by their step ids"""
+
+    def to_text(value):
+        if isinstance(value, ifcopenshell.entity_instance):
+            if value.id():
+                return "#" + str(value.id())
+            return str(value)
+        if isinstance(value, (list, tuple)):
+            return "(" + ",".join([to_text(v) for v in value]) + ")"
+        return repr(value)
+
+    return {entity.attribute_name(i): to_text(v) for i, v in enumerate(entity)}
 
 
 def htmlize(diff):
-    """Returns an HTML version of a diff list"""
+    """Returns an HTML version of a diff dictionary"""
+
+    def span(color, text):
+        return "<span style='color:" + color + ";'>" + text[:100] + "</span><br/>\n"
 
     html = "<html><body>\n"
     if diff == 1:
@@ -70,14 +162,34 @@ def htmlize(diff):
         " to have an existing IFC file to compare with."
         " Then, run this command again.") + "<br/>\n"
     elif diff:
-        diff = diff.split("\n")
-        for l in diff:
-            if l.startswith("+"):
-                html += "<span style='color:green;'>" + l[:100] + "</span><br/>\n"
-            elif l.startswith("-"):
-                html += "<span style='color:red;'>" + l[:100] + "</span><br/>\n"
-            else:
-                html += l + "<br/>\n"
+        html += "<b>" + translate("BIM", "Entities") + "</b>: "
+        html += translate("BIM", "{} added, {} removed, {} modified").format(
+            len(diff["added"]), len(diff["removed"]), len(diff["modified"])
+        )
+        html += "<br/>\n"
+        if diff["properties"]:
+            html += "<br/>\n<b>" + translate("BIM", "Properties") + "</b><br/>\n"
+            for entry in diff["properties"]:
+                if entry["status"] == "added":
+                    html += span("green", "+ " + entry["line"])
+                elif entry["status"] == "removed":
+                    html += span("red", "- " + entry["line"])
+                else:
+                    html += span("blue", "~ " + entry["line"])
+        html += "<br/>\n<b>" + translate("BIM", "Changes") + "</b><br/>\n"
+        for entry in diff["removed"]:
+            html += span("red", "- " + entry["line"])
+        for entry in diff["added"]:
+            html += span("green", "+ " + entry["line"])
+        for entry in diff["modified"]:
+            text = "~ #{} {}".format(entry["id"], entry["type"])
+            if entry["name"]:
+                text += " (" + entry["name"] + ")"
+            html += span("blue", text)
+            for name, old, new in entry["attributes"]:
+                html += "&nbsp;&nbsp;&nbsp;&nbsp;" + name + ": "
+                html += span("red", str(old)) + "&nbsp;" * 4 + name + ": "
+                html += span("green", str(new))
     else:
         html += translate("BIM", "No changes to display.") + "<br/>\n"
     html += "</body></html>"
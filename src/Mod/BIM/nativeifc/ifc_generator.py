@@ -95,7 +95,19 @@ def generate_geometry(obj, cached=False):
     # generate the shape or coin node
     elements = get_decomposition(obj)
     if obj.ShapeMode == "Shape":
-        shape, colors = generate_shape(ifcfile, elements, cached)
+        callback = None
+        if FreeCAD.GuiUp:
+            preview = Part.makeCompound([])
+
+            def callback(shapes, colors):
+                # show the shapes obtained so far while the rest is loading,
+                # only the new batch is added to the compound already shown
+                nonlocal preview
+                preview = Part.makeCompound([preview] + shapes)
+                obj.Shape = preview
+                FreeCADGui.updateGui()
+
+        shape, colors = generate_shape(ifcfile, elements, cached, callback=callback)
         if shape:
             placement = shape.Placement
             obj.Shape = shape
@@ -104,7 +116,20 @@ def generate_geometry(obj, cached=False):
             obj.Shape = Part.Shape()
             print_debug(obj)
     elif obj.ViewObject and obj.ShapeMode == "Coin":
-        node, placement = generate_coin(ifcfile, elements, cached)
+        shown = False
+
+        def callback(node, placement):
+            # show the nodes obtained so far while the rest is loading,
+            # only the new batch is added to the nodes already shown
+            nonlocal shown
+            if shown:
+                add_representation(obj.ViewObject, node)
+            else:
+                set_representation(obj.ViewObject, node)
+                shown = True
+            FreeCADGui.updateGui()
+
+        node, placement = generate_coin(ifcfile, elements, cached, callback=callback)
         if node:
             # TODO this still needs to be fixed
             #QtCore.QTimer.singleShot(0, lambda: set_representation(obj.ViewObject, node))
@@ -121,8 +146,16 @@ def generate_geometry(obj, cached=False):
         QtCore.QTimer.singleShot(0, lambda: ifc_tools.set_colors(obj, colors))  # TODO migrate here?
 
 
-def generate_shape(ifcfile, elements, cached=False):
-    """Returns a Part shape and a list of colors for a list of elements"""
+def generate_shape(ifcfile, elements, cached=False, callback=None):
+    """Returns a Part shape and a list of colors for a list of elements
+
+    If progressive loading is enabled (ProgressiveBatchSize preference), elements
+    are processed in batches, the most relevant ones first (see get_batches). After
+    each batch, the given callback, if any, is called with the lists of shapes and
+    colors obtained since the previous call. If the callback returns False, or if
+    the user aborts the progress bar, loading stops and what has been obtained so
+    far is returned.
+    """
 
     # setup
     if not elements:
@@ -154,73 +187,53 @@ def generate_shape(ifcfile, elements, cached=False):
             return shapes, colors
         elements = rest
 
-    # prepare the iterator
-    iterator = get_geom_iterator(ifcfile, elements, brep_mode=True)
+    # prepare the iterators
+    batches = get_batches(ifcfile, elements)
+    progressive = len(batches) > 1
+    iterator = get_geom_iterator(ifcfile, batches[0], brep_mode=True)
     if iterator is None:
         return None, None
     total = len(elements)
     progressbar = Base.ProgressIndicator()
     progressbar.start("Generating " + str(total) + " shapes...", total)
-    done = []
+    done = set()
+    # the shapes and colors already given to the callback
+    start = cstart = 0
 
     # iterate
-    while True:
-        item = iterator.get()
-        if item and item.id not in done:
-            done.append(item.id)
-            # get and transfer brep data
-            brep = item.geometry.brep_data
-            shape = Part.Shape()
-            shape.importBrepFromString(brep, False)
-            if hasattr(item.transformation.matrix, "data"):
-                # IfcOpenShell 0.7
-                mat = ifc_tools.get_freecad_matrix(item.transformation.matrix.data)
-            else:
-                # IfcOpenShell 0.8
-                mat = ifc_tools.get_freecad_matrix(item.transformation.matrix)
-            shape.scale(ifc_tools.SCALE)
-            shape.transformShape(mat)
-            shapes.append(shape)
-
-            # get colors
-            sstyle = item.geometry.surface_styles
-            scolors = []
-            if (
-                (len(sstyle) > 4)
-                and len(shape.Solids) > 1
-                and len(sstyle) // 4 == len(shape.Solids)
-            ):
-                # multiple colors
-                for i in range(len(shape.Solids)):
-                    for j in range(len(shape.Solids[i].Faces)):
-                        scolors.append(
-                            (
-                                sstyle[i * 4],
-                                sstyle[i * 4 + 1],
-                                sstyle[i * 4 + 2],
-                                1.0 - sstyle[i * 4 + 3],
-                            )
-                        )
-                if len(colors) < len(shape.Faces):
-                    for i in range(len(shape.Faces) - len(colors)):
-                        scolors.append(
-                            (sstyle[0], sstyle[1], sstyle[2], 1.0 - sstyle[3])
-                        )
-            else:
-                color = (sstyle[0], sstyle[1], sstyle[2], 1.0 - sstyle[3])
-                for f in shape.Faces:
-                    scolors.append(color)
-
-            # update the cache
-            cache["Shape"][item.id] = shape
-            cache["Color"][item.id] = scolors
-            colors.extend(scolors)
-            progressbar.next(True)
-        if not iterator.next():
-            break
+    try:
+        for i, batch in enumerate(batches):
+            if i > 0:
+                iterator = get_geom_iterator(ifcfile, batch, brep_mode=True)
+                if iterator is None:
+                    continue
+            while True:
+                item = iterator.get()
+                if item and item.id not in done:
+                    done.add(item.id)
+                    shape, scolors = get_item_shape(item)
+                    # update the cache
+                    cache["Shape"][item.id] = shape
+                    cache["Color"][item.id] = scolors
+                    shapes.append(shape)
+                    colors.extend(scolors)
+                    progressbar.next(True)
+                if not iterator.next():
+                    break
+            if progressive and callback and len(shapes) > start and i < len(batches) - 1:
+                if callback(shapes[start:], colors[cstart:]) is False:
+                    break
+                start, cstart = len(shapes), len(colors)
+    except Base.FreeCADAbort:
+        if not progressive:
+            raise
+        FreeCAD.Console.PrintWarning(
+            "Loading aborted, {} of {} shapes generated\n".format(len(done), total)
+        )
 
     # write the cache
     set_cache(ifcfile, cache)
+    progressbar.stop()
 
     # compound the shape if needed
     if len(shapes) == 1:
@@ -228,13 +241,64 @@ def generate_shape(ifcfile, elements, cached=False):
     else:
         shape = Part.makeCompound(shapes)
 
-    progressbar.stop()
     return shape, colors
 
 
-def generate_coin(ifcfile, elements, cached=False):
+def get_item_shape(item):
+    """Returns a Part shape and a list of face colors from an iterator item"""
+
+    # get and transfer brep data
+    brep = item.geometry.brep_data
+    shape = Part.Shape()
+    shape.importBrepFromString(brep, False)
+    if hasattr(item.transformation.matrix, "data"):
+        # IfcOpenShell 0.7
+        mat = ifc_tools.get_freecad_matrix(item.transformation.matrix.data)
+    else:
+        # IfcOpenShell 0.8
+        mat = ifc_tools.get_freecad_matrix(item.transformation.matrix)
+    shape.scale(ifc_tools.SCALE)
+    shape.transformShape(mat)
+
+    # get colors
+    sstyle = item.geometry.surface_styles
+    scolors = []
+    if (
+        (len(sstyle) > 4)
+        and len(shape.Solids) > 1
+        and len(sstyle) // 4 == len(shape.Solids)
+    ):
+        # multiple colors
+        for i in range(len(shape.Solids)):
+            for j in range(len(shape.Solids[i].Faces)):
+                scolors.append(
+                    (
+                        sstyle[i * 4],
+                        sstyle[i * 4 + 1],
+                        sstyle[i * 4 + 2],
+                        1.0 - sstyle[i * 4 + 3],
+                    )
+                )
+        if len(scolors) < len(shape.Faces):
+            for i in range(len(shape.Faces) - len(scolors)):
+                scolors.append(
+                    (sstyle[0], sstyle[1], sstyle[2], 1.0 - sstyle[3])
+                )
+    else:
+        color = (sstyle[0], sstyle[1], sstyle[2], 1.0 - sstyle[3])
+        for f in shape.Faces:
+            scolors.append(color)
+    return shape, scolors
+
+
+def generate_coin(ifcfile, elements, cached=False, callback=None):
     """Returns coin node data (verts,face and edge index) and a Placement
-    from a list of ifc elements"""
+    from a list of ifc elements
+
+    Progressive loading works the same way as in generate_shape(): after each
+    batch, the given callback is called with the unified node of the elements
+    obtained since the previous call, and its placement.
+    """
 
     # setup
     # strip out elements without representation, as they can't generate a node anyway
@@ -267,73 +331,55 @@ def generate_coin(ifcfile, elements, cached=False):
             return unify(nodes), placement
         elements = rest
 
-    # prepare the iterator
-    iterator = get_geom_iterator(ifcfile, elements, brep_mode=False)
+    # prepare the iterators
+    batches = get_batches(ifcfile, elements)
+    progressive = len(batches) > 1
+    iterator = get_geom_iterator(ifcfile, batches[0], brep_mode=False)
     if iterator is None:
         return None, None
     total = len(elements)
     progressbar = Base.ProgressIndicator()
     progressbar.start("Generating " + str(total) + " shapes...", total)
-    done = []
+    done = set()
+    # the nodes already given to the callback
+    start = 0
 
     # iterate
-    while True:
-        item = iterator.get()
-        if item and item.id not in done:
-            done.append(item.id)
-
-            # colors
-            if item.geometry.materials:
-                color = item.geometry.materials[0].diffuse
-                if hasattr(color, "r") and hasattr(color, "g"):
-                    # IfcOpenShell 0.8
-                    color = (color.r(), color.g(), color.b())
-                else:
-                    # IfcOpenShell 0.7
-                    color = (float(color[0]), float(color[1]), float(color[2]))
-                trans = item.geometry.materials[0].transparency
-                if trans >= 0:
-                    color += (float(trans),)
-            else:
-                color = (0.85, 0.85, 0.85)
-
-            # verts
-            if hasattr(item.transformation.matrix, "data"):
-                # IfcOpenShell 0.7
-                matrix = ifc_tools.get_freecad_matrix(item.transformation.matrix.data)
-            else:
-                # IfcOpenShell 0.8
-                matrix = ifc_tools.get_freecad_matrix(item.transformation.matrix)
-            placement = FreeCAD.Placement(matrix)
-            verts = item.geometry.verts
-            verts = [FreeCAD.Vector(verts[i : i + 3]) for i in range(0, len(verts), 3)]
-            verts = [tuple(v.multiply(ifc_tools.SCALE)) for v in verts]
-
-            # faces
-            faces = list(item.geometry.faces)
-            faces = [
-                f for i in range(0, len(faces), 3) for f in faces[i : i + 3] + [-1]
-            ]
-
-            # edges
-            edges = list(item.geometry.edges)
-            edges = [
-                e for i in range(0, len(edges), 2) for e in edges[i : i + 2] + [-1]
-            ]
-
-            # update cache
-            node = [color, verts, faces, edges]
-            cache["Coin"][item.id] = node
-            cache["Placement"][item.id] = placement
-
-            if grouping:
-                # if we are joining nodes together, their placement
-                # must be baked in
-                node = apply_placement(node, placement)
-            nodes.append(node)
-            progressbar.next(True)
-        if not iterator.next():
-            break
+    try:
+        for i, batch in enumerate(batches):
+            if i > 0:
+                iterator = get_geom_iterator(ifcfile, batch, brep_mode=False)
+                if iterator is None:
+                    continue
+            while True:
+                item = iterator.get()
+                if item and item.id not in done:
+                    done.add(item.id)
+                    node, placement = get_item_node(item)
+
+                    # update cache
+                    cache["Coin"][item.id] = node
+                    cache["Placement"][item.id] = placement
+
+                    if grouping:
+                        # if we are joining nodes together, their placement
+                        # must be baked in
+                        node = apply_placement(node, placement)
+                    nodes.append(node)
+                    progressbar.next(True)
+                if not iterator.next():
+                    break
+            if progressive and callback and len(nodes) > start and i < len(batches) - 1:
+                # progressive mode implies grouping, so placements are baked in
+                if callback(unify(nodes[start:]), None) is False:
+                    break
+                start = len(nodes)
+    except Base.FreeCADAbort:
+        if not progressive:
+            raise
+        FreeCAD.Console.PrintWarning(
+            "Loading aborted, {} of {} shapes generated\n".format(len(done), total)
+        )
 
     # unify nodes
     nodes = unify(nodes)
@@ -349,6 +395,96 @@ def generate_coin(ifcfile, elements, cached=False):
     return nodes, placement
 
 
+def get_item_node(item):
+    """Returns coin node data [color, verts, faces, edges] and a Placement
+    from an iterator item"""
+
+    # colors
+    if item.geometry.materials:
+        color = item.geometry.materials[0].diffuse
+        if hasattr(color, "r") and hasattr(color, "g"):
+            # IfcOpenShell 0.8
+            color = (color.r(), color.g(), color.b())
+        else:
+            # IfcOpenShell 0.7
+            color = (float(color[0]), float(color[1]), float(color[2]))
+        trans = item.geometry.materials[0].transparency
+        if trans >= 0:
+            color += (float(trans),)
+    else:
+        color = (0.85, 0.85, 0.85)
+
+    # verts
+    if hasattr(item.transformation.matrix, "data"):
+        # IfcOpenShell 0.7
+        matrix = ifc_tools.get_freecad_matrix(item.transformation.matrix.data)
+    else:
+        # IfcOpenShell 0.8
+        matrix = ifc_tools.get_freecad_matrix(item.transformation.matrix)
+    placement = FreeCAD.Placement(matrix)
+    verts = item.geometry.verts
+    verts = [FreeCAD.Vector(verts[i : i + 3]) for i in range(0, len(verts), 3)]
+    verts = [tuple(v.multiply(ifc_tools.SCALE)) for v in verts]
+
+    # faces
+    faces = list(item.geometry.faces)
+    faces = [f for i in range(0, len(faces), 3) for f in faces[i : i + 3] + [-1]]
+
+    # edges
+    edges = list(item.geometry.edges)
+    edges = [e for i in range(0, len(edges), 2) for e in edges[i : i + 2] + [-1]]
+
+    return [color, verts, faces, edges], placement
+
+
+def get_batches(ifcfile, elements, size=None):
+    """Splits a list of elements into batches to be fed to separate iterators,
+    so geometry can be shown progressively. The size of the batches is taken from
+    the ProgressiveBatchSize preference if not given. If it is 0 (the default),
+    or if there are not enough elements, a single batch is returned. Otherwise,
+    elements are sorted so the most relevant ones come first (see sort_elements)"""
+
+    if size is None:
+        size = ifc_tools.PARAMS.GetInt("ProgressiveBatchSize", 0)
+    if size <= 0 or len(elements) <= size:
+        return [elements]
+    elements = sort_elements(ifcfile, elements)
+    return [elements[i : i + size] for i in range(0, len(elements), size)]
+
+
+def sort_elements(ifcfile, elements):
+    """Sorts a list of elements by loading priority: elements contained in
+    visible storeys come first, then elements in front of the camera of the
+    active 3D view, closest first"""
+
+    import ifcopenshell.util.placement
+
+    camera = None
+    if FreeCAD.GuiUp and FreeCADGui.ActiveDocument:
+        view = FreeCADGui.ActiveDocument.ActiveView
+        if hasattr(view, "getCameraNode"):
+            node = view.getCameraNode()
+            position = FreeCAD.Vector(node.position.getValue().getValue())
+            direction = node.orientation.getValue().multVec(coin.SbVec3f(0, 0, -1))
+            camera = (position, FreeCAD.Vector(direction.getValue()))
+    hidden = {}
+
+    def get_priority(element):
+        container = ifcopenshell.util.element.get_container(element)
+        if container and container.id() not in hidden:
+            cobj = ifc_tools.get_object(container, ifcfile=ifcfile)
+            hidden[container.id()] = bool(cobj and not cobj.Visibility)
+        is_hidden = hidden.get(container.id(), False) if container else False
+        if not camera or not getattr(element, "ObjectPlacement", None):
+            return (is_hidden, False, 0)
+        matrix = ifcopenshell.util.placement.get_local_placement(element.ObjectPlacement)
+        origin = FreeCAD.Vector([float(v) for v in matrix[:3, 3]])
+        vec = origin.multiply(ifc_tools.SCALE).sub(camera[0])
+        return (is_hidden, vec.dot(camera[1]) < 0, vec.Length)
+
+    return sorted(elements, key=get_priority)
+
+
 def get_decomposition(obj):
     """Gets the elements we need to render this object"""
 
@@ -465,8 +601,10 @@ def set_cache(ifcfile, cache):
                     return
 
 
-def set_representation(vobj, node):
-    """Sets the correct coin nodes for the given Part object"""
+def get_representation_nodes(vobj):
+    """Returns the coordinates, face set and edge set coin nodes of the given
+    Part object, or None if its scene graph is not built yet. The face and edge
+    sets can be None."""
 
     def find_node(parent, nodetype):
         for i in range(parent.getNumChildren()):
@@ -474,20 +612,19 @@ def set_representation(vobj, node):
                 return parent.getChild(i)
         return None
 
-    # node = [colors, verts, faces, edges, parts]
     if not vobj.RootNode:
-        return
+        return None
     if vobj.RootNode.getNumChildren() < 3:
-        return
+        return None
     coords = find_node(vobj.RootNode, coin.SoCoordinate3)
     if not coords:
-        return
+        return None
     switch = find_node(vobj.RootNode, coin.SoSwitch)
     if not switch:
-        return
+        return None
     num_modes = switch.getNumChildren()
     if num_modes < 3:
-        return
+        return None
     # the number of display modes under switch can vary.
     # the last 4 ones are the ones that are defined for
     # Part features
@@ -500,6 +637,17 @@ def set_representation(vobj, node):
     if edges.getNumChildren() >= 1:
         if edges.getChild(0).getNumChildren() >= 4:
             eset = edges.getChild(0).getChild(3)  # SoBrepEdgeSet
+    return coords, fset, eset
+
+
+def set_representation(vobj, node):
+    """Sets the correct coin nodes for the given Part object"""
+
+    # node = [colors, verts, faces, edges, parts]
+    nodes = get_representation_nodes(vobj)
+    if not nodes:
+        return
+    coords, fset, eset = nodes
     # reset faces and edges
     if fset:
         fset.coordIndex.deleteValues(0)
@@ -516,6 +664,26 @@ def set_representation(vobj, node):
             fset.partIndex.setValues(node[4])
 
 
+def add_representation(vobj, node):
+    """Adds the given coin node data to the coin nodes already set on the given
+    Part object by set_representation, without rebuilding them"""
+
+    # node = [colors, verts, faces, edges, parts]
+    nodes = get_representation_nodes(vobj)
+    if not nodes or not node:
+        return
+    coords, fset, eset = nodes
+    if node[1] and node[3] and eset:
+        vindex = coords.point.getNum()
+        coords.point.setValues(vindex, len(node[1]), node[1])
+        edges = [i + vindex if i >= 0 else i for i in node[3]]
+        eset.coordIndex.setValues(eset.coordIndex.getNum(), len(edges), edges)
+        if node[2] and node[4] and fset:
+            faces = [i + vindex if i >= 0 else i for i in node[2]]
+            fset.coordIndex.setValues(fset.coordIndex.getNum(), len(faces), faces)
+            fset.partIndex.setValues(fset.partIndex.getNum(), len(node[4]), node[4])
+
+
 def print_debug(obj):
     """Prints some debug info when an element could not be rendered"""
 
@@ -174,6 +174,33 @@ def test():
         )
 
 
+def test_multicore(cores=4):
+    """Compares the import times of the multicore IFC importer when IFC
+    records are extracted on the main thread or by worker processes.
+    Like test(), this is meant to be used from a terminal"""
+
+    from importers import importIFCHelper
+    from importers import importIFCmulticore
+
+    preferences = importIFCHelper.getPreferences()
+    preferences["MULTICORE"] = cores
+    print("| File | File size | Main thread | " + str(cores) + " workers |")
+    print("| ---- | --------- | ----------- | --------- |")
+    for f in FILES:
+        path = os.path.join(os.path.expanduser("~"), f)
+        if not os.path.exists(path):
+            continue
+        times = []
+        for workers in (False, True):
+            d = FreeCAD.newDocument()
+            stime = time.time()
+            importIFCmulticore.insert(path, d.Name, preferences, workers=workers)
+            times.append("%02d:%02d" % (divmod(round(time.time() - stime, 1), 60)))
+            FreeCAD.closeDocument(d.Name)
+        fsize = round(os.path.getsize(path) / 1048576, 2)
+        print("| " + " | ".join([f, str(fsize) + " Mb"] + times) + " |")
+
+
 def import_file(n, shape=False):
     if shape:
         shapemode = 0
@@ -392,6 +392,104 @@ class NativeIFCTest(unittest.TestCase):
         ifc_psets.add_property(ifcfile, pset, "MyMessageToTheWorld", "Hello, World!")
         self.assertTrue(ifc_psets.has_psets(obj), "Psets failed")
 
+    def test16_Diff(self):
+        FreeCAD.Console.PrintMessage("NativeIFC 16: Diff...")
+        from . import ifc_diff
+
+        old = ifcopenshell.open(getIfcFilePath())
+        new = ifcopenshell.open(getIfcFilePath())
+        self.assertFalse(ifc_diff.diff_files(old, new), "Diff failed")
+        wall = new.by_type("IfcWall")[0]
+        wall.Name = "Modified name"
+        prop = new.createIfcPropertySingleValue("MyProp", None, new.createIfcLabel("Hello"))
+        diff = ifc_diff.diff_files(old, new)
+        self.assertTrue(
+            len(diff["modified"]) == 1
+            and len(diff["added"]) == 1
+            and len(diff["properties"]) == 1
+            and diff["modified"][0]["attributes"][0][0] == "Name",
+            "Diff failed",
+        )
+
+    def test17_RecycleProfiles(self):
+        FreeCAD.Console.PrintMessage("NativeIFC 17: Recycling profiles...")
+        import Part
+        from importers import exportIFC
+        from importers import exportIFCHelper
+
+        pts = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 3), (0, 3), (0, 0)]
+        lshape = Part.Face(Part.makePolygon([FreeCAD.Vector(x, y, 0) for x, y in pts]))
+        hole = Part.Face(Part.Wire(Part.makeCircle(1, FreeCAD.Vector(2, 2, 0))))
+        holed = Part.makePlane(4, 4).cut(hole).Faces[0]
+        for merge, count in ((True, 1), (False, 2)):
+            ifcfile = ifcopenshell.file(schema="IFC4")
+            exportIFC.ifcbin = exportIFCHelper.recycler(ifcfile, template=False)
+            exportIFC.ifcbin.compress = True
+            exportIFC.ifcbin.mergeProfiles = merge
+            for i in range(2):
+                exportIFC.getProfile(ifcfile, lshape)
+                exportIFC.getProfile(ifcfile, holed)
+            profiles = ifcfile.by_type("IfcArbitraryClosedProfileDef", include_subtypes=False)
+            self.assertEqual(len(profiles), count, "RecycleProfiles failed")
+            profiles = ifcfile.by_type("IfcArbitraryProfileDefWithVoids")
+            self.assertEqual(len(profiles), count, "RecycleProfiles failed")
+            # curves are shared even if profiles are not merged
+            self.assertEqual(len(ifcfile.by_type("IfcPolyline")), 2, "RecycleProfiles failed")
+            self.assertEqual(len(ifcfile.by_type("IfcCompositeCurve")), 1, "RecycleProfiles failed")
+            self.assertEqual(len(ifcfile.by_type("IfcTrimmedCurve")), 1, "RecycleProfiles failed")
+
+    def test18_ProgressiveLoading(self):
+        FreeCAD.Console.PrintMessage("NativeIFC 18: Progressive loading...")
+        ifcfile = ifcopenshell.open(getIfcFilePath())
+        elements = [e for e in ifcfile.by_type("IfcProduct") if e.Representation]
+        ordered = ifc_generator.sort_elements(ifcfile, elements)
+        self.assertEqual(
+            sorted(e.id() for e in ordered),
+            sorted(e.id() for e in elements),
+            "SortElements failed",
+        )
+        self.assertEqual(ifc_generator.get_batches(ifcfile, elements, size=0), [elements])
+        batches = ifc_generator.get_batches(ifcfile, elements, size=3)
+        self.assertTrue(all(len(b) <= 3 for b in batches), "GetBatches failed")
+        self.assertEqual([e for b in batches for e in b], ordered, "GetBatches failed")
+
+        # the batches come out in a different order, so only sorted data is compared
+        def get_shape_data(shape, colors):
+            return sorted(round(s.Volume, 6) for s in shape.SubShapes), sorted(colors)
+
+        def get_node_data(node):
+            return sorted(node[0]), sorted(node[4]), len(node[1]), len(node[2])
+
+        size = ifc_tools.PARAMS.GetInt("ProgressiveBatchSize", 0)
+        try:
+            ifc_tools.PARAMS.SetInt("ProgressiveBatchSize", 0)
+            shape = get_shape_data(*ifc_generator.generate_shape(ifcfile, elements))
+            node = get_node_data(ifc_generator.generate_coin(ifcfile, elements)[0])
+            for batchsize in (1, 3):
+                ifc_tools.PARAMS.SetInt("ProgressiveBatchSize", batchsize)
+                calls = []
+                result = ifc_generator.generate_shape(
+                    ifcfile, elements, callback=lambda s, c: calls.append(len(s))
+                )
+                self.assertEqual(get_shape_data(*result), shape, "ProgressiveLoading failed")
+                count = len(ifc_generator.get_batches(ifcfile, elements, size=batchsize))
+                self.assertTrue(0 < len(calls) < count, "ProgressiveLoading failed")
+                # the callback only gets the shapes of the new batch
+                self.assertTrue(max(calls) <= batchsize, "ProgressiveLoading failed")
+                self.assertTrue(sum(calls) < len(shape[0]), "ProgressiveLoading failed")
+                calls = []
+                result = ifc_generator.generate_coin(
+                    ifcfile, elements, callback=lambda n, p: calls.append(len(n[4]))
+                )
+                self.assertEqual(get_node_data(result[0]), node, "ProgressiveLoading failed")
+                self.assertTrue(0 < max(calls) <= batchsize, "ProgressiveLoading failed")
+                self.assertTrue(sum(calls) < len(node[1]), "ProgressiveLoading failed")
+            # stopping from the callback keeps what was generated so far
+            result = ifc_generator.generate_shape(ifcfile, elements, callback=lambda s, c: False)
+            self.assertTrue(0 < len(result[1]) < len(shape[1]), "ProgressiveLoading failed")
+        finally:
+            ifc_tools.PARAMS.SetInt("ProgressiveBatchSize", size)
+
 
 IFCFILECONTENT="""ISO-10303-21;
 HEADER;
@@ -126,6 +126,7 @@ from draftgeoutils.intersections import (findIntersection,
                                          angleBisection)
 
 from draftgeoutils.wires import (findWires,
+                                 join_edges,
                                  findWiresOld,
                                  findWiresOld2,
                                  flattenWire,
@@ -107,6 +107,7 @@ from drafttests.test_draftgeomutils import TestDraftGeomUtils as DraftTest04
 # Handling of file formats tests
 # from drafttests.test_svg import DraftSVG as DraftTest05
 # from drafttests.test_dxf import DraftDXF as DraftTest06
+from drafttests.test_dxf import DraftDXFParallel as DraftTest06b
 # from drafttests.test_dwg import DraftDWG as DraftTest07
 # from drafttests.test_oca import DraftOCA as DraftTest08
 # from drafttests.test_airfoildat import DraftAirfoilDAT as DraftTest09
@@ -119,6 +120,7 @@ True if DraftTest03 else False
 True if DraftTest04 else False
 # True if DraftTest05 else False
 # True if DraftTest06 else False
+True if DraftTest06b else False
 # True if DraftTest07 else False
 # True if DraftTest08 else False
 # True if DraftTest09 else False
@@ -98,8 +98,10 @@ For the non-GUI tests see TestDraft.
 from drafttests.test_import_gui import DraftGuiImport as DraftTestGui01
 from drafttests.test_import_tools import DraftImportTools as DraftTestGui02
 from drafttests.test_pivy import DraftPivy as DraftTestGui03
+from drafttests.test_snapper import DraftSnapper as DraftTestGui04
 
 # Use the modules so that code checkers don't complain (flake8)
 True if DraftTestGui01 else False
 True if DraftTestGui02 else False
 True if DraftTestGui03 else False
+True if DraftTestGui04 else False
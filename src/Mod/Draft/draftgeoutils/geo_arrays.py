@@ -35,8 +35,10 @@ See https://forum.freecad.org/viewtopic.php?f=23&t=49617
 # \brief Provides various functions to work with arrays.
 
 import lazy_loader.lazy_loader as lz
+import numpy as np
 
 import FreeCAD as App
+import DraftVecUtils
 from draftutils.messages import _msg
 
 # Delay import of module until first use because it is heavy
@@ -74,7 +76,11 @@ def get_init_values(path, count=6):
 def get_n_params(edge, number, step, norm):
     """Get the parameters needed in each iteration."""
     parameter = edge.getParameterByLength(number * step)
+    return get_frame(edge, parameter, norm)
 
+
+def get_frame(edge, parameter, norm):
+    """Get the point, tangent and rotation of the edge at a parameter."""
     v0 = edge.valueAt(parameter)
     tan = edge.tangentAt(parameter).normalize()
     binorm = tan.cross(norm).normalize()
@@ -94,8 +100,11 @@ def get_twisted_placements(path, count=15, rot_factor=0.25):
     places = []
     params = []
 
+    sampler = PathSampler([edge], oriented=False)
+    _, parameters = sampler.get_parameters(np.arange(count) * step)
+
     for number in range(count):
-        v0, tan, rot = get_n_params(edge, number, step, norm)
+        v0, tan, rot = get_frame(edge, parameters[number], norm)
 
         angle = increment * rot_factor
         place = App.Placement(v0, tan, angle)
@@ -109,6 +118,147 @@ def get_twisted_placements(path, count=15, rot_factor=0.25):
     return places, params
 
 
+class PathSampler:
+    """Sample positions along a chain of edges, many at once.
+
+    The edges must be sorted and connected, like the ones returned by
+    `Part.__sortEdges__`. An arc length table is built once for each edge,
+    then the parameters of all the requested distances along the path are
+    guessed together by interpolation in these tables, instead of solving
+    each of them with `getParameterByLength`. Lines and circles have
+    parameters proportional to their length, they are mapped exactly.
+    On other curves each guess is refined by Newton steps, measuring
+    the length from the table entry just before it.
+
+    Parameters
+    ----------
+    edges: list of Part.Edge
+        The edges of the path, in order.
+    reverse: bool, optional
+        The edges are walked backwards, they must be given in reverse order.
+    oriented: bool, optional
+        If `True` (default) distances on each edge are measured from its
+        first vertex, like `patharray.get_parameter_from_v0`, otherwise
+        from its first parameter.
+    samples: int, optional
+        The number of intervals of the arc length table of curved edges.
+    tolerance: float, optional
+        The largest length error of the refined parameters on curved edges.
+    """
+
+    def __init__(self, edges, reverse=False, oriented=True, samples=256,
+                 tolerance=1e-7):
+        self.edges = edges
+        self.reverse = reverse
+        self.tolerance = tolerance
+        self.lengths = np.array([e.Length for e in edges])
+        self.ends = np.cumsum(self.lengths)
+        # the curves of the edges that need refining, None for the others
+        self.curves = []
+        for e in edges:
+            curve = e.Curve
+            if isinstance(curve, (Part.Line, Part.LineSegment, Part.Circle)):
+                curve = None
+            self.curves.append(curve)
+        self.tables = [self.get_table(e, c, samples) for e, c in zip(edges, self.curves)]
+        self.flipped = []
+        for e in edges:
+            first = e.valueAt(e.FirstParameter)
+            self.flipped.append(oriented
+                                and not DraftVecUtils.equals(e.Vertexes[0].Point, first))
+
+    def get_table(self, edge, curve, samples):
+        """Return the arc lengths and parameters table of an edge.
+        The curve is None for a line or a circle, their table only
+        has the ends of the edge."""
+        first, last = edge.ParameterRange
+        if curve is None:
+            return np.array([0.0, edge.Length]), np.array([first, last])
+        params = np.linspace(first, last, samples + 1)
+        spans = [curve.length(u0, u1) for u0, u1 in zip(params[:-1], params[1:])]
+        lengths = np.concatenate(([0.0], np.cumsum(spans)))
+        return lengths, params
+
+    def get_offsets(self, distances):
+        """Return the edge indices and the offsets on these edges
+        of the given distances along the path."""
+        distances = np.asarray(distances, dtype=float)
+        indices = np.searchsorted(self.ends, distances, side="left")
+        over = indices >= len(self.edges)
+        indices = np.minimum(indices, len(self.edges) - 1)
+        remains = self.ends[indices] - distances
+        if self.reverse:
+            offsets = remains
+            offsets[over] = 0
+        else:
+            offsets = self.lengths[indices] - remains
+            offsets[over] = self.lengths[indices[over]]
+        return indices, offsets
+
+    def get_parameters(self, distances):
+        """Return the edge indices and the parameters on these edges
+        of the given distances along the path."""
+        indices, offsets = self.get_offsets(distances)
+        return indices.tolist(), self.map_offsets(indices, offsets)
+
+    def map_offsets(self, indices, offsets):
+        """Return the parameters of the given offsets on the given edges."""
+        params = np.empty(len(offsets))
+        for i in np.unique(indices):
+            mask = indices == i
+            lengths = offsets[mask]
+            if self.flipped[i]:
+                lengths = self.lengths[i] - lengths
+            table_lengths, table_params = self.tables[i]
+            params[mask] = np.interp(lengths, table_lengths, table_params)
+            if self.curves[i] is not None:
+                params[mask] = self.refine(i, lengths, params[mask])
+        return params.tolist()
+
+    def refine(self, index, lengths, guesses):
+        """Return the parameters of the given lengths on a curved edge,
+        refined from the guesses found in its table by Newton steps.
+        The parameters are kept in the table interval of their length."""
+        edge = self.edges[index]
+        curve = self.curves[index]
+        table_lengths, table_params = self.tables[index]
+        spans = np.searchsorted(table_lengths, lengths, side="right") - 1
+        spans = np.clip(spans, 0, len(table_params) - 2)
+        params = []
+        for length, u, j in zip(lengths, guesses, spans):
+            low, high = table_params[j], table_params[j + 1]
+            for _ in range(4):
+                error = table_lengths[j] + curve.length(low, u) - length
+                speed = edge.derivative1At(u).Length
+                if abs(error) <= self.tolerance or speed == 0:
+                    break
+                u = min(max(u - error / speed, low), high)
+            params.append(u)
+        return params
+
+    def sample(self, distances, tangents=True, normals=False):
+        """Return the edge indices, offsets, parameters, points, and optionally
+        the tangents and normals (None where undefined) of the path at
+        the given distances."""
+        indices, offsets = self.get_offsets(distances)
+        params = self.map_offsets(indices, offsets)
+        indices = indices.tolist()
+        edges = [self.edges[i] for i in indices]
+        points = [e.valueAt(u) for e, u in zip(edges, params)]
+        tans = None
+        norms = None
+        if tangents:
+            tans = [e.tangentAt(u) for e, u in zip(edges, params)]
+        if normals:
+            norms = []
+            for e, u in zip(edges, params):
+                try:
+                    norms.append(e.normalAt(u))
+                except App.Base.FreeCADError:
+                    norms.append(None)
+        return indices, offsets.tolist(), params, points, tans, norms
+
+
 def get_twisted_array_shape(base, path, count=15, rot_factor=0.25):
     """Get the twisted array shape as a compound."""
     places, _ = get_twisted_placements(path,
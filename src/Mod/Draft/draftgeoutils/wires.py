@@ -26,6 +26,7 @@
 # \ingroup draftgeoutils
 # \brief Provides various functions to work with wires.
 
+import itertools
 import math
 import lazy_loader.lazy_loader as lz
 
@@ -50,6 +51,91 @@ def findWires(edgeslist):
     return [Part.Wire(e) for e in Part.sortEdges(edgeslist)]
 
 
+def join_edges(edgeslist, tol=None):
+    """Find wires in a list of edges, in linear time.
+
+    Works like findWires, for large lists of edges. The end points of
+    the edges are hashed in a grid of cells of size tol, and merged if they
+    are closer than tol, also across cells. The resulting graph of points
+    and edges is then walked to build the wires, starting from the points
+    with an odd number of edges, so open chains are walked from their ends.
+
+    Parameters
+    ----------
+    edgeslist: list of Part.Edge
+        The edges to join.
+    tol: float, optional
+        The distance below which two end points are merged.
+        It defaults to the Draft precision.
+
+    Returns
+    -------
+    list of Part.Wire
+    """
+    if tol is None:
+        tol = 10 ** -precision()
+    cells = {}
+    points = []
+    links = []
+    wires = []
+    neighbors = [n for n in itertools.product((-1, 0, 1), repeat=3) if n != (0, 0, 0)]
+
+    def get_node(point):
+        """Return the index of the node at point, created if needed."""
+        cell = (round(point.x / tol), round(point.y / tol), round(point.z / tol))
+        for offset in itertools.chain([(0, 0, 0)], neighbors):
+            key = (cell[0] + offset[0], cell[1] + offset[1], cell[2] + offset[2])
+            for node in cells.get(key, []):
+                if (points[node] - point).Length <= tol:
+                    return node
+        node = len(points)
+        points.append(point)
+        links.append([])
+        cells.setdefault(cell, []).append(node)
+        return node
+
+    edges = []
+    ends = []
+    for edge in edgeslist:
+        if not edge.Vertexes:
+            # an infinite edge can't be joined
+            wires.append(Part.Wire(edge))
+            continue
+        n0 = get_node(edge.Vertexes[0].Point)
+        n1 = get_node(edge.Vertexes[-1].Point)
+        links[n0].append(len(edges))
+        if n1 != n0:
+            links[n1].append(len(edges))
+        edges.append(edge)
+        ends.append((n0, n1))
+
+    used = [False] * len(edges)
+    starts = sorted(range(len(points)), key=lambda n: len(links[n]) % 2 == 0)
+    for start in starts:
+        while True:
+            chain = []
+            node = start
+            while True:
+                # drop the edges already walked from the other end
+                while links[node] and used[links[node][-1]]:
+                    links[node].pop()
+                if not links[node]:
+                    break
+                i = links[node].pop()
+                used[i] = True
+                chain.append(edges[i])
+                n0, n1 = ends[i]
+                node = n1 if node == n0 else n0
+            if not chain:
+                break
+            try:
+                wires.append(Part.Wire(chain))
+            except Part.OCCError:
+                # the ends are merged but too far apart for OCC
+                wires.extend(findWires(chain))
+    return wires
+
+
 def findWiresOld2(edgeslist):
     """Find connected wires in the given list of edges."""
 
@@ -38,6 +38,7 @@ import collections as coll
 import inspect
 import itertools
 import math
+import numpy
 import pivy.coin as coin
 import PySide.QtCore as QtCore
 import PySide.QtGui as QtGui
@@ -63,6 +64,86 @@ __url__ = "https://www.freecad.org"
 
 UNSNAPPABLES = ('Image::ImagePlane',)
 
+
+def is_line(edge):
+    """Return True if the curve of the given edge is a line."""
+    try:
+        return isinstance(edge.Curve, (Part.Line, Part.LineSegment))
+    except Exception:
+        # some curve types yield an error
+        # when trying to read their types
+        return False
+
+
+class SnapIndex:
+    """Cached snap geometry of a shape.
+
+    The edges of the shape and their bounding boxes are stored once,
+    sorted by the minimum X of their bounding boxes, so the edges near a
+    given bounding box can be found without visiting all of them.
+    Endpoints and midpoints are also only computed once.
+
+    The index stays valid as long as the shape is the same, which is
+    checked with `isSame`. The index keeps a reference to its shape, so
+    the shape cannot be freed and replaced by another one at the same
+    memory address.
+    """
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.edges = shape.Edges
+        self.endpoints = None
+        self.midpoints = None
+        bounds = []
+        for e in self.edges:
+            b = e.BoundBox
+            bounds.append((b.XMin, b.YMin, b.ZMin, b.XMax, b.YMax, b.ZMax))
+        bounds = numpy.array(bounds, dtype=float).reshape(-1, 6)
+        self.order = numpy.argsort(bounds[:, 0], kind="stable")
+        self.bounds = bounds[self.order]
+        self.lines = numpy.array([is_line(self.edges[i]) for i in self.order],
+                                 dtype=bool)
+
+    def is_valid(self, shape):
+        """Return True if the index was built from the given shape."""
+        return self.shape.isSame(shape)
+
+    def get_edges(self, box, tol=0, lines=False):
+        """Return the edges whose bounding box intersects the given one.
+
+        If lines is True, all the straight edges are also returned.
+        The edges are returned in their original order.
+        """
+        bounds = self.bounds
+        stop = numpy.searchsorted(bounds[:, 0], box.XMax + tol, side="right")
+        near = bounds[:stop]
+        mask = numpy.zeros(len(bounds), dtype=bool)
+        mask[:stop] = ((near[:, 3] >= box.XMin - tol)
+                       & (near[:, 1] <= box.YMax + tol)
+                       & (near[:, 4] >= box.YMin - tol)
+                       & (near[:, 2] <= box.ZMax + tol)
+                       & (near[:, 5] >= box.ZMin - tol))
+        if lines:
+            mask |= self.lines
+        return [self.edges[i] for i in numpy.sort(self.order[mask])]
+
+    def get_endpoints(self):
+        """Return the points of the vertices of the shape."""
+        if self.endpoints is None:
+            self.endpoints = [v.Point for v in self.shape.Vertexes]
+        return self.endpoints
+
+    def get_midpoints(self):
+        """Return the midpoint of the shape, if it is an edge."""
+        if self.midpoints is None:
+            self.midpoints = []
+            if isinstance(self.shape, Part.Edge):
+                mp = DraftGeomUtils.findMidpoint(self.shape)
+                if mp:
+                    self.midpoints.append(mp)
+        return self.midpoints
+
+
 class Snapper:
     """Classes to manage snapping in Draft and Arch.
 
@@ -88,6 +169,7 @@ class Snapper:
     def __init__(self):
         self.activeview = None
         self.lastObj = []
+        self.snapIndex = {}
         self.radius = 0
         self.constraintAxis = None
         self.basepoint = None
@@ -337,6 +419,19 @@ class Snapper:
         return fp
 
 
+    def getSnapIndex(self, key, shape):
+        """Return the snap index of a shape, rebuilt if the shape changed.
+
+        The key is the name of an object, or a tuple of the name of an
+        object and a subelement name.
+        """
+        index = self.snapIndex.get(key, None)
+        if (index is None) or (not index.is_valid(shape)):
+            index = SnapIndex(shape)
+            self.snapIndex[key] = index
+        return index
+
+
     def cycleSnapObject(self):
         """Increase the index of the snap object by one."""
         self.snapObjectIndex = self.snapObjectIndex + 1
@@ -385,9 +480,10 @@ class Snapper:
                     # we are snapping to an edge
                     if shape.ShapeType == "Edge":
                         edge = shape
+                        index = self.getSnapIndex((parent.Name, subname), edge)
                         snaps.extend(self.snapToNear(edge, point))
-                        snaps.extend(self.snapToEndpoints(edge))
-                        snaps.extend(self.snapToMidpoint(edge))
+                        snaps.extend(self.snapToEndpoints(edge, index))
+                        snaps.extend(self.snapToMidpoint(edge, index))
                         snaps.extend(self.snapToPerpendicular(edge, lastpoint))
                         snaps.extend(self.snapToIntersection(edge))
                         snaps.extend(self.snapToElines(edge, eline))
@@ -453,6 +549,11 @@ class Snapper:
         self.lastObj.append(obj.Name)
         if len(self.lastObj) > 8:
             self.lastObj = self.lastObj[-8:]
+        # dropping the snap indexes of the objects that are not used anymore
+        for key in list(self.snapIndex):
+            name = key[0] if isinstance(key, tuple) else key
+            if name not in self.lastObj and name != parent.Name:
+                del self.snapIndex[key]
 
         if not snaps:
             return None
@@ -602,7 +703,7 @@ class Snapper:
                     continue
                 if not ob.isDerivedFrom("Part::Feature"):
                     continue
-                edges = ob.Shape.Edges
+                edges = list(self.getSnapIndex(ob.Name, ob.Shape).edges)
                 if Draft.getType(ob) == "Wall":
                     for so in [ob]+ob.Additions:
                         if Draft.getType(so) == "Wall":
@@ -740,11 +841,17 @@ class Snapper:
         return point
 
 
-    def snapToEndpoints(self, shape):
-        """Return a list of endpoints snap locations."""
+    def snapToEndpoints(self, shape, index=None):
+        """Return a list of endpoints snap locations.
+
+        If a snap index of the shape is given, its cached points are used.
+        """
         snaps = []
         if self.isEnabled("Endpoint"):
-            if hasattr(shape, "Vertexes"):
+            if index:
+                for p in index.get_endpoints():
+                    snaps.append([p, 'endpoint', self.toWP(p)])
+            elif hasattr(shape, "Vertexes"):
                 for v in shape.Vertexes:
                     snaps.append([v.Point, 'endpoint', self.toWP(v.Point)])
             elif hasattr(shape, "Point"):
@@ -759,11 +866,17 @@ class Snapper:
         return snaps
 
 
-    def snapToMidpoint(self, shape):
-        """Return a list of midpoints snap locations."""
+    def snapToMidpoint(self, shape, index=None):
+        """Return a list of midpoints snap locations.
+
+        If a snap index of the shape is given, its cached points are used.
+        """
         snaps = []
         if self.isEnabled("Midpoint"):
-            if isinstance(shape, Part.Edge):
+            if index:
+                for mp in index.get_midpoints():
+                    snaps.append([mp, 'midpoint', self.toWP(mp)])
+            elif isinstance(shape, Part.Edge):
                 mp = DraftGeomUtils.findMidpoint(shape)
                 if mp:
                     snaps.append([mp, 'midpoint', self.toWP(mp)])
@@ -1011,16 +1124,23 @@ class Snapper:
         """Return a list of intersection snap locations."""
         snaps = []
         if self.isEnabled("Intersection"):
+            # lines are intersected on the working plane, where their
+            # apparent intersection can be outside their bounding boxes
+            apparent = self.isEnabled("WorkingPlane") and is_line(shape)
+            box = shape.BoundBox
+            tol = Draft.tolerance()
             # get the stored objects to calculate intersections
             for o in self.lastObj:
                 obj = App.ActiveDocument.getObject(o)
                 if obj:
                     if obj.isDerivedFrom("Part::Feature") or (Draft.getType(obj) == "Axis"):
-                        if (not self.maxEdges) or (len(obj.Shape.Edges) <= self.maxEdges):
-                            for e in obj.Shape.Edges:
+                        index = self.getSnapIndex(obj.Name, obj.Shape)
+                        if (not self.maxEdges) or (len(index.edges) <= self.maxEdges):
+                            # only the edges near the shape can intersect it
+                            for e in index.get_edges(box, tol, lines=apparent):
                                 # get the intersection points
                                 try:
-                                    if self.isEnabled("WorkingPlane") and hasattr(e,"Curve") and isinstance(e.Curve,(Part.Line,Part.LineSegment)) and hasattr(shape,"Curve") and isinstance(shape.Curve,(Part.Line,Part.LineSegment)):
+                                    if apparent and is_line(e):
                                         # get apparent intersection (lines projected on WP)
                                         p1 = self.toWP(e.Vertexes[0].Point)
                                         p2 = self.toWP(e.Vertexes[-1].Point)
@@ -1219,6 +1339,7 @@ class Snapper:
         self.running = False
         self.holdPoints = []
         self.lastObj = []
+        self.snapIndex = {}
 
         if hasattr(App, "activeDraftCommand") and App.activeDraftCommand:
             return
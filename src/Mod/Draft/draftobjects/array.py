@@ -34,6 +34,7 @@ split in separate classes so that they are easier to manage.
 ## \addtogroup draftobjects
 # @{
 import math
+import numpy as np
 from PySide.QtCore import QT_TRANSLATE_NOOP
 
 import FreeCAD as App
@@ -482,35 +483,24 @@ _Array = Array
 def rect_placements(base_placement,
                     xvector, yvector, zvector,
                     xnum, ynum, znum):
-    """Determine the placements where the rectangular copies will be."""
-    pl = base_placement
-    placements = [pl.copy()]
-
-    for xcount in range(xnum):
-        currentxvector = App.Vector(xvector).multiply(xcount)
-        if xcount != 0:
-            npl = pl.copy()
-            npl.translate(currentxvector)
-            placements.append(npl)
-
-        for ycount in range(ynum):
-            currentyvector = App.Vector(currentxvector)
-            _y_shift = App.Vector(yvector).multiply(ycount)
-            currentyvector = currentyvector.add(_y_shift)
-            if ycount != 0:
-                npl = pl.copy()
-                npl.translate(currentyvector)
-                placements.append(npl)
-
-            for zcount in range(znum):
-                currentzvector = App.Vector(currentyvector)
-                _z_shift = App.Vector(zvector).multiply(zcount)
-                currentzvector = currentzvector.add(_z_shift)
-                if zcount != 0:
-                    npl = pl.copy()
-                    npl.translate(currentzvector)
-                    placements.append(npl)
+    """Determine the placements where the rectangular copies will be.
 
+    The placements are ordered by X, then Y, then Z index,
+    the first one being a copy of `base_placement`.
+    """
+    if xnum < 1:
+        return [base_placement.copy()]
+    if ynum < 1:
+        # no Z copies either
+        ynum = znum = 1
+    xcount, ycount, zcount = np.meshgrid(np.arange(xnum),
+                                         np.arange(ynum),
+                                         np.arange(max(znum, 1)),
+                                         indexing="ij")
+    vectors = np.array([tuple(xvector), tuple(yvector), tuple(zvector)])
+    counts = np.stack([xcount.ravel(), ycount.ravel(), zcount.ravel()], axis=1)
+    placements = _placements(base_placement, counts @ vectors)
+    placements[0] = base_placement.copy()
     return placements
 
 
@@ -519,25 +509,21 @@ def polar_placements(base_placement,
                      number, axis, axisvector):
     """Determine the placements where the polar copies will be."""
     # print("angle ",angle," num ",num)
-    placements = [base_placement.copy()]
-
     if number <= 1:
-        return placements
+        return [base_placement.copy()]
 
     if angle == 360:
         fraction = float(angle) / number
     else:
         fraction = float(angle) / (number - 1)
 
-    for i in range(number - 1):
-        currangle = fraction + (i * fraction)
-        npl = base_placement.copy()
-        npl.rotate(center, axis, currangle, comp=True)
-        if axisvector:
-            if not DraftVecUtils.isNull(axisvector):
-                npl.translate(App.Vector(axisvector).multiply(i + 1))
-        placements.append(npl)
-
+    steps = np.arange(number)
+    offsets = None
+    if axisvector and not DraftVecUtils.isNull(axisvector):
+        offsets = np.outer(steps, tuple(axisvector))
+    placements = _placements(base_placement, offsets,
+                             center, axis, steps * fraction)
+    placements[0] = base_placement.copy()
     return placements
 
 
@@ -553,24 +539,75 @@ def circ_placements(base_placement,
         lead = (1, 0, 0)
 
     direction = axis.cross(App.Vector(lead)).normalize()
-    placements = [base_placement.copy()]
+    # the first copy is not moved
+    radii = [0]
+    angles = [0]
 
     for xcount in range(1, circle_number):
         rc = xcount * r_distance
-        trans = App.Vector(direction).multiply(rc)
         c = 2 * rc * math.pi
         n = math.floor(c / tan_distance)
         n = int(math.floor(n / symmetry) * symmetry)
         if n == 0:
             continue
 
-        angle = 360.0 / n
-        for ycount in range(0, n):
-            npl = base_placement.copy()
-            npl.translate(trans)
-            npl.rotate(center, axis, ycount * angle, comp=True)
-            placements.append(npl)
+        radii.extend([rc] * n)
+        angles.extend(np.arange(n) * (360.0 / n))
 
+    translations = np.outer(radii, tuple(direction))
+    placements = _placements(base_placement, None,
+                             center, axis, np.array(angles), translations)
+    placements[0] = base_placement.copy()
     return placements
 
+
+def _placements(base_placement, offsets=None,
+                center=None, axis=None, angles=None, translations=None):
+    """Return copies of a placement, computed all at once.
+
+    Each copy is first translated by a row of `translations`,
+    then rotated by an angle in degrees of `angles` around `axis`
+    passing through `center`, like `Placement.rotate(center, axis,
+    angle, comp=True)`, then translated by a row of `offsets`.
+    All given arrays must have the same length.
+    """
+    base = np.array(tuple(base_placement.Base))
+    rot = base_placement.Rotation
+    if angles is None:
+        positions = base + offsets
+        return [App.Placement(App.Vector(*pos), rot)
+                for pos in positions.tolist()]
+
+    positions = np.tile(base, (len(angles), 1))
+    if translations is not None:
+        positions += translations
+
+    # rotate the positions around the axis with the Rodrigues formula
+    center = np.array(tuple(center))
+    if axis.Length:
+        k = np.array(tuple(axis)) / axis.Length
+        theta = np.radians(angles)[:, None]
+    else:
+        # like App.Rotation, a null axis gives no rotation
+        k = np.array((0.0, 0.0, 1.0))
+        theta = np.zeros((len(angles), 1))
+    vecs = positions - center
+    positions = (center + vecs * np.cos(theta)
+                 + np.cross(k, vecs) * np.sin(theta)
+                 + np.outer(vecs @ k, k) * (1 - np.cos(theta)))
+    if offsets is not None:
+        positions += offsets
+
+    # compose the rotations as quaternions (x, y, z, w)
+    half = theta[:, 0] / 2
+    q1 = np.hstack([np.outer(np.sin(half), k), np.cos(half)[:, None]])
+    x2, y2, z2, w2 = rot.Q
+    x1, y1, z1, w1 = q1.T
+    quats = np.stack([w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                      w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                      w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+                      w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2], axis=1)
+    return [App.Placement(App.Vector(*pos), App.Rotation(*quat))
+            for pos, quat in zip(positions.tolist(), quats.tolist())]
+
 ## @}
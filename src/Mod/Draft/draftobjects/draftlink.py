@@ -196,22 +196,35 @@ class DraftLink(DraftObject):
                 obj, vp_module="view_array", vp_class="ViewProviderDraftArray"
             )
 
+    def set_placements(self, obj, pls):
+        """Set the placements of all the elements at once.
+
+        The placement list is assigned in a single call, and only if it
+        changed, as each assignment updates all the elements of a link array.
+        """
+        if obj.Count == len(pls) and obj.PlacementList == pls:
+            return
+        if self.use_link:
+            obj.setPropertyStatus('PlacementList', '-Immutable')
+            obj.PlacementList = pls
+            obj.setPropertyStatus('PlacementList', 'Immutable')
+        else:
+            obj.PlacementList = pls
+        if obj.Count != len(pls):
+            obj.Count = len(pls)
+
     def buildShape(self, obj, pl, pls):
         """Build the shape of the link object."""
         if self.use_link:
             if not getattr(obj, 'ExpandArray', False) or obj.Count != len(pls):
-                obj.setPropertyStatus('PlacementList', '-Immutable')
-                obj.PlacementList = pls
-                obj.setPropertyStatus('PlacementList', 'Immutable')
-                obj.Count = len(pls)
+                self.set_placements(obj, pls)
             if getattr(obj, 'ExpandArray', False) \
                     and getattr(obj, 'AlwaysSyncPlacement', False):
                 for pla,child in zip(pls,obj.ElementList):
-                    child.Placement = pla
+                    if child.Placement != pla:
+                        child.Placement = pla
         else:
-            obj.PlacementList = pls
-            if obj.Count != len(pls):
-                obj.Count = len(pls)
+            self.set_placements(obj, pls)
 
         if obj.Base:
             shape = getattr(obj.Base, 'Shape', None)
@@ -72,6 +72,7 @@ from draftutils.translate import translate
 def QT_TRANSLATE_NOOP(ctx,txt): return txt
 from draftobjects.base import DraftObject
 from draftobjects.draftlink import DraftLink
+from draftgeoutils.geo_arrays import PathSampler
 
 # Delay import of module until first use because it is heavy
 Part = lz.LazyLoader("Part", globals(), "Part")
@@ -720,33 +721,13 @@ def placements_on_path(shapeRotation, pathwire, count, xlate, align,
             steps = [spacingUnit]
 
 
-    remains = 0
     travel = startOffset
     endTravel = startOffset + totalDist
-    placements = []
+    distances = []
 
     i = 0
     while True:
-        # which edge in path should contain this shape?
-        for j in range(len(ends)):
-            if travel <= ends[j]:
-                iend = j
-                remains = ends[iend] - travel
-                offset = path[iend].Length - remains if not reversePath else remains
-                break
-        else:
-            # avoids problems with float math travel > ends[-1]
-            iend = len(ends) - 1
-            offset = path[iend].Length if not reversePath else 0
-
-        # place shape at proper spot on proper edge
-        pt = path[iend].valueAt(get_parameter_from_v0(path[iend], offset))
-        place = calculate_placement(shapeRotation,
-                                    path[iend], offset,
-                                    pt, xlate, align, normal,
-                                    mode, forceNormal,
-                                    reversePath)
-        placements.append(place)
+        distances.append(travel)
         travel += steps[i % len(steps)]
         i = i + 1
 
@@ -757,7 +738,28 @@ def placements_on_path(shapeRotation, pathwire, count, xlate, align,
         # Failsafe:
         if i > 10_000:
             _wrn(translate("draft", "Operation would generate too many objects. Aborting"))
-            return placements[0:1]
+            distances = distances[0:1]
+            break
+
+    # find the edges, points, tangents and normals of all the shapes at once
+    sampler = PathSampler(path, reverse=reversePath)
+    frenet = align and mode == "Frenet"
+    (indices, offsets, _,
+     points, tangents, normals) = sampler.sample(distances,
+                                                 tangents=align,
+                                                 normals=frenet)
+
+    placements = []
+    for i, iend in enumerate(indices):
+        # place shape at proper spot on proper edge
+        place = calculate_placement(shapeRotation,
+                                    path[iend], offsets[i],
+                                    points[i], xlate, align, normal,
+                                    mode, forceNormal,
+                                    reversePath,
+                                    tangent=tangents[i] if align else None,
+                                    edge_normal=normals[i] if frenet else None)
+        placements.append(place)
 
     return placements
 
@@ -769,9 +771,13 @@ def calculate_placement(globalRotation,
                         edge, offset, RefPt, xlate, align,
                         normal=App.Vector(0.0, 0.0, 1.0),
                         mode="Original", overrideNormal=False,
-                        reversePath=False):
+                        reversePath=False,
+                        tangent=None, edge_normal=None):
     """Orient shape in the local coordinate system at parameter offset.
 
+    The tangent and, in Frenet mode, the normal of the edge at offset
+    are computed if they are not given.
+
     http://en.wikipedia.org/wiki/Euler_angles (previous version)
     http://en.wikipedia.org/wiki/Quaternions
     """
@@ -786,7 +792,10 @@ def calculate_placement(globalRotation,
     tol = 1e-6 # App.Rotation() tolerance is 1e-7. Shorter vectors are ignored.
     nullv = App.Vector()
 
-    t = edge.tangentAt(get_parameter_from_v0(edge, offset))
+    if tangent is None:
+        t = edge.tangentAt(get_parameter_from_v0(edge, offset))
+    else:
+        t = App.Vector(tangent)
 
     if t.isEqual(nullv, tol):
         _wrn(translate("draft", "Length of tangent vector is zero. Copy not aligned."))
@@ -822,7 +831,10 @@ def calculate_placement(globalRotation,
 
     elif mode == "Frenet":
         try:
-            n = edge.normalAt(get_parameter_from_v0(edge, offset))
+            if edge_normal is None:
+                n = edge.normalAt(get_parameter_from_v0(edge, offset))
+            else:
+                n = App.Vector(edge_normal)
         except App.Base.FreeCADError: # no/infinite normals here
             _wrn(translate("draft", "Cannot calculate normal vector. Using the default normal instead."))
             n = normal
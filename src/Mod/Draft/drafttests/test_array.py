@@ -29,8 +29,15 @@
 ## \addtogroup drafttests
 # @{
 
+import time
+
 import Draft
-from FreeCAD import Vector
+import Part
+from FreeCAD import Placement, Rotation, Vector
+from draftgeoutils.geo_arrays import PathSampler
+from draftobjects import array
+from draftobjects import patharray
+from draftutils.messages import _msg
 from drafttests import test_base
 
 
@@ -64,4 +71,88 @@ class DraftArray(test_base.DraftTestCaseDoc):
         self.doc.recompute(None, True, True)
         self.assertEqual(array.Count, array.NumberX)
 
+    def test_ortho_placements(self):
+        """Compare ortho array placements with copies of the base placement."""
+        base = Placement(Vector(1, 2, 3), Rotation(Vector(1, 1, 0), 30))
+        vx, vy, vz = Vector(10, 0, 0), Vector(0, 20, 1), Vector(0, 0, 30)
+        pls = array.rect_placements(base, vx, vy, vz, 3, 4, 2)
+        self.assertEqual(len(pls), 24)
+        i = 0
+        for x in range(3):
+            for y in range(4):
+                for z in range(2):
+                    expected = base.copy()
+                    expected.translate(vx * x + vy * y + vz * z)
+                    self.assertTrue(pls[i].isSame(expected, 1e-9))
+                    i += 1
+
+    def test_polar_placements(self):
+        """Compare polar and circular array placements with rotated copies."""
+        base = Placement(Vector(10, 2, 3), Rotation(Vector(1, 1, 0), 30))
+        center, axis = Vector(1, 1, 0), Vector(0, 1, 1)
+        pls = array.polar_placements(base, center, 270, 4, axis, Vector(0, 0, 5))
+        self.assertEqual(len(pls), 4)
+        for i, pla in enumerate(pls):
+            expected = base.copy()
+            expected.rotate(center, axis, 90 * i, comp=True)
+            expected.translate(Vector(0, 0, 5 * i))
+            self.assertTrue(pla.isSame(expected, 1e-9))
+
+        pls = array.circ_placements(base, 10, 10, axis, center, 3, 1)
+        direction = axis.cross(Vector(0, 1, 0)).normalize()
+        self.assertEqual(len(pls), 1 + 6 + 12)
+        expected = base.copy()
+        expected.translate(direction * 20)
+        expected.rotate(center, axis, 30, comp=True)
+        self.assertTrue(pls[8].isSame(expected, 1e-9))
+
+    def test_placements_benchmark(self):
+        """Time the placements of a 100x100x10 ortho array."""
+        base = Placement()
+        start = time.perf_counter()
+        pls = array.rect_placements(base, Vector(10, 0, 0), Vector(0, 10, 0),
+                                    Vector(0, 0, 10), 100, 100, 10)
+        _msg("  100x100x10 ortho placements: {:.3f} s".format(time.perf_counter() - start))
+        self.assertEqual(len(pls), 100000)
+        self.assertTrue(pls[-1].Base.isEqual(Vector(990, 990, 90), 1e-9))
+
+        start = time.perf_counter()
+        pls = array.polar_placements(base, Vector(), 360, 100000, Vector(0, 0, 1), None)
+        _msg("  100000 polar placements: {:.3f} s".format(time.perf_counter() - start))
+        self.assertEqual(len(pls), 100000)
+
+    def test_path_sampler(self):
+        """Compare sampled path positions with get_parameter_from_v0."""
+        spline = Part.BSplineCurve()
+        spline.interpolate([Vector(0, 0, 0), Vector(50, 30, 0),
+                            Vector(100, -20, 0), Vector(150, 0, 0)])
+        line = Part.LineSegment(Vector(150, 0, 0), Vector(150, 100, 0)).toShape()
+        arc = Part.Arc(Vector(0, 100, 0), Vector(75, 150, 0), Vector(150, 100, 0)).toShape()
+        wire = Part.Wire(Part.__sortEdges__([spline.toShape(), line, arc]))
+        for reverse in (False, True):
+            path = Part.__sortEdges__(wire.Edges)
+            if reverse:
+                path = path[::-1]
+            sampler = PathSampler(path, reverse=reverse)
+            distances = [wire.Length * i / 40 for i in range(41)]
+            indices, offsets, _, points, _, _ = sampler.sample(distances)
+            for i, offset, pt in zip(indices, offsets, points):
+                u = patharray.get_parameter_from_v0(path[i], offset)
+                self.assertTrue(pt.isEqual(path[i].valueAt(u), 1e-2))
+
+    def test_path_sampler_exact(self):
+        """Compare sampled parameters on curves with getParameterByLength."""
+        spline = Part.BSplineCurve()
+        spline.interpolate([Vector(0, 0, 0), Vector(10, 80, 0), Vector(20, -60, 0),
+                            Vector(100, 0, 0), Vector(110, 5, 0)])
+        ellipse = Part.ArcOfEllipse(Part.Ellipse(Vector(0, 0, 0), 100, 10), 0.3, 2.5)
+        for edge in (spline.toShape(), ellipse.toShape()):
+            sampler = PathSampler([edge])
+            distances = [edge.Length * i / 97 for i in range(98)]
+            _, _, params, points, _, _ = sampler.sample(distances)
+            for dist, u, pt in zip(distances, params, points):
+                expected = patharray.get_parameter_from_v0(edge, dist)
+                self.assertAlmostEqual(u, expected, 6)
+                self.assertTrue(pt.isEqual(edge.valueAt(expected), 1e-6))
+
 ## @}
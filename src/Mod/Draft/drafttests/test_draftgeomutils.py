@@ -213,5 +213,27 @@ class TestDraftGeomUtils(test_base.DraftTestCaseNoDoc):
         wire.Orientation = "Reversed"
         self.check_wire(wire)
 
+    def test_join_edges(self):
+        """Test the DraftGeomUtils.join_edges function."""
+        operation = "DraftGeomUtils.join_edges"
+        _msg("  Test '{}'".format(operation))
+
+        edges = []
+        for i in range(10):
+            points = [Vector(i * 20, 0, 0), Vector(i * 20 + 10, 0, 0),
+                      Vector(i * 20 + 10, 10, 0), Vector(i * 20, 10, 0)]
+            for start, end in zip(points, points[1:] + points[:1]):
+                edges.append(Part.makeLine(start, end))
+        # an open chain, flipped edges and a gap smaller than the tolerance
+        edges.append(Part.makeLine(Vector(0, 50, 0), Vector(10, 50, 0)))
+        edges.append(Part.makeLine(Vector(20, 60, 0), Vector(10, 50.00000005, 0)))
+        edges.append(Part.Arc(Vector(40, 50, 0), Vector(30, 55, 0), Vector(20, 60, 0)).toShape())
+        edges = edges[::3] + edges[1::3] + edges[2::3]
+
+        wires = DraftGeomUtils.join_edges(edges, tol=1e-6)
+        self.assertEqual(len(wires), 11)
+        self.assertEqual(sum(len(w.Edges) for w in wires), len(edges))
+        self.assertEqual(len([w for w in wires if w.isClosed()]), 10)
+
 # suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestDraftGeomUtils)
 # unittest.TextTestRunner().run(suite)
@@ -32,10 +32,16 @@
 ## \addtogroup drafttests
 # @{
 
+import concurrent.futures
+import contextlib
+import io
 import os
+from unittest import mock
 
 import FreeCAD as App
 import Draft
+import importDXF
+from FreeCAD import Vector
 from drafttests import auxiliary as aux
 from drafttests import test_base
 from draftutils.messages import _msg
@@ -71,4 +77,131 @@ class DraftDXF(test_base.DraftTestCaseDoc):
         obj = aux.fake_function(out_file)
         self.assertTrue(obj, "'{}' failed".format(operation))
 
+
+class DXFEntity:
+    """A minimal DXF line entity, as read by dxfReader."""
+
+    def __init__(self, start, end, data=()):
+        self.points = [start, end]
+        self.data = list(data)
+
+    def __repr__(self):
+        return "DXFEntity({}, {})".format(*self.points)
+
+
+class SerialExecutor(contextlib.AbstractContextManager):
+    """An executor running the submitted functions in the calling process."""
+
+    instances = []
+
+    def __init__(self, max_workers=None):
+        self.submitted = 0
+        self.closed = False
+        SerialExecutor.instances.append(self)
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+def draw_flagged(entity):
+    """Report every entity as bad without drawing it."""
+    importDXF.badobjects.append(entity)
+
+
+class DraftDXFParallel(test_base.DraftTestCaseNoDoc):
+    """Test drawing DXF entities with a pool of worker processes."""
+
+    settings = {"dxfCreateDraft": False,
+                "dxfCreateSketch": False,
+                "dxfImportLayouts": False,
+                "resolvedScale": 1.0,
+                "badobjects": [],
+                "PARALLEL_MIN": 4}
+
+    def setUp(self):
+        """Set the import settings, saving the previous ones."""
+        super().setUp()
+        self.saved = {k: getattr(importDXF, k) for k in self.settings if hasattr(importDXF, k)}
+        for k, v in self.settings.items():
+            setattr(importDXF, k, v)
+        SerialExecutor.instances = []
+
+    def tearDown(self):
+        """Restore the previous import settings."""
+        for k in self.settings:
+            if k in self.saved:
+                setattr(importDXF, k, self.saved[k])
+            else:
+                delattr(importDXF, k)
+
+    def make_lines(self, count):
+        """Return DXF lines, every third one is in a paper space layout."""
+        lines = []
+        for i in range(count):
+            data = [(67, 1)] if i % 3 == 2 else []
+            lines.append(DXFEntity((i, 0, 0), (i, 10, i), data))
+        return lines
+
+    def test_draw_parallel(self):
+        """Draw lines in the workers, the same as the serial path."""
+        operation = "importDXF.drawParallel"
+        _msg("  Test '{}'".format(operation))
+
+        lines = self.make_lines(30)
+        executor = SerialExecutor()
+        drawn = importDXF.drawParallel(importDXF.drawLine, lines, executor)
+        self.assertTrue(executor.submitted)
+        self.assertEqual(sorted(drawn), [i for i in range(30) if i % 3 != 2])
+        for i, shape in drawn.items():
+            expected = importDXF.drawLine(lines[i])
+            self.assertEqual(len(shape.Vertexes), 2)
+            for v1, v2 in zip(shape.Vertexes, expected.Vertexes):
+                self.assertEqual(v1.Point, v2.Point)
+
+    def test_draw_parallel_serial(self):
+        """Leave the entities to the caller when they can't be drawn in workers."""
+        operation = "importDXF.drawParallel"
+        _msg("  Test '{}'".format(operation))
+
+        lines = self.make_lines(30)
+        self.assertEqual(importDXF.drawParallel(importDXF.drawLine, lines, None), {})
+        executor = SerialExecutor()
+        self.assertEqual(importDXF.drawParallel(importDXF.drawLine, lines[:3], executor), {})
+        importDXF.dxfCreateDraft = True
+        executor = SerialExecutor()
+        self.assertEqual(importDXF.drawParallel(importDXF.drawLine, lines, executor), {})
+        self.assertFalse(executor.submitted)
+
+    def test_draw_parallel_warn(self):
+        """Warn about bad entities with the number used by the serial path."""
+        operation = "importDXF.drawParallel"
+        _msg("  Test '{}'".format(operation))
+
+        lines = self.make_lines(6)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            drawn = importDXF.drawParallel(draw_flagged, lines, SerialExecutor())
+        self.assertEqual(drawn, {0: None, 1: None, 3: None, 4: None})
+        for num, i in enumerate(drawn):
+            self.assertIn("{}  ( {} )".format(lines[i], num), output.getvalue())
+
+    def test_processdxf_pool(self):
+        """Create the pool of workers for one import and shut it down after it."""
+        operation = "importDXF.processdxf"
+        _msg("  Test '{}'".format(operation))
+
+        with mock.patch("freecad.utils.create_process_pool", SerialExecutor), \
+             mock.patch.object(importDXF, "drawdxf") as drawdxf:
+            importDXF.processdxf(None, "test.dxf", getShapes=True)
+        self.assertEqual(len(SerialExecutor.instances), 1)
+        executor = SerialExecutor.instances[0]
+        self.assertTrue(executor.closed)
+        drawdxf.assert_called_once_with(None, "test.dxf", True, True, executor)
+
 ## @}
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 FreeCAD Project Association                        *
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Unit tests for the Draft Workbench, snapper tests."""
+
+## @package test_snapper
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, snapper tests.
+
+## \addtogroup drafttests
+# @{
+
+import Part
+from FreeCAD import Vector
+from draftguitools import gui_snapper
+from drafttests import test_base
+from draftutils.messages import _msg
+
+
+class DraftSnapper(test_base.DraftTestCaseNoDoc):
+    """Test the snap geometry index of the snapper."""
+
+    def make_shape(self):
+        """Return a compound of lines and arcs spread along X."""
+        edges = []
+        for i in range(10):
+            x = 20 * i
+            edges.append(Part.makeLine(Vector(x, 0, 0), Vector(x + 10, 10, 0)))
+            edges.append(Part.makeCircle(5, Vector(x, 30, 0), Vector(0, 0, 1), 0, 180))
+        return Part.makeCompound(edges)
+
+    def test_snap_index_edges(self):
+        """Find the edges near a box like a test of all the edges."""
+        operation = "gui_snapper.SnapIndex.get_edges"
+        _msg("  Test '{}'".format(operation))
+
+        shape = self.make_shape()
+        index = gui_snapper.SnapIndex(shape)
+        for box in (Part.makeLine(Vector(35, -5, 0), Vector(65, 40, 0)).BoundBox,
+                    Part.makeLine(Vector(-50, -50, 0), Vector(-40, -40, 0)).BoundBox,
+                    Part.makeLine(Vector(-50, 5, 0), Vector(500, 5, 0)).BoundBox):
+            expected = [e for e in shape.Edges if e.BoundBox.intersect(box)]
+            found = index.get_edges(box)
+            self.assertEqual(len(found), len(expected))
+            for e1, e2 in zip(found, expected):
+                self.assertTrue(e1.isSame(e2))
+
+        # the straight edges are kept for working plane snapping
+        box = Part.makeLine(Vector(-50, -50, 0), Vector(-40, -40, 0)).BoundBox
+        found = index.get_edges(box, lines=True)
+        self.assertEqual(len(found), 10)
+        self.assertTrue(all(gui_snapper.is_line(e) for e in found))
+        box = Part.makeLine(Vector(-50, -50, 0), Vector(-10, -10, 0)).BoundBox
+        self.assertEqual(index.get_edges(box), [])
+        found = index.get_edges(box, tol=15)
+        self.assertEqual(len(found), 1)
+        self.assertTrue(found[0].isSame(shape.Edges[0]))
+
+    def test_snap_index_points(self):
+        """Get the endpoints and midpoints of the indexed shape."""
+        operation = "gui_snapper.SnapIndex.get_endpoints"
+        _msg("  Test '{}'".format(operation))
+
+        edge = Part.makeLine(Vector(0, 0, 0), Vector(10, 0, 0))
+        index = gui_snapper.SnapIndex(edge)
+        self.assertEqual(index.get_endpoints(), [Vector(0, 0, 0), Vector(10, 0, 0)])
+        self.assertEqual(index.get_midpoints(), [Vector(5, 0, 0)])
+        index = gui_snapper.SnapIndex(self.make_shape())
+        self.assertEqual(len(index.get_endpoints()), 40)
+        self.assertEqual(index.get_midpoints(), [])
+
+    def test_get_snap_index(self):
+        """Reuse the index of a shape until the shape changes."""
+        operation = "gui_snapper.Snapper.getSnapIndex"
+        _msg("  Test '{}'".format(operation))
+
+        snapper = gui_snapper.Snapper()
+        shape = self.make_shape()
+        index = snapper.getSnapIndex("Compound", shape)
+        self.assertIs(snapper.getSnapIndex("Compound", shape), index)
+        other = snapper.getSnapIndex("Compound", Part.makeLine(Vector(0, 0, 0), Vector(1, 0, 0)))
+        self.assertIsNot(other, index)
+        self.assertEqual(len(other.edges), 1)
+        self.assertIs(snapper.snapIndex["Compound"], other)
+
+## @}
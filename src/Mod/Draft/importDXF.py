@@ -47,11 +47,14 @@ texts, colors,layers (from groups)
 """
 # scaling factor between autocad font sizes and coin font sizes
 TEXTSCALING = 1.35
+# the minimum number of entities of a type to draw them in worker processes
+PARALLEL_MIN = 1000
 # the minimum version of the dxfLibrary needed to run
 CURRENTDXFLIB = 1.42
 
 import sys
 import os
+import contextlib
 import math
 import re
 import time
@@ -2160,6 +2163,123 @@ def getScaleFromDXF(header):
     return 1.0
 
 
+def drawEntities(settings, drawer, entities):
+    """Draw DXF entities in a worker process.
+
+    Parameters
+    ----------
+    settings : dict
+        The import settings of the main process, that is the global
+        variables `dxf*` and `resolvedScale`, set in the worker.
+
+    drawer : function
+        The function drawing one entity, like `drawLine`.
+
+    entities : list of drawing.entities
+        The DXF objects to draw.
+
+    Returns
+    -------
+    list of tuples
+        For each entity, a tuple with the BREP string of its shape,
+        and whether the entity was reported as bad by `warn`.
+        The BREP string is `None` if no shape was produced, and `False`
+        if the entity must be drawn in the main process, because
+        it failed or produced a document object.
+    """
+    global badobjects
+    globals().update(settings)
+    results = []
+    for ent in entities:
+        badobjects = []
+        try:
+            shape = drawer(ent)
+        except Exception:
+            results.append((False, False))
+            continue
+        if shape is None:
+            results.append((None, bool(badobjects)))
+        elif isinstance(shape, Part.Shape):
+            results.append((shape.exportBrepToString(), bool(badobjects)))
+        else:
+            results.append((False, False))
+    return results
+
+
+def drawParallel(drawer, entities, executor):
+    """Draw the given DXF entities in worker processes.
+
+    Only the geometry is built by the workers, the document objects
+    are still created by the caller. Nothing is drawn if Draft objects
+    or sketches must be created, or if there are less entities to draw
+    than `PARALLEL_MIN`.
+
+    Parameters
+    ----------
+    drawer : function
+        The function drawing one entity, like `drawLine`.
+
+    entities : list of drawing.entities
+        The DXF objects to draw.
+
+    executor : concurrent.futures.Executor
+        The pool of worker processes created by `processdxf`.
+        If it is `None` nothing is drawn.
+
+    Returns
+    -------
+    dict
+        The shapes of the drawn entities, or `None` if they produced
+        no shape, by index of the entity in the list. The entities
+        that are not in the dictionary must be drawn by the caller.
+    """
+    drawn = {}
+    if dxfCreateDraft or dxfCreateSketch:
+        return drawn
+    indices = [i for i, ent in enumerate(entities)
+               if dxfImportLayouts or (not rawValue(ent, 67))]
+    if len(indices) < PARALLEL_MIN:
+        return drawn
+    if not executor:
+        FCC.PrintLog("No Python interpreter found, "
+                     "DXF entities will be drawn serially\n")
+        return drawn
+    settings = {k: v for k, v in globals().items()
+                if k.startswith("dxf") and isinstance(v, (bool, int, float, str, tuple))}
+    settings["resolvedScale"] = resolvedScale
+    size = max(1, len(indices) // ((os.cpu_count() or 1) * 8))
+    futures = []
+    try:
+        for start in range(0, len(indices), size):
+            chunk = indices[start:start + size]
+            future = executor.submit(drawEntities, settings, drawer,
+                                     [entities[i] for i in chunk])
+            futures.append((future, chunk))
+    except Exception as e:
+        # the remaining entities will be drawn serially
+        FCC.PrintLog("DXF worker processes failed: " + str(e) + "\n")
+    for future, chunk in futures:
+        try:
+            results = future.result()
+        except Exception as e:
+            # entities that can't be sent to the workers are drawn serially
+            FCC.PrintLog("DXF worker processes failed: " + str(e) + "\n")
+            continue
+        for i, (brep, bad) in zip(chunk, results):
+            if brep is False:
+                continue
+            if bad:
+                # same number as given to the entity by the serial path
+                warn(entities[i], indices.index(i))
+            if brep is None:
+                drawn[i] = None
+            else:
+                shape = Part.Shape()
+                shape.importBrepFromString(brep, False)
+                drawn[i] = shape
+    return drawn
+
+
 def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     """Process the DXF file, creating Part objects in the document.
 
@@ -2208,6 +2328,19 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         It returns `None` if the edges (lines, polylines, arcs)
         are above 100, and the user decides to interrupt (graphically)
         the process of joining them.
+    """
+    from freecad.utils import create_process_pool
+    # the worker processes only live as long as the import
+    with create_process_pool() or contextlib.nullcontext() as executor:
+        return drawdxf(document, filename, getShapes, reComputeFlag, executor)
+
+
+def drawdxf(document, filename, getShapes, reComputeFlag, executor):
+    """Process the DXF file, drawing the entities with the given executor.
+
+    See `processdxf` for the parameters and the returned value.
+    The geometry of large sets of entities is built by the worker
+    processes of `executor`, see `drawParallel`.
 
     To do
     -----
@@ -2263,9 +2396,10 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     lines = drawing.entities.get_type("line")
     if lines:
         FCC.PrintMessage("drawing " + str(len(lines)) + " lines...\n")
-    for line in lines:
+    drawn = drawParallel(drawLine, lines, executor)
+    for i, line in enumerate(lines):
         if dxfImportLayouts or (not rawValue(line, 67)):
-            shape = drawLine(line)
+            shape = drawn[i] if i in drawn else drawLine(line)
             if shape:
                 if dxfCreateSketch:
                     FreeCAD.ActiveDocument.recompute()
@@ -2309,9 +2443,10 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     if polylines:
         FCC.PrintMessage("drawing " + str(len(polylines)) + " polylines...\n")
     num = 0
-    for polyline in polylines:
+    drawn = drawParallel(drawPolyline, polylines, executor)
+    for i, polyline in enumerate(polylines):
         if dxfImportLayouts or (not rawValue(polyline, 67)):
-            shape = drawPolyline(polyline, num)
+            shape = drawn[i] if i in drawn else drawPolyline(polyline, num)
             if shape:
                 if dxfCreateSketch:
                     if isinstance(shape, Part.Shape):
@@ -2349,9 +2484,10 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     arcs = drawing.entities.get_type("arc")
     if arcs:
         FCC.PrintMessage("drawing " + str(len(arcs)) + " arcs...\n")
-    for arc in arcs:
+    drawn = drawParallel(drawArc, arcs, executor)
+    for i, arc in enumerate(arcs):
         if dxfImportLayouts or (not rawValue(arc, 67)):
-            shape = drawArc(arc)
+            shape = drawn[i] if i in drawn else drawArc(arc)
             if shape:
                 if dxfCreateSketch:
                     FreeCAD.ActiveDocument.recompute()
@@ -2385,24 +2521,8 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         edges = []
         for s in shapes:
             edges.extend(s.Edges)
-        if len(edges) > (100):
-            FCC.PrintMessage(str(len(edges)) + " edges to join\n")
-            if gui:
-                d = QtWidgets.QMessageBox()
-                d.setText("Warning: High number of entities to join (>100)")
-                d.setInformativeText("This might take a long time "
-                                     "or even freeze your computer. "
-                                     "Are you sure? You can also disable "
-                                     "the 'join geometry' setting in DXF "
-                                     "import preferences")
-                d.setStandardButtons(QtWidgets.QMessageBox.Ok
-                                     | QtWidgets.QMessageBox.Cancel)
-                d.setDefaultButton(QtWidgets.QMessageBox.Cancel)
-                res = d.exec_()
-                if res == QtWidgets.QMessageBox.Cancel:
-                    FCC.PrintMessage("Aborted\n")
-                    return
-        shapes = DraftGeomUtils.findWires(edges)
+        FCC.PrintMessage(str(len(edges)) + " edges to join\n")
+        shapes = DraftGeomUtils.join_edges(edges)
         for s in shapes:
             newob = addObject(s)
 
@@ -2410,9 +2530,10 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     circles = drawing.entities.get_type("circle")
     if circles:
         FCC.PrintMessage("drawing " + str(len(circles))+" circles...\n")
-    for circle in circles:
+    drawn = drawParallel(drawCircle, circles, executor)
+    for i, circle in enumerate(circles):
         if dxfImportLayouts or (not rawValue(circle, 67)):
-            shape = drawCircle(circle)
+            shape = drawn[i] if i in drawn else drawCircle(circle)
             if shape:
                 if dxfCreateSketch:
                     FreeCAD.ActiveDocument.recompute()
@@ -2465,10 +2586,11 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     splines = drawing.entities.get_type("spline")
     if splines:
         FCC.PrintMessage("drawing " + str(len(splines)) + " splines...\n")
-    for spline in splines:
+    drawn = drawParallel(drawSpline, splines, executor)
+    for i, spline in enumerate(splines):
         lay = rawValue(spline, 8)
         if dxfImportLayouts or (not rawValue(spline, 67)):
-            shape = drawSpline(spline)
+            shape = drawn[i] if i in drawn else drawSpline(spline)
             if shape:
                 if dxfMakeBlocks:
                     addToBlock(shape, lay)
@@ -2486,10 +2608,11 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     ellipses = drawing.entities.get_type("ellipse")
     if ellipses:
         FCC.PrintMessage("drawing " + str(len(ellipses)) + " ellipses...\n")
-    for ellipse in ellipses:
+    drawn = drawParallel(drawEllipse, ellipses, executor)
+    for i, ellipse in enumerate(ellipses):
         lay = rawValue(ellipse, 8)
         if dxfImportLayouts or (not rawValue(ellipse, 67)):
-            shape = drawEllipse(ellipse)
+            shape = drawn[i] if i in drawn else drawEllipse(ellipse)
             if shape:
                 if dxfMakeBlocks:
                     addToBlock(shape, lay)
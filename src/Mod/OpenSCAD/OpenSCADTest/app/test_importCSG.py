@@ -20,6 +20,8 @@
 #***************************************************************************
 
 import unittest
+import concurrent.futures
+from unittest import mock
 import FreeCAD
 import OpenSCAD
 import importCSG
@@ -34,6 +36,27 @@ __author__ = "Chris Hennes"
 __url__ = "https://www.freecad.org"
 
 
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    """A single thread executor, used in place of the pool of worker processes,
+    counting the submitted booleans"""
+
+    instances = []
+
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+        self.closed = False
+        CountingExecutor.instances.append(self)
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+    def shutdown(self, *args, **kwargs):
+        self.closed = True
+        super().shutdown(*args, **kwargs)
+
+
 class TestImportCSG(unittest.TestCase):
 
     MODULE = 'test_importCSG' # file name without extension
@@ -550,3 +573,70 @@ group() {
         doc = self.utility_create_scad(csg_data, "complex-fuse")
         self.assertEqual (doc.RootObjects[0].Placement, FreeCAD.Placement())
         FreeCAD.closeDocument(doc.Name)
+
+    def test_conversion_cache(self):
+        import OpenSCADUtils
+        preferences = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+        if not os.path.isfile(preferences.GetString('openscadexecutable')):
+            self.skipTest("no OpenSCAD executable configured")
+        filename = self.temp_dir.name + os.path.sep + "conversion_cache.scad"
+        with open(filename, "w+") as f:
+            f.write("cube([3.0,2.0,1.0]);")
+        key = OpenSCADUtils.getconversioncachekey(filename, 'csg')
+        self.assertTrue (key is not None)
+        outputs = []
+        for i in range(2):
+            output = OpenSCADUtils.callopenscad(filename)
+            with open(output) as f:
+                outputs.append(f.read())
+            os.unlink(output)
+            self.assertTrue (OpenSCADUtils.getcachedconversion(key, 'csg') is not None)
+        self.assertEqual (outputs[0], outputs[1])
+
+    def test_parser_cache(self):
+        lexer, parser = importCSG.getParser()
+        self.assertIs (importCSG.getParser()[0], lexer)
+        self.assertIs (importCSG.getParser()[1], parser)
+
+    def test_parallel_booleans(self):
+        csg_data = """
+union() {
+    difference() {
+        cube(size = [15, 15, 15], center = true);
+        sphere($fn = 0, $fa = 12, $fs = 2, r = 10);
+    }
+    intersection() {
+        cube(size = [15, 15, 15], center = true);
+        sphere($fn = 0, $fa = 12, $fs = 2, r = 10);
+    }
+}
+"""
+        filename = self.temp_dir.name + os.path.sep + "parallel_booleans.csg"
+        with open(filename, "w+") as f:
+            f.write(csg_data)
+        params = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+        parallel = params.GetBool('parallelBooleans', False)
+        volumes = []
+        executors = []
+        CountingExecutor.instances = []
+        try:
+            with mock.patch("freecad.utils.create_process_pool", CountingExecutor):
+                for mode in (False, True):
+                    params.SetBool('parallelBooleans', mode)
+                    doc = importCSG.open(filename)
+                    executors.append(list(CountingExecutor.instances))
+                    union = doc.getObject("union")
+                    self.assertTrue (union is not None)
+                    self.assertTrue (union.isValid())
+                    volumes.append(union.Shape.Volume)
+                    FreeCAD.closeDocument(doc.Name)
+        finally:
+            params.SetBool('parallelBooleans', parallel)
+        self.assertAlmostEqual (volumes[0], 15 ** 3, 3)
+        self.assertAlmostEqual (volumes[1], volumes[0], 6)
+        # no pool without the preference, and one pool for the parallel import,
+        # that computed the difference, the intersection and the union
+        self.assertEqual (executors[0], [])
+        self.assertEqual (len(executors[1]), 1)
+        self.assertEqual (executors[1][0].submitted, 3)
+        self.assertTrue (executors[1][0].closed)
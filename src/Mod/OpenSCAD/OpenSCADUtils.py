@@ -22,9 +22,11 @@
 """ This Script includes various python helper functions that are shared across the
 module."""
 
+import hashlib
 import io
 import itertools
 import os
+import re
 import shutil
 import sys
 import subprocess
@@ -136,8 +138,146 @@ def newtempfilename():
 
 tempfilenamegen = newtempfilename()
 
+# the known OpenSCAD versions
+openscadversions = {}
+
+# the files included or used by an OpenSCAD file, and the data files it imports
+referencepattern = re.compile(
+    r'\b(include|use)\s*<([^>]+)>|\b(?:import|surface)\s*\(\s*(?:file\s*=\s*)?"([^"]+)"')
+
+
+def getcachedopenscadversion(osfilename):
+    '''returns the version of the given OpenSCAD executable,
+    only running it again if it was modified'''
+    key = (osfilename, os.path.getmtime(osfilename))
+    if key not in openscadversions:
+        openscadversions[key] = getopenscadversion(osfilename)
+    return openscadversions[key]
+
+
+def getconversioncachedir():
+    return os.path.join(FreeCAD.getUserCachePath(), 'OpenSCAD', 'conversions')
+
+
+def hashinputfile(filename, digest, visited):
+    '''adds the content of an OpenSCAD file, and of the files it references,
+    to the given hash. returns False if a referenced file is not found
+    relative to the file referencing it'''
+    with open(filename, 'rb') as f:
+        data = f.read()
+    digest.update(data)
+    dirname = os.path.dirname(filename)
+    for match in referencepattern.finditer(data.decode('utf8', errors='replace')):
+        name = match.group(2) or match.group(3)
+        path = os.path.normpath(os.path.join(dirname, name))
+        if not os.path.isfile(path):
+            # it may be in an OpenSCAD library path
+            return False
+        digest.update(name.encode('utf8'))
+        if match.group(1):
+            if path not in visited:
+                visited.add(path)
+                if not hashinputfile(path, digest, visited):
+                    return False
+        else:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return True
+
+
+def getconversioncachekey(inputfilename, outputext):
+    '''returns the key of the conversion of the given file to the given format
+    in the conversion cache, or None if the conversion can not be cached'''
+    preferences = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+    if preferences.GetInt('conversionCacheSize', 100) <= 0:
+        return None
+    osfilename = preferences.GetString('openscadexecutable')
+    if not (osfilename and os.path.isfile(osfilename)):
+        return None
+    digest = hashlib.sha256()
+    digest.update(('%s\n%s\n' % (getcachedopenscadversion(osfilename), outputext)).encode('utf8'))
+    try:
+        if not hashinputfile(os.path.abspath(inputfilename), digest, set()):
+            return None
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def getcachedconversion(key, outputext):
+    '''returns the cached file of the given conversion, or None'''
+    cachedfilename = os.path.join(getconversioncachedir(), '%s.%s' % (key, outputext))
+    if not os.path.isfile(cachedfilename):
+        return None
+    try:
+        # mark it as recently used
+        os.utime(cachedfilename)
+    except OSError:
+        pass
+    return cachedfilename
+
+
+def storeconversion(key, outputext, outputfilename):
+    '''copies the result of a conversion in the conversion cache, then removes
+    the least recently used conversions above the size of the cache'''
+    preferences = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+    maxsize = preferences.GetInt('conversionCacheSize', 100) * 1024 * 1024
+    cachedir = getconversioncachedir()
+    try:
+        os.makedirs(cachedir, exist_ok=True)
+        # copy then rename, so other FreeCAD instances never read a partial file
+        fd, tmpfilename = tempfile.mkstemp(dir=cachedir, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(outputfilename, tmpfilename)
+        os.replace(tmpfilename, os.path.join(cachedir, '%s.%s' % (key, outputext)))
+        entries = []
+        for entry in os.scandir(cachedir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(entry[1] for entry in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= maxsize:
+                break
+            os.unlink(path)
+            total -= size
+    except OSError as e:
+        FreeCAD.Console.PrintLog('OpenSCAD conversion cache: %s\n' % e)
+
+
+def getoutputfilename(inputfilename, outputext, keepname=False):
+    '''returns a filename for the result of a conversion, in the transfer directory'''
+    preferences = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+    if preferences.GetInt('transfermechanism',0) == 1:
+        transferDirectory = preferences.GetString('transferdirectory')
+    else:
+        transferDirectory = tempfile.gettempdir()
+    if keepname:
+        name = os.path.split(inputfilename)[1].rsplit('.',1)[0]
+    else:
+        name = next(tempfilenamegen)
+    return os.path.join(transferDirectory, '%s.%s' % (name, outputext))
+
 
 def callopenscad(inputfilename,outputfilename=None, outputext='csg', keepname=False):
+    '''call the open scad binary, unless the result of the same conversion
+    is in the conversion cache
+    returns the filename of the result (or None),
+    please delete the file afterwards'''
+    key = getconversioncachekey(inputfilename, outputext)
+    cachedfilename = key and getcachedconversion(key, outputext)
+    if cachedfilename:
+        if not outputfilename:
+            outputfilename = getoutputfilename(inputfilename, outputext, keepname)
+        shutil.copyfile(cachedfilename, outputfilename)
+        return outputfilename
+    outputfilename = runopenscad(inputfilename, outputfilename, outputext, keepname)
+    if key and outputfilename:
+        storeconversion(key, outputext, outputfilename)
+    return outputfilename
+
+
+def runopenscad(inputfilename,outputfilename=None, outputext='csg', keepname=False):
     '''call the open scad binary
     returns the filename of the result (or None),
     please delete the file afterwards'''
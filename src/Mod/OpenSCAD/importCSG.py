@@ -60,6 +60,11 @@ else:
 hassetcolor = []
 alreadyhidden = []
 original_root_objects = []
+# boolean objects whose shape is computed after parsing
+deferred = []
+# the lexer and parser, built once per session
+lexer = None
+parser = None
 
 # Get the token map from the lexer. This is required.
 import tokrules
@@ -151,37 +156,128 @@ def insert(filename, docname):
         pathName = os.path.dirname(os.path.normpath(filename))
         processcsg(filename)
 
+def getParser():
+    """Returns the lexer and the parser, built on first use. The parse
+    tables are cached in the user cache directory, and only generated
+    again when the grammar changes."""
+    global lexer
+    global parser
+
+    if lexer is None:
+        if printverbose: print('Start Lex')
+        lexer = lex.lex(module=tokrules)
+        if printverbose: print('End Lex')
+    if parser is None:
+        if printverbose: print('Load Parser')
+        picklefile = None
+        try:
+            cachedir = os.path.join(FreeCAD.getUserCachePath(), 'OpenSCAD')
+            os.makedirs(cachedir, exist_ok=True)
+            picklefile = os.path.join(cachedir, 'csg_parsetab.pickle')
+        except OSError:
+            pass
+        # Disable generation of debug ('parser.out') and table module ('parsetab.py'),
+        # as it requires a writable location in the Python path
+        parser = yacc.yacc(debug=False, write_tables=False, picklefile=picklefile)
+        if printverbose: print('Parser Loaded')
+    return lexer, parser
+
+
 def processcsg(filename):
     global doc
 
     if printverbose: print('ImportCSG Version 0.6a')
-    # Build the lexer
-    if printverbose: print('Start Lex')
-    lex.lex(module=tokrules)
-    if printverbose: print('End Lex')
+    csglexer, csgparser = getParser()
+
+    try:
+        with io.open(filename, 'r', encoding="utf8") as f:
+            if printverbose: print('Start Parser')
+            result = csgparser.parse(f.read(), lexer=csglexer.clone())
+        if printverbose:
+            print('End Parser')
+            print(result)
+        if params.GetBool('parallelBooleans', False):
+            from freecad.utils import create_process_pool
+            # the worker processes only live as long as the import
+            executor = create_process_pool()
+            if executor:
+                with executor:
+                    evaluateBooleans(executor)
+            else:
+                FreeCAD.Console.PrintLog('No Python interpreter found, booleans will be computed serially\n')
+        if gui:
+            fixVisibility()
+    finally:
+        # do not leak objects of a failed import into the next one
+        hassetcolor.clear()
+        alreadyhidden.clear()
+        deferred.clear()
+    FreeCAD.Console.PrintMessage('End processing CSG file\n')
+    doc.recompute()
 
-    # Build the parser
-    if printverbose: print('Load Parser')
-    # Disable generation of debug ('parser.out') and table cache ('parsetab.py'),
-    # as it requires a writable location
-    parser = yacc.yacc(debug=False, write_tables=False)
-    if printverbose: print('Parser Loaded')
 
-    f = io.open(filename, 'r', encoding="utf8")
+def getBooleanChildren(obj):
+    "returns the operands of a boolean object"
+    if hasattr(obj, 'Shapes'):
+        return obj.Shapes
+    return [obj.Base, obj.Tool]
 
-    if printverbose: print('Start Parser')
 
-    result = parser.parse(f.read())
-    f.close()
-    if printverbose:
-        print('End Parser')
-        print(result)
-    if gui:
-        fixVisibility()
-    hassetcolor.clear()
-    alreadyhidden.clear()
-    FreeCAD.Console.PrintMessage('End processing CSG file\n')
-    doc.recompute()
+def evaluateBoolean(typeid, breps, refine):
+    """Returns the BREP string of the boolean of the given BREP shapes.
+    Called in the worker processes."""
+    shapes = []
+    for brep in breps:
+        shape = Part.Shape()
+        shape.importBrepFromString(brep, False)
+        shapes.append(shape)
+    if typeid == 'Part::Cut':
+        result = shapes[0].cut(shapes[1])
+    elif typeid in ('Part::Common', 'Part::MultiCommon'):
+        result = shapes[0].common(shapes[1:])
+    else:
+        result = shapes[0].multiFuse(shapes[1:])
+    if refine:
+        result = result.removeSplitter()
+    return result.exportBrepToString()
+
+
+def evaluateBooleans(executor):
+    """Computes the shapes of the deferred boolean objects in the worker
+    processes of the given executor.
+    The booleans whose operands are all computed are independent, they are
+    computed together, then the booleans using them, and so on. Booleans
+    that fail are left to the final recompute of the document."""
+    pending = {obj.Name: obj for obj in deferred if obj.Shape.isNull()}
+    while pending:
+        ready = [obj for obj in pending.values()
+                 if not any(child.Name in pending for child in getBooleanChildren(obj))]
+        if not ready:
+            break
+        futures = []
+        for obj in ready:
+            children = getBooleanChildren(obj)
+            for child in children:
+                checkObjShape(child)
+            if any(child.Shape.isNull() for child in children):
+                continue
+            breps = [child.Shape.exportBrepToString() for child in children]
+            future = executor.submit(evaluateBoolean, obj.TypeId, breps,
+                                     getattr(obj, 'Refine', False))
+            futures.append((obj, future))
+        for obj, future in futures:
+            try:
+                brep = future.result()
+            except Exception as e:
+                FreeCAD.Console.PrintLog(f'Boolean {obj.Name} failed in worker: {e}\n')
+                continue
+            shape = Part.Shape()
+            shape.importBrepFromString(brep, False)
+            obj.Shape = shape
+            # the shape is up to date, skip it in the final recompute
+            obj.purgeTouched()
+        for obj in ready:
+            del pending[obj.Name]
 
 
 def p_block_list_(p):
@@ -213,12 +309,9 @@ def p_group_action1(p):
         return
     if len(p[5]) > 1:
         if printverbose: print('Fuse Group')
-        for obj in p[5]:
-            checkObjShape(obj)
         p[0] = [fuse(p[5], "Group")]
     else:
         if printverbose: print(f"Group {p[5]} type {type(p[5])}")
-        checkObjShape(p[5])
         p[0] = p[5]
 
 
@@ -449,7 +542,8 @@ def checkObjShape(obj):
     if hasattr(obj, 'Shape'):
         if obj.Shape.isNull():
             if printverbose: print('Shape is Null - recompute')
-            obj.recompute()
+            # the shapes of deferred booleans it depends on are computed too
+            obj.recompute(True)
         if obj.Shape.isNull():
             print(f'Recompute failed : {obj.Name}')
     else:
@@ -583,17 +677,16 @@ def fuse(lst,name):
         if gui:
             for subobj in myfuse.Shapes:
                 subobj.ViewObject.hide()
+        deferred.append(myfuse)
     else:
         if printverbose: print("Single Fuse")
         myfuse = doc.addObject('Part::Fuse',name)
         myfuse.Base = lst[0]
         myfuse.Tool = lst[1]
-        checkObjShape(myfuse.Base)
-        checkObjShape(myfuse.Tool)
-        myfuse.Shape = myfuse.Base.Shape.fuse(myfuse.Tool.Shape)
         if gui:
             myfuse.Base.ViewObject.hide()
             myfuse.Tool.ViewObject.hide()
+        deferred.append(myfuse)
     myfuse.Placement = FreeCAD.Placement()
     return myfuse
 
@@ -633,10 +726,10 @@ def p_difference_action(p):
             mycut.Tool = fuse(p[5][1:],'union')
         else :
             mycut.Tool = p[5][1]
-            checkObjShape(mycut.Tool)
         if gui:
             mycut.Base.ViewObject.hide()
             mycut.Tool.ViewObject.hide()
+        deferred.append(mycut)
         if printverbose: print("Push Resulting Cut")
         p[0] = [mycut]
     if printverbose: print("End Cut")
@@ -653,21 +746,20 @@ def p_intersection_action(p):
         if gui:
             for subobj in mycommon.Shapes:
                 subobj.ViewObject.hide()
+        deferred.append(mycommon)
     elif (len(p[5]) == 2):
         if printverbose: print("Single Common")
         mycommon = doc.addObject('Part::Common',p[1])
         mycommon.Base = p[5][0]
         mycommon.Tool = p[5][1]
-        checkObjShape(mycommon.Base)
-        checkObjShape(mycommon.Tool)
         if gui:
             mycommon.Base.ViewObject.hide()
             mycommon.Tool.ViewObject.hide()
+        deferred.append(mycommon)
     elif (len(p[5]) == 1):
         mycommon = p[5][0]
     else : # 1 child
         mycommon = placeholder('group',[],'{}')
-    mycommon.Shape = mycommon.Base.Shape.common(mycommon.Tool.Shape)
     p[0] = [mycommon]
     if printverbose: print("End Intersection")
 
@@ -28,6 +28,8 @@ __doc__ = "Implementation of GeneralFuseResult class, which parses return of gen
 import Part
 from .Utils import HashableShape, HashableShape_Deep, FrozenClass
 
+# attribute of Part.Shape listing the sub-elements of given type
+element_attributes = {"Vertex": "Vertexes", "Edge": "Edges", "Face": "Faces", "Solid": "Solids"}
 
 class GeneralFuseResult(FrozenClass):
     """class GeneralFuseResult: helper object for obtaining info from results of
@@ -58,9 +60,16 @@ def myCustomFusionRoutine(list_of_shapes):
         #list of source shapes (indexes) the piece came from, by index of piece. List of lists of ints.
         self._sources_of_piece = []
 
-        # dictionary for finding, which source shapes did an element of pieces come from.
-        # key = HashableShape (element). Value = set of ints
-        self._element_to_source = {}
+        # element maps, built lazily per element type by parse_elements. Key = element type
+        # ("Vertex", "Edge", "Face" or "Solid").
+        # Value = dict: key = HashableShape (element of pieces). Value = element id (int).
+        self._element_to_index = {}
+        # which source shapes did an element of pieces come from, by element type and element id.
+        # Value = list of ints, each int is a bit mask of source indexes.
+        self._sources_of_element = {}
+        # elements connected to each joint element, built lazily by _bitsOfJoint.
+        # Key = (bit type, joint type). Value = dict: joint id -> list of bit ids.
+        self._bits_of_joint = {}
 
         self._freeze()
 
@@ -160,21 +169,56 @@ def myCustomFusionRoutine(list_of_shapes):
                 self._sources_of_piece[iPiece].append(iSource)
                 self._pieces_of_source[iSource].append(iPiece)
 
-    def parse_elements(self):
-        """Fills element-to-source map. Potentially slow, so separated from general parse.
-        Needed for splitAggregates; called automatically from splitAggregates."""
-
-        if len(self._element_to_source)>0:
-            return #already parsed.
-
-        for iPiece in range(len(self.pieces)):
-            piece = self.pieces[iPiece]
-            for element in piece.Vertexes + piece.Edges + piece.Faces + piece.Solids:
-                el_h = HashableShape(element)
-                if el_h in self._element_to_source:
-                    self._element_to_source[el_h].update(set(self._sources_of_piece[iPiece]))
-                else:
-                    self._element_to_source[el_h] = set(self._sources_of_piece[iPiece])
+    def parse_elements(self, element_types = ("Vertex", "Edge", "Face", "Solid")):
+        """Fills element-to-source maps for given element types. Potentially slow, so
+        separated from general parse, and only done for the types that are asked for.
+        Needed for splitAggregates; called automatically from makeSplitPieces."""
+
+        source_masks = None
+        for element_type in element_types:
+            if element_type in self._element_to_index:
+                continue #already parsed.
+            if source_masks is None:
+                source_masks = [sum(1 << iSource for iSource in set(ilist)) for ilist in self._sources_of_piece]
+
+            element_to_index = {}
+            sources_of_element = []
+            attribute = element_attributes[element_type]
+            for iPiece in range(len(self.pieces)):
+                mask = source_masks[iPiece]
+                for element in getattr(self.pieces[iPiece], attribute):
+                    i_element = element_to_index.setdefault(HashableShape(element), len(sources_of_element))
+                    if i_element == len(sources_of_element):
+                        sources_of_element.append(mask)
+                    else:
+                        sources_of_element[i_element] |= mask
+            self._element_to_index[element_type] = element_to_index
+            self._sources_of_element[element_type] = sources_of_element
+
+    def _overlapCount(self, element_type, i_element):
+        "_overlapCount(element_type, i_element): returns the number of source shapes the element came from."
+        return bin(self._sources_of_element[element_type][i_element]).count("1")
+
+    def _bitsOfJoint(self, bit_type, joint_type):
+        """_bitsOfJoint(bit_type, joint_type): returns dict: key = id of joint element,
+        value = list of ids of bit elements of all pieces connected to the joint. Built
+        once from self.gfa_return, and reused."""
+
+        key = (bit_type, joint_type)
+        bits_of_joint = self._bits_of_joint.get(key)
+        if bits_of_joint is not None:
+            return bits_of_joint
+
+        self.parse_elements(key)
+        bit_index = self._element_to_index[bit_type]
+        joint_index = self._element_to_index[joint_type]
+        bits_of_joint = {}
+        for bit in getattr(self.gfa_return[0], element_attributes[bit_type]):
+            i_bit = bit_index[HashableShape(bit)]
+            for joint_bit in getattr(bit, element_attributes[joint_type]):
+                bits_of_joint.setdefault(joint_index[HashableShape(joint_bit)], []).append(i_bit)
+        self._bits_of_joint[key] = bits_of_joint
+        return bits_of_joint
 
     def indexOfPiece(self, piece_shape):
         "indexOfPiece(piece_shape): returns index of piece_shape in list of pieces"
@@ -232,7 +276,6 @@ def myCustomFusionRoutine(list_of_shapes):
         pieces_to_split = [HashableShape(piece) for piece in pieces_to_split]
         pieces_to_split = set(pieces_to_split)
 
-        self.parse_elements()
         new_data = GeneralFuseReturnBuilder(self.source_shapes)
         changed = False
 
@@ -309,35 +352,32 @@ def myCustomFusionRoutine(list_of_shapes):
         original shape."""
 
         if shape.ShapeType == "Wire":
-            bit_extractor = lambda sh: sh.Edges
-            joint_extractor = lambda sh: sh.Vertexes
+            bit_type, joint_type = "Edge", "Vertex"
         elif shape.ShapeType == "Shell":
-            bit_extractor = lambda sh: sh.Faces
-            joint_extractor = lambda sh: sh.Edges
+            bit_type, joint_type = "Face", "Edge"
         elif shape.ShapeType == "CompSolid":
-            bit_extractor = lambda sh: sh.Solids
-            joint_extractor = lambda sh: sh.Faces
+            bit_type, joint_type = "Solid", "Face"
         else:
             #can't split the shape
             return [shape]
+        bit_extractor = lambda sh: getattr(sh, element_attributes[bit_type])
 
         # for each joint, test if all bits it's connected to are from same number of sources.
         # If not, this is a joint for splitting
-        # FIXME: this is slow, and maybe can be optimized
+        bits_of_joint = self._bitsOfJoint(bit_type, joint_type)
+        joint_index = self._element_to_index[joint_type]
         splits = []
-        for joint in joint_extractor(shape):
-            joint_overlap_count = len(self._element_to_source[HashableShape(joint)])
+        for joint in getattr(shape, element_attributes[joint_type]):
+            i_joint = joint_index[HashableShape(joint)]
+            joint_overlap_count = self._overlapCount(joint_type, i_joint)
             if joint_overlap_count > 1:
-                # find elements in pieces that are connected to joint
-                for bit in bit_extractor(self.gfa_return[0]):
-                    for joint_bit in joint_extractor(bit):
-                        if joint_bit.isSame(joint):
-                            #bit is connected to joint!
-                            bit_overlap_count = len(self._element_to_source[HashableShape(bit)])
-                            assert(bit_overlap_count <= joint_overlap_count)
-                            if bit_overlap_count < joint_overlap_count:
-                                if len(splits) == 0 or splits[-1] is not joint:
-                                    splits.append(joint)
+                # elements in pieces that are connected to joint
+                for i_bit in bits_of_joint.get(i_joint, []):
+                    bit_overlap_count = self._overlapCount(bit_type, i_bit)
+                    assert(bit_overlap_count <= joint_overlap_count)
+                    if bit_overlap_count < joint_overlap_count:
+                        splits.append(joint)
+                        break
         if len(splits)==0:
             #shape was not split - no split points found
             return [shape]
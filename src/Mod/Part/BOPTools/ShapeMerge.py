@@ -68,57 +68,76 @@ def splitIntoGroupsBySharing(list_of_shapes, element_extractor, split_connection
 
     split_connections = set([HashableShape(element) for element in split_connections])
 
-    groups = [] #list of tuples (shapes,elements). Shapes is a list of plain shapes. Elements is a set of HashableShapes - all elements of shapes in the group, excluding split_connections.
-
-    # add shapes to the list of groups, one by one. If not connected to existing groups,
-    # new group is created. If connected, shape is added to groups, and the groups are joined.
-    for shape in list_of_shapes:
+    # Shapes are grouped with a union-find structure over shape indices. Each element is
+    # mapped to the first shape that has it, so a new shape finds the groups it is connected
+    # to by looking up its own elements only, instead of testing every existing group.
+    parent = [] #union-find forest. parent[i] is the index of the parent shape of shape i.
+    owners = {} #HashableShape element -> index of the first shape having the element
+    groups = {} #root shape index -> [merge_stamp, node]. Node is a nested list of shape indices.
+    merge_count = 0
+
+    def find(index):
+        root = index
+        while parent[root] != root:
+            root = parent[root]
+        while parent[index] != root:
+            parent[index], index = root, parent[index]
+        return root
+
+    def group_order(root):
+        # Reproduces the ordering of the list of groups: groups made by joining come first,
+        # most recent join first, followed by the groups that were never joined, in the
+        # order they were created.
+        merge_stamp = groups[root][0]
+        if merge_stamp is None:
+            return (1, root)
+        return (0, -merge_stamp)
+
+    for index, shape in enumerate(list_of_shapes):
         shape_elements = set([HashableShape(element) for element in element_extractor(shape)])
         shape_elements.difference_update(split_connections)
+        parent.append(index)
         #search if shape is connected to any groups
-        connected_to = []
-        not_in_connected_to = []
-        for iGroup in range(len(groups)):
-            connected = False
-            for element in shape_elements:
-                if element in groups[iGroup][1]:
-                    connected_to.append(iGroup)
-                    connected = True
-                    break
-            else:
-                # `break` not invoked, so `connected` is false
-                not_in_connected_to.append(iGroup)
-
-        # test if we need to join groups
-        if len(connected_to)>1:
-            #shape bridges a gap between some groups. Join them into one.
-            #rebuilding list of groups. First, add the new "supergroup", then add the rest
-            groups_new = []
-
-            supergroup = (list(),set())
-            for iGroup in connected_to:
-                supergroup[0].extend( groups[iGroup][0] )# merge lists of shapes
-                supergroup[1].update( groups[iGroup][1] )# merge lists of elements
-            groups_new.append(supergroup)
-
-            l_groups = len(groups)
-            groups_new.extend([groups[i_group] \
-                               for i_group in not_in_connected_to \
-                               if i_group < l_groups])
-            groups = groups_new
-            connected_to = [0]
-
-        # add shape to the group it is connected to (if to many, the groups should have been unified by the above code snippet)
-        if len(connected_to) > 0:
-            iGroup = connected_to[0]
-            groups[iGroup][0].append(shape)
-            groups[iGroup][1].update( shape_elements )
+        connected_to = set()
+        for element in shape_elements:
+            owner = owners.setdefault(element, index)
+            if owner != index:
+                connected_to.add(find(owner))
+
+        if len(connected_to) > 1:
+            #shape bridges a gap between some groups. Join them into one "supergroup", keeping
+            #the shapes in the order the groups are listed in.
+            merge_count += 1
+            connected_to = sorted(connected_to, key= group_order)
+            root = connected_to[0]
+            node = [groups.pop(i_group)[1] for i_group in connected_to]
+            node.append(index)
+            for i_group in connected_to:
+                parent[i_group] = root
+            parent[index] = root
+            groups[root] = [merge_count, node]
+        elif len(connected_to) == 1:
+            root = connected_to.pop()
+            parent[index] = root
+            groups[root][1].append(index)
         else:
-            newgroup = ([shape], shape_elements)
-            groups.append(newgroup)
+            groups[index] = [None, [index]]
 
     # done. Discard unnecessary data and return result.
-    return [shapes for shapes,elements in groups]
+    result = []
+    for root in sorted(groups, key= group_order):
+        shapes = []
+        stack = [iter(groups[root][1])]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                shapes.append(list_of_shapes[item])
+            else:
+                stack.pop()
+        result.append(shapes)
+    return result
 
 def mergeSolids(list_of_solids_compsolids, flag_single = False, split_connections = [], bool_compsolid = False):
     """mergeSolids(list_of_solids, flag_single = False): merges touching solids that share
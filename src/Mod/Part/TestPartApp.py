@@ -938,6 +938,51 @@ class PartBOPTestContainer(unittest.TestCase):
     def tearDown(self):
         FreeCAD.closeDocument(self.Doc.Name)
 
+class PartTestShapeMerge(unittest.TestCase):
+    def testSplitIntoGroupsBySharing(self):
+        from BOPTools import ShapeMerge, SplitAPI
+        import time
+        # two separate rows of touching boxes, split into fragments
+        boxes = []
+        for row in range(2):
+            for i in range(50):
+                boxes.append(Part.makeBox(1, 1, 1, FreeCAD.Vector(i, row * 2, 0)))
+        fragments = SplitAPI.booleanFragments(boxes, "Standard").Solids
+        self.assertEqual(len(fragments), 100)
+
+        start = time.time()
+        groups = ShapeMerge.splitIntoGroupsBySharing(fragments, lambda sh: sh.Faces)
+        FreeCAD.Console.PrintLog(
+            "splitIntoGroupsBySharing: {} solids in {:.3f} s\n".format(
+                len(fragments), time.time() - start
+            )
+        )
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(sorted(len(group) for group in groups), [50, 50])
+
+        # a shared face listed in split_connections does not connect
+        first = groups[0][0]
+        pair = [first] + [sh for sh in groups[0][1:] if ShapeMerge.isConnected(first, sh)][0:1]
+        faces = ShapeMerge.findSharedElements(pair, lambda sh: sh.Faces)
+        self.assertEqual(len(ShapeMerge.splitIntoGroupsBySharing(pair, lambda sh: sh.Faces)), 1)
+        groups = ShapeMerge.splitIntoGroupsBySharing(pair, lambda sh: sh.Faces, faces)
+        self.assertEqual(len(groups), 2)
+
+class PartTestGeneralFuseResult(unittest.TestCase):
+    def testSplitAggregates(self):
+        from BOPTools import SplitAPI
+        from BOPTools.GeneralFuseResult import GeneralFuseResult
+        wire1 = Part.Wire(Part.makeLine(FreeCAD.Vector(-1, 0, 0), FreeCAD.Vector(1, 0, 0)))
+        wire2 = Part.Wire(Part.makeLine(FreeCAD.Vector(0, -1, 0), FreeCAD.Vector(0, 1, 0)))
+        pieces, map = wire1.generalFuse([wire2])
+        gr = GeneralFuseResult([wire1, wire2], (pieces, map))
+        self.assertEqual(len(gr.pieces), 2)
+        gr.splitAggregates()
+        self.assertEqual(len(gr.pieces), 4)
+        self.assertEqual(len(gr.piecesFromSource(wire1)), 2)
+        self.assertEqual(gr.largestOverlapCount(), 1)
+        self.assertEqual(len(SplitAPI.booleanFragments([wire1, wire2], "Split").Wires), 4)
+
 class BSplineCurve2d(unittest.TestCase):
     def setUp(self):
         vec2 = FreeCAD.Base.Vector2d
@@ -28,6 +28,11 @@ __url__ = ["https://www.freecad.org"]
 """
 This library imports an Excel-XLSX-file into FreeCAD.
 
+Version 1.2:
+The files are streamed with ElementTree.iterparse instead of being
+loaded as whole DOMs. Constant values are set first, then the formulas
+sorted by their dependencies, so the document is recomputed only once.
+
 Version 1.1, Nov. 2016:
 Changed parser, adds rad-unit to trigonometric functions in order
 to give the same result in FreeCAD.
@@ -52,8 +57,10 @@ known issues:
 """
 
 
+import bisect
+import re
 import zipfile
-import xml.dom.minidom
+import xml.etree.ElementTree as ET
 import FreeCAD as App
 
 try:
@@ -305,110 +312,205 @@ class FormulaTranslator(object):
         # print('angle result: ', treeNode.result)
 
 
-def getText(nodelist):
-    rc = []
-    for node in nodelist:
-        if node.nodeType == node.TEXT_NODE:
-            rc.append(node.data)
-        return "".join(rc)
+# Matches cell references and ranges inside an Excel formula, optionally
+# prefixed with a sheet name: A1, $B$2, Sheet2!C3, 'My Sheet'!A1:B4
+cellRefPattern = re.compile(
+    r"(?<![\w.$'])(?:(?:'((?:[^']|'')+)'|([A-Za-z_][\w.]*))!)?"
+    r"\$?([A-Z]{1,3})\$?([0-9]+)(?::\$?([A-Z]{1,3})\$?([0-9]+))?(?![\w(])"
+)
+namePattern = re.compile(r"[A-Za-z_][\w.]*")
 
 
-def handleWorkSheet(theDom, actSheet, strList):
-    rows = theDom.getElementsByTagName("row")
-    for row in rows:
-        handleCells(row.getElementsByTagName("c"), actSheet, strList)
+def localName(tag):
+    """Returns the tag or attribute name without its namespace."""
+    return tag.rsplit("}", 1)[-1]
 
 
-def handleCells(cellList, actCellSheet, sList):
-    for cell in cellList:
-        cellAtts = cell.attributes
-        refRef = cellAtts.getNamedItem("r")
-        ref = getText(refRef.childNodes)
+def getAttribute(elem, name):
+    """Returns the value of the attribute with the given local name."""
+    for key, value in elem.attrib.items():
+        if localName(key) == name:
+            return value
+    return None
 
-        refType = cellAtts.getNamedItem("t")
-        if refType:
-            cellType = getText(refType.childNodes)
-        else:
-            cellType = "n"
 
-        # print("reference: ", ref, ' Cell type: ', cellType)
+def getText(elem):
+    """Returns all the text inside the element, following the
+    text runs of rich text strings."""
+    return "".join(sub.text or "" for sub in elem.iter() if localName(sub.tag) == "t")
+
+
+def splitRef(ref):
+    """Splits a cell reference like AB12 into a column number and a row number."""
+    col = 0
+    for i, char in enumerate(ref):
+        if char.isdigit():
+            return col, int(ref[i:])
+        col = col * 26 + ord(char.upper()) - 64
+    return col, 0
 
-        if cellType == "inlineStr":
-            iStringList = cell.getElementsByTagName("is")
-            # print('iString: ', iStringList)
-            for stringEle in iStringList:
-                tElement = stringEle.getElementsByTagName("t")[0]
-                theString = getText(tElement.childNodes)
 
-                # print('theString: ', theString)
-                actCellSheet.set(ref, theString)
+def iterRows(theFile):
+    """Generator that parses a worksheet file incrementally and yields
+    the cell elements of one row at a time. Rows already handled are
+    dropped from the tree, so memory use does not grow with the sheet."""
+    parent = None
+    for event, elem in ET.iterparse(theFile, events=("start", "end")):
+        tag = localName(elem.tag)
+        if event == "start":
+            if tag == "sheetData":
+                parent = elem
+        elif tag == "row":
+            yield [c for c in elem if localName(c.tag) == "c"]
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
 
-        formulaRef = cell.getElementsByTagName("f")
-        if len(formulaRef) == 1:
-            theFormula = getText(formulaRef[0].childNodes)
+
+def handleWorkSheet(theFile, cellDict, strList):
+    """Reads all rows of a worksheet and collects its cell contents in
+    cellDict, as a list of constant values and a dict of formulas."""
+    for cellList in iterRows(theFile):
+        handleCells(cellList, cellDict, strList)
+
+
+def handleCells(cellList, cellDict, sList):
+    values, formulas = cellDict
+    for cell in cellList:
+        ref = cell.get("r")
+        cellType = cell.get("t", "n")
+
+        # print("reference: ", ref, ' Cell type: ', cellType)
+
+        formulaRef = None
+        valueRef = None
+        for child in cell:
+            tag = localName(child.tag)
+            if tag == "f":
+                formulaRef = child
+            elif tag == "v":
+                valueRef = child
+            elif tag == "is":
+                values.append((ref, getText(child)))
+
+        if formulaRef is not None:
+            theFormula = formulaRef.text
             if theFormula:
                 # print("theFormula: ", theFormula)
-                fTrans = FormulaTranslator()
-                actCellSheet.set(ref, fTrans.translateForm(theFormula))
+                formulas[ref] = theFormula
             else:
-                attrs = formulaRef[0].attributes
-                attrRef = attrs.getNamedItem("t")
-                attrName = getText(attrRef.childNodes)
-                indexRef = attrs.getNamedItem("si")
-                indexName = getText(indexRef.childNodes)
-                content = "<f t='{}' si='{}'/>".format(attrName, indexName)
+                content = "<f t='{}' si='{}'/>".format(formulaRef.get("t"), formulaRef.get("si"))
                 print(f"Unsupported formula in cell {ref}: {content}")
 
-        else:
-            valueRef = cell.getElementsByTagName("v")
-            # print('valueRef: ', valueRef)
-            if len(valueRef) == 1:
-                valueRef = cell.getElementsByTagName("v")[0]
-                if valueRef:
-                    theValue = getText(valueRef.childNodes)
-                    # print("theValue: ", theValue)
-                    if cellType == "n":
-                        actCellSheet.set(ref, theValue)
-                    if cellType == "s":
-                        actCellSheet.set(ref, (sList[int(theValue)]))
-
-
-def handleWorkBookRels(theBookRels):
-    theRels = theBookRels.getElementsByTagName("Relationship")
+        elif valueRef is not None and valueRef.text:
+            theValue = valueRef.text
+            # print("theValue: ", theValue)
+            if cellType == "n":
+                values.append((ref, theValue))
+            if cellType == "s":
+                values.append((ref, sList[int(theValue)]))
+
+
+def indexFormulaCells(formulaCells):
+    """Returns the formula cells of the workbook grouped by sheet and by
+    column number, each column holding a sorted list of row numbers and
+    the matching list of cell references. Ranges are looked up in it by
+    bisection instead of scanning all the formula cells."""
+    cellIndex = {}
+    for sheetName, ref in formulaCells:
+        col, row = splitRef(ref)
+        cellIndex.setdefault(sheetName, {}).setdefault(col, []).append((row, ref))
+    for columns in cellIndex.values():
+        for col, cells in columns.items():
+            cells.sort()
+            columns[col] = ([row for row, ref in cells], [ref for row, ref in cells])
+    return cellIndex
+
+
+def getDependencies(sheetName, formula, formulaCells, aliasDict, cellIndex=None):
+    """Returns the formula cells of the workbook referenced by formula, as
+    (sheet name, cell reference) keys of formulaCells. cellIndex is the
+    result of indexFormulaCells(formulaCells), built when not given."""
+    if cellIndex is None:
+        cellIndex = indexFormulaCells(formulaCells)
+    deps = []
+    for match in cellRefPattern.finditer(formula):
+        quoted, plain, col1, row1, col2, row2 = match.groups()
+        depSheet = quoted.replace("''", "'") if quoted else plain or sheetName
+        if col2 is None:
+            key = (depSheet, col1 + row1)
+            if key in formulaCells:
+                deps.append(key)
+            continue
+        # a range: look for formula cells inside its bounds
+        c1, r1 = splitRef(col1 + row1)
+        c2, r2 = splitRef(col2 + row2)
+        rowMin, rowMax = min(r1, r2), max(r1, r2)
+        for col, (rows, refs) in cellIndex.get(depSheet, {}).items():
+            if min(c1, c2) <= col <= max(c1, c2):
+                first = bisect.bisect_left(rows, rowMin)
+                last = bisect.bisect_right(rows, rowMax)
+                deps.extend((depSheet, ref) for ref in refs[first:last])
+    for name in namePattern.findall(formula):
+        key = aliasDict.get(name)
+        if key in formulaCells:
+            deps.append(key)
+    return deps
+
+
+def sortFormulas(formulaCells, aliasDict):
+    """Sorts the formula cells of the workbook so that every formula comes
+    after the formula cells it depends on. formulaCells maps
+    (sheet name, cell reference) to the Excel formula, aliasDict maps
+    defined names to (sheet name, cell reference). Cells taking part in
+    a circular reference are appended at the end in their original order."""
+    cellIndex = indexFormulaCells(formulaCells)
+    users = {key: [] for key in formulaCells}
+    pending = {}
+    for key, formula in formulaCells.items():
+        deps = set(getDependencies(key[0], formula, formulaCells, aliasDict, cellIndex))
+        deps.discard(key)
+        pending[key] = len(deps)
+        for dep in deps:
+            users[dep].append(key)
+
+    result = [key for key in formulaCells if pending[key] == 0]
+    for key in result:
+        for user in users[key]:
+            pending[user] -= 1
+            if pending[user] == 0:
+                result.append(user)
+    if len(result) < len(formulaCells):
+        done = set(result)
+        result.extend(key for key in formulaCells if key not in done)
+    return result
+
+
+def handleWorkBookRels(theFile):
     idTarget = {}
-    for rel in theRels:
-        relAtts = rel.attributes
-        idRef = relAtts.getNamedItem("Id")
-        relRef = getText(idRef.childNodes)
-        targetRef = relAtts.getNamedItem("Target")
-        relTarget = getText(targetRef.childNodes)
-        idTarget[relRef] = relTarget
+    for _, elem in ET.iterparse(theFile):
+        if localName(elem.tag) == "Relationship":
+            idTarget[elem.get("Id")] = elem.get("Target")
     return idTarget
 
 
-def handleWorkBook(theBook, theBookRels, sheetDict, Doc):
-    theSheets = theBook.getElementsByTagName("sheet")
-    theIdTargetMap = handleWorkBookRels(theBookRels)
-    # print("theSheets: ", theSheets)
-    for sheet in theSheets:
-        sheetAtts = sheet.attributes
-        nameRef = sheetAtts.getNamedItem("name")
-        sheetName = getText(nameRef.childNodes)
-        # print("table name: ", sheetName)
-        idRef = sheetAtts.getNamedItem("r:id")
-        sheetFile = theIdTargetMap[getText(idRef.childNodes)]
-        # print("sheetFile: ", sheetFile)
-        # add FreeCAD-spreadsheet
-        sheetDict[sheetName] = (Doc.addObject("Spreadsheet::Sheet", sheetName), sheetFile)
-
-    theAliases = theBook.getElementsByTagName("definedName")
-    for theAlias in theAliases:
-        aliAtts = theAlias.attributes
-        nameRef = aliAtts.getNamedItem("name")
-        aliasName = getText(nameRef.childNodes)
+def handleWorkBook(theBookFile, theBookRelsFile, sheetDict, Doc, aliasDict=None):
+    theIdTargetMap = handleWorkBookRels(theBookRelsFile)
+    aliases = []
+    for _, elem in ET.iterparse(theBookFile):
+        tag = localName(elem.tag)
+        if tag == "sheet":
+            sheetName = elem.get("name")
+            # print("table name: ", sheetName)
+            sheetFile = theIdTargetMap[getAttribute(elem, "id")]
+            # print("sheetFile: ", sheetFile)
+            # add FreeCAD-spreadsheet
+            sheetDict[sheetName] = (Doc.addObject("Spreadsheet::Sheet", sheetName), sheetFile)
+        elif tag == "definedName":
+            aliases.append((elem.get("name"), elem.text))  # aliasRef can be None
+
+    for aliasName, aliasRef in aliases:
         # print("aliasName: ", aliasName)
-
-        aliasRef = getText(theAlias.childNodes)  # aliasRef can be None
         if aliasRef and "$" in aliasRef:
             refList = aliasRef.split("!$")
             addressList = refList[1].split("$")
@@ -417,54 +519,67 @@ def handleWorkBook(theBook, theBookRels, sheetDict, Doc):
             # print('Address: ', addressList[0] + addressList[1])
             actSheet, sheetFile = sheetDict[refList[0]]
             actSheet.setAlias(addressList[0] + addressList[1], aliasName)
+            if aliasDict is not None:
+                aliasDict[aliasName] = (refList[0], addressList[0] + addressList[1])
 
 
-def handleStrings(theStr, sList):
+def handleStrings(theFile, sList):
     # print("process Strings: ")
-    stringElements = theStr.getElementsByTagName("t")
-    for sElem in stringElements:
-        # print("string: ", getText(sElem.childNodes))
-        sList.append(getText(sElem.childNodes))
+    for _, elem in ET.iterparse(theFile):
+        if localName(elem.tag) == "si":
+            sList.append(getText(elem))
+            elem.clear()
+
+
+def importWorkBook(z, theDoc):
+    """Imports all the sheets of the opened XLSX zip file into theDoc.
+    The cells are collected per sheet while the files are streamed, then
+    the constant values of all sheets are set, followed by the formulas
+    sorted by their dependencies, so one recompute is enough."""
+    sheetDict = dict()
+    aliasDict = dict()
+    stringList = []
+
+    with z.open("xl/workbook.xml") as theBookFile, z.open(
+        "xl/_rels/workbook.xml.rels"
+    ) as theBookRelsFile:
+        handleWorkBook(theBookFile, theBookRelsFile, sheetDict, theDoc, aliasDict)
+
+    if "xl/sharedStrings.xml" in z.namelist():
+        with z.open("xl/sharedStrings.xml") as theStringFile:
+            handleStrings(theStringFile, stringList)
+
+    formulaCells = dict()
+    for sheetSpec in sheetDict:
+        # print("sheetSpec: ", sheetSpec)
+        theSheet, sheetFile = sheetDict[sheetSpec]
+        cellDict = ([], dict())
+        if sheetFile.startswith("/"):
+            sheetPath = sheetFile[1:]
+        else:
+            sheetPath = "xl/" + sheetFile
+        with z.open(sheetPath) as f:
+            handleWorkSheet(f, cellDict, stringList)
+        values, formulas = cellDict
+        for ref, content in values:
+            theSheet.set(ref, content)
+        for ref, formula in formulas.items():
+            formulaCells[(sheetSpec, ref)] = formula
+
+    for key in sortFormulas(formulaCells, aliasDict):
+        sheetName, ref = key
+        fTrans = FormulaTranslator()
+        sheetDict[sheetName][0].set(ref, fTrans.translateForm(formulaCells[key]))
+
+    theDoc.recompute()
 
 
 def open(nameXLSX):
 
     if len(nameXLSX) > 0:
-        z = zipfile.ZipFile(nameXLSX)
-
         theDoc = App.newDocument()
-
-        sheetDict = dict()
-        stringList = []
-
-        theBookFile = z.open("xl/workbook.xml")
-        theBook = xml.dom.minidom.parse(theBookFile)
-        theBookRelsFile = z.open("xl/_rels/workbook.xml.rels")
-        theBookRels = xml.dom.minidom.parse(theBookRelsFile)
-        handleWorkBook(theBook, theBookRels, sheetDict, theDoc)
-        theBook.unlink()
-        theBookRels.unlink()
-
-        if "xl/sharedStrings.xml" in z.namelist():
-            theStringFile = z.open("xl/sharedStrings.xml")
-            theStrings = xml.dom.minidom.parse(theStringFile)
-            handleStrings(theStrings, stringList)
-            theStrings.unlink()
-
-        for sheetSpec in sheetDict:
-            # print("sheetSpec: ", sheetSpec)
-            theSheet, sheetFile = sheetDict[sheetSpec]
-            f = z.open("xl/" + sheetFile)
-            myDom = xml.dom.minidom.parse(f)
-
-            handleWorkSheet(myDom, theSheet, stringList)
-            myDom.unlink()
-
-        z.close()
-        # This is needed more than once, otherwise some references are not calculated!
-        theDoc.recompute()
-        theDoc.recompute()
-        theDoc.recompute()
+        with zipfile.ZipFile(nameXLSX) as z:
+            importWorkBook(z, theDoc)
         return theDoc
 
 
@@ -475,35 +590,5 @@ def insert(nameXLSX, docname):
         theDoc = App.newDocument(docname)
     App.ActiveDocument = theDoc
 
-    sheetDict = dict()
-    stringList = []
-
-    z = zipfile.ZipFile(nameXLSX)
-    theBookFile = z.open("xl/workbook.xml")
-    theBook = xml.dom.minidom.parse(theBookFile)
-    theBookRelsFile = z.open("xl/_rels/workbook.xml.rels")
-    theBookRels = xml.dom.minidom.parse(theBookRelsFile)
-    handleWorkBook(theBook, theBookRels, sheetDict, theDoc)
-    theBook.unlink()
-    theBookRels.unlink()
-
-    if "xl/sharedStrings.xml" in z.namelist():
-        theStringFile = z.open("xl/sharedStrings.xml")
-        theStrings = xml.dom.minidom.parse(theStringFile)
-        handleStrings(theStrings, stringList)
-        theStrings.unlink()
-
-    for sheetSpec in sheetDict:
-        # print("sheetSpec: ", sheetSpec)
-        theSheet, sheetFile = sheetDict[sheetSpec]
-        f = z.open("xl/" + sheetFile)
-        myDom = xml.dom.minidom.parse(f)
-
-        handleWorkSheet(myDom, theSheet, stringList)
-        myDom.unlink()
-
-    z.close()
-    # This is needed more than once, otherwise some references are not calculated!
-    theDoc.recompute()
-    theDoc.recompute()
-    theDoc.recompute()
+    with zipfile.ZipFile(nameXLSX) as z:
+        importWorkBook(z, theDoc)
@@ -1,7 +1,8 @@
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 
-from importXLSX import FormulaTranslator, getText, handleStrings, open
+from importXLSX import FormulaTranslator, getText, handleStrings, open, sortFormulas
 
 
 class TestFormulaTranslator(unittest.TestCase):
@@ -96,3 +97,65 @@ class TestFormulaTranslator(unittest.TestCase):
         # Then
         expected = [f"={expression}" for _, expression in formulas_and_expressions]
         self.assertListEqual(expected, result)
+
+
+class TestStreamingImport(unittest.TestCase):
+    def test_handle_strings(self):
+        # With
+        theFile = io.BytesIO(
+            b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            b"<si><t>plain</t></si>"
+            b"<si><r><t>rich </t></r><r><t>text</t></r></si>"
+            b"</sst>"
+        )
+
+        # When
+        result = []
+        handleStrings(theFile, result)
+
+        # Then
+        self.assertListEqual(["plain", "rich text"], result)
+
+    def test_sort_formulas(self):
+        # With
+        formulaCells = {
+            ("Sheet1", "A1"): "B1*2",
+            ("Sheet1", "B1"): "Sheet2!A1+1",
+            ("Sheet1", "C1"): "SUM(A1:B1)",
+            ("Sheet2", "A1"): "length*2",
+            ("Sheet2", "B1"): "3",
+        }
+        aliasDict = {"length": ("Sheet2", "B1")}
+
+        # When
+        result = sortFormulas(formulaCells, aliasDict)
+
+        # Then
+        self.assertListEqual(
+            [
+                ("Sheet2", "B1"),
+                ("Sheet2", "A1"),
+                ("Sheet1", "B1"),
+                ("Sheet1", "A1"),
+                ("Sheet1", "C1"),
+            ],
+            result,
+        )
+
+    def test_sort_formulas_large_ranges(self):
+        # With
+        count = 3000
+        formulaCells = {("Sheet1", "D1"): f"SUM(C1:C{count})"}
+        for row in range(count, 0, -1):
+            formula = f"SUM(B1:B{row})"
+            if row > 1:
+                formula += f"+C{row - 1}"
+            formulaCells[("Sheet1", f"C{row}")] = formula
+
+        # When
+        result = sortFormulas(formulaCells, {})
+
+        # Then
+        expected = [("Sheet1", f"C{row}") for row in range(1, count + 1)]
+        expected.append(("Sheet1", "D1"))
+        self.assertListEqual(expected, result)
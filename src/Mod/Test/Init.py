@@ -32,4 +32,5 @@ FreeCAD.__unit_test__ += [
     "StringHasher",
     "UnicodeTests",
     "TestPythonSyntax",
+    "RunnerTests",
 ]
@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# **************************************************************************/
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+import TestApp
+
+
+class TestTimedTextTestResult(unittest.TestCase):
+    def testRecords(self):
+        class SampleCases(unittest.TestCase):
+            def testSuccess(self):
+                pass
+
+            def testFailure(self):
+                self.fail("expected failure message")
+
+            def testError(self):
+                raise RuntimeError("expected error message")
+
+            @unittest.skip("expected skip reason")
+            def testSkip(self):
+                pass
+
+            @unittest.expectedFailure
+            def testExpectedFailure(self):
+                self.fail()
+
+            @unittest.expectedFailure
+            def testUnexpectedSuccess(self):
+                pass
+
+        suite = unittest.defaultTestLoader.loadTestsFromTestCase(SampleCases)
+        runner = unittest.TextTestRunner(
+            stream=io.StringIO(), resultclass=TestApp.TimedTextTestResult
+        )
+        result = runner.run(suite)
+
+        records = {record["id"].rpartition(".")[2]: record for record in result.records}
+        self.assertEqual(len(records), 6)
+        outcomes = {name: record["outcome"] for name, record in records.items()}
+        self.assertEqual(
+            outcomes,
+            {
+                "testSuccess": "success",
+                "testFailure": "failure",
+                "testError": "error",
+                "testSkip": "skipped",
+                "testExpectedFailure": "success",
+                "testUnexpectedSuccess": "failure",
+            },
+        )
+        self.assertIn("expected failure message", records["testFailure"]["details"])
+        self.assertIn("expected error message", records["testError"]["details"])
+        self.assertEqual(records["testSkip"]["details"], "expected skip reason")
+        for record in records.values():
+            self.assertGreaterEqual(record["time"], 0.0)
+
+
+class TestJUnitXml(unittest.TestCase):
+    def testWrite(self):
+        records = [
+            {"module": "ModA", "id": "ModA.Cases.testOk", "outcome": "success", "time": 0.5},
+            {
+                "module": "ModA",
+                "id": "ModA.Cases.testBad",
+                "outcome": "failure",
+                "time": 0.25,
+                "details": "assertion",
+            },
+            {
+                "module": "ModB",
+                "id": "ModB",
+                "outcome": "error",
+                "time": 2.0,
+                "details": "Timed out after 1 s",
+            },
+        ]
+        fd, fileName = tempfile.mkstemp(suffix=".xml")
+        os.close(fd)
+        try:
+            TestApp.writeJUnitXml(records, fileName)
+            root = ET.parse(fileName).getroot()
+        finally:
+            os.remove(fileName)
+
+        self.assertEqual(root.tag, "testsuites")
+        suites = {suite.get("name"): suite for suite in root.findall("testsuite")}
+        self.assertEqual(sorted(suites), ["ModA", "ModB"])
+
+        suiteA = suites["ModA"]
+        self.assertEqual(suiteA.get("tests"), "2")
+        self.assertEqual(suiteA.get("failures"), "1")
+        self.assertEqual(suiteA.get("errors"), "0")
+        self.assertEqual(suiteA.get("time"), "0.750")
+        cases = suiteA.findall("testcase")
+        self.assertEqual([case.get("name") for case in cases], ["testOk", "testBad"])
+        self.assertEqual(cases[1].get("classname"), "ModA.Cases")
+        self.assertIsNone(cases[0].find("failure"))
+        self.assertEqual(cases[1].find("failure").text, "assertion")
+
+        suiteB = suites["ModB"]
+        self.assertEqual(suiteB.get("errors"), "1")
+        case = suiteB.find("testcase")
+        self.assertEqual(case.get("classname"), "ModB")
+        self.assertEqual(case.find("error").text, "Timed out after 1 s")
+
+
+class TestRunTestModule(unittest.TestCase):
+    """Runs small Python scripts in place of FreeCADCmd workers: the
+    interpreter ignores the '-t' option and runs the script given as test
+    name, which stands for a worker that passes, crashes or hangs."""
+
+    def setUp(self):
+        from freecad.utils import get_python_exe
+
+        self.executable = get_python_exe()
+        if not self.executable:
+            self.skipTest("no Python interpreter found to run the workers")
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def makeWorker(self, source):
+        fileName = os.path.join(self.tempDir.name, "worker.py")
+        with open(fileName, "w", encoding="utf-8") as f:
+            f.write(source)
+        return fileName
+
+    def testResults(self):
+        worker = self.makeWorker(
+            "import json, os\n"
+            "records = [{'id': 'Mod.Cases.testOk', 'outcome': 'success', 'time': 0.1}]\n"
+            "with open(os.environ['FREECAD_TEST_RESULT_FILE'], 'w') as f:\n"
+            "    json.dump(records, f)\n"
+        )
+        records = TestApp.runTestModule(worker, 60, self.executable)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["id"], "Mod.Cases.testOk")
+        self.assertEqual(records[0]["outcome"], "success")
+        self.assertEqual(records[0]["module"], worker)
+        self.assertEqual(records[0]["time"], 0.1)
+
+    def testCrash(self):
+        worker = self.makeWorker("print('worker output')\nraise SystemExit(3)\n")
+        records = TestApp.runTestModule(worker, 60, self.executable)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["id"], worker)
+        self.assertEqual(records[0]["outcome"], "error")
+        self.assertIn("exited with code 3", records[0]["details"])
+        self.assertIn("worker output", records[0]["details"])
+
+    def testTimeout(self):
+        worker = self.makeWorker("import time\ntime.sleep(60)\n")
+        records = TestApp.runTestModule(worker, 1, self.executable)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["outcome"], "error")
+        self.assertEqual(records[0]["details"], "Timed out after 1 s")
+        self.assertGreaterEqual(records[0]["time"], 1.0)
+
+
+class TestBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import TestPerf
+        except ImportError as e:
+            raise unittest.SkipTest("TestPerf cannot be imported: {}".format(e))
+        cls.TestPerf = TestPerf
+
+    def testMeasure(self):
+        calls = []
+        bench = self.TestPerf.Benchmark(
+            "counter",
+            lambda: calls.append("run"),
+            setup=lambda: calls.append("setup"),
+            teardown=lambda: calls.append("teardown"),
+        )
+        stats = bench.measure(repeat=3, warmup=2)
+        self.assertEqual(calls, ["setup", "run", "teardown"] * 5)
+        self.assertEqual(len(stats["times"]), 3)
+        self.assertEqual(stats["min"], min(stats["times"]))
+        self.assertEqual(stats["max"], max(stats["times"]))
+        self.assertLessEqual(stats["min"], stats["median"])
+        self.assertLessEqual(stats["median"], stats["max"])
+        self.assertGreaterEqual(stats["stdev"], 0.0)
+
+        stats = bench.measure(repeat=1, warmup=0)
+        self.assertEqual(stats["stdev"], 0.0)
+        with self.assertRaises(ValueError):
+            bench.measure(repeat=0)
+
+    def testModelBenchmarkIsAbstract(self):
+        with self.assertRaises(TypeError):
+            self.TestPerf.ModelBenchmark("model:operation", "model.FCStd")
+
+    def testCompareResults(self):
+        base = {
+            "results": {
+                "faster": {"median": 1.0, "stdev": 0.01},
+                "noisy": {"median": 1.0, "stdev": 0.2},
+                "same": {"median": 1.0, "stdev": 0.01},
+                "slower": {"median": 1.0, "stdev": 0.01},
+                "removed": {"median": 1.0, "stdev": 0.01},
+            }
+        }
+        new = {
+            "results": {
+                "faster": {"median": 0.5, "stdev": 0.01},
+                "noisy": {"median": 1.3, "stdev": 0.01},
+                "same": {"median": 1.05, "stdev": 0.01},
+                "slower": {"median": 1.5, "stdev": 0.01},
+                "added": {"median": 2.0, "stdev": 0.01},
+            }
+        }
+        comparison = self.TestPerf.compareResults(base, new, threshold=0.1)
+        entries = {entry[0]: entry for entry in comparison}
+        self.assertEqual([entry[0] for entry in comparison], sorted(entries))
+        self.assertEqual(entries["faster"][4], "improvement")
+        self.assertEqual(entries["noisy"][4], "")
+        self.assertEqual(entries["same"][4], "")
+        self.assertEqual(entries["slower"], ("slower", 1.0, 1.5, 1.5, "regression"))
+        self.assertEqual(entries["removed"], ("removed", 1.0, None, None, "missing"))
+        self.assertEqual(entries["added"], ("added", None, 2.0, None, "missing"))
+
+    def testParseArguments(self):
+        argv = ["FreeCAD", "-t", "TestPerf.BenchmarkTestCase", "--pass", "--benchmark"]
+        args = self.TestPerf.parseArguments(
+            argv + ["a.FCStd", "b.FCStd", "--repeat", "3", "--only", "open", "--only", "save"]
+        )
+        self.assertEqual(args.models, ["a.FCStd", "b.FCStd"])
+        self.assertEqual(args.repeat, 3)
+        self.assertEqual(args.warmup, 1)
+        self.assertEqual(args.only, ["open", "save"])
+        self.assertIsNone(args.compare)
+
+        args = self.TestPerf.parseArguments(
+            argv + ["--compare", "base.json", "new.json", "--threshold", "0.2", "--warmup", "0"]
+        )
+        self.assertEqual(args.models, [])
+        self.assertEqual(args.compare, ["base.json", "new.json"])
+        self.assertEqual(args.threshold, 0.2)
+        self.assertEqual(args.warmup, 0)
+
+        for invalid in (["--repeat", "0"], ["--repeat", "x"], ["--warmup", "-1"]):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                self.TestPerf.parseArguments(argv + invalid)
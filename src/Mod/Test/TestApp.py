@@ -22,8 +22,14 @@
 # ***************************************************************************/
 
 import FreeCAD
+import json
+import os
+import subprocess
 import sys
+import tempfile
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 
 # ---------------------------------------------------------------------------
@@ -81,10 +87,58 @@ def PrintAll():
     return suite
 
 
-def TestText(s):
+class TimedTextTestResult(unittest.TextTestResult):
+    "TextTestResult that records the outcome and the duration of every test."
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.records = []
+        self._start = None
+
+    def startTest(self, test):
+        self._start = time.perf_counter()
+        super().startTest(test)
+
+    def _record(self, test, outcome, details=""):
+        duration = time.perf_counter() - self._start if self._start is not None else 0.0
+        self.records.append(
+            {"id": test.id(), "outcome": outcome, "time": duration, "details": details}
+        )
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, "success")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, "failure", self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, "error", self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, "skipped", reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, "success")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, "failure", "Unexpected success")
+
+
+def TestText(s, resultFile=None):
+    """Runs the tests named s and prints a report. If resultFile is given, the
+    outcome and duration of each test are also written to it as JSON."""
     s = unittest.defaultTestLoader.loadTestsFromName(s)
-    r = unittest.TextTestRunner(stream=sys.stdout, verbosity=2)
+    r = unittest.TextTestRunner(stream=sys.stdout, verbosity=2, resultclass=TimedTextTestResult)
     retval = r.run(s)
+    if resultFile:
+        with open(resultFile, "w", encoding="utf-8") as f:
+            json.dump(retval.records, f)
     # Flushing to make sure the stream is written to the console
     # before the wrapping process stops executing. Without this line
     # executing the tests from command line did not show stats
@@ -110,3 +164,171 @@ def testDocument():
     suite = unittest.TestSuite()
     suite.addTest(unittest.defaultTestLoader.loadTestsFromName("Document"))
     TestText(suite)
+
+
+# ---------------------------------------------------------------------------
+# run the registered tests in parallel worker processes
+# ---------------------------------------------------------------------------
+
+
+def getTestExecutable():
+    "Returns the path of the FreeCADCmd executable used to run test workers."
+
+    exe = os.environ.get("FREECAD_TEST_EXECUTABLE")
+    if exe:
+        return exe
+    name = "FreeCADCmd.exe" if sys.platform == "win32" else "FreeCADCmd"
+    return os.path.join(FreeCAD.getHomePath(), "bin", name)
+
+
+def runTestModule(testName, timeout, executable=None):
+    """Runs the test module testName in a separate FreeCADCmd process. Returns
+    the list of test records written by the worker (see TimedTextTestResult).
+    If the worker times out or exits without writing results, a single error
+    record is returned for the whole module."""
+
+    fd, resultFile = tempfile.mkstemp(prefix="fctest_", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, FREECAD_TEST_RESULT_FILE=resultFile)
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [executable or getTestExecutable(), "-t", testName],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=timeout,
+        )
+        output = proc.stdout.decode("utf-8", "replace")
+        try:
+            with open(resultFile, encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            records = None
+        if not records:
+            details = "Worker exited with code {} without results:\n{}".format(
+                proc.returncode, output[-4000:]
+            )
+            records = [{"id": testName, "outcome": "error", "details": details}]
+    except subprocess.TimeoutExpired:
+        details = "Timed out after {} s".format(timeout)
+        records = [{"id": testName, "outcome": "error", "details": details}]
+    finally:
+        os.remove(resultFile)
+
+    for record in records:
+        record["module"] = testName
+        record.setdefault("time", time.perf_counter() - start)
+    return records
+
+
+def writeJUnitXml(records, fileName):
+    "Writes test records collected by the parallel runner as JUnit XML."
+
+    import xml.etree.ElementTree as ET
+
+    root = ET.Element("testsuites")
+    suites = {}
+    for record in records:
+        suite = suites.get(record["module"])
+        if suite is None:
+            suite = ET.SubElement(root, "testsuite", name=record["module"])
+            suites[record["module"]] = suite
+        className, _, name = record["id"].rpartition(".")
+        case = ET.SubElement(
+            suite,
+            "testcase",
+            classname=className or record["module"],
+            name=name,
+            time="{:.3f}".format(record["time"]),
+        )
+        if record["outcome"] in ("failure", "error", "skipped"):
+            elem = ET.SubElement(case, record["outcome"])
+            elem.text = record["details"]
+
+    for name, suite in suites.items():
+        cases = [record for record in records if record["module"] == name]
+        suite.set("tests", str(len(cases)))
+        for outcome, attribute in (
+            ("failure", "failures"),
+            ("error", "errors"),
+            ("skipped", "skipped"),
+        ):
+            count = len([record for record in cases if record["outcome"] == outcome])
+            suite.set(attribute, str(count))
+        suite.set("time", "{:.3f}".format(sum(record["time"] for record in cases)))
+
+    ET.ElementTree(root).write(fileName, encoding="utf-8", xml_declaration=True)
+
+
+class RecordedTest(unittest.TestCase):
+    "Replays the outcome of a test that was run in a worker process."
+
+    def __init__(self, record):
+        super().__init__("replay")
+        self.record = record
+
+    def id(self):
+        return self.record["id"]
+
+    def __str__(self):
+        return "{} ({:.2f} s)".format(self.record["id"], self.record["time"])
+
+    def shortDescription(self):
+        return None
+
+    def replay(self):
+        outcome = self.record["outcome"]
+        if outcome == "failure":
+            self.fail(self.record["details"])
+        elif outcome == "error":
+            raise RuntimeError(self.record["details"])
+        elif outcome == "skipped":
+            self.skipTest(self.record["details"])
+
+
+def testParallel(tests=None, jobs=None, timeout=None, junitFile=None, slowest=20):
+    """Runs the registered test modules (or the given list of test names) in
+    parallel FreeCADCmd worker processes, at most jobs at a time, each module
+    being stopped after timeout seconds. Returns the list of test records.
+    The results are written to junitFile as JUnit XML if it is given, and the
+    slowest tests are printed."""
+
+    tests = list(FreeCAD.__unit_test__ if tests is None else tests)
+    jobs = jobs or os.cpu_count() or 1
+    executable = getTestExecutable()
+
+    records = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(runTestModule, test, timeout, executable) for test in tests]
+        for future in futures:
+            records.extend(future.result())
+
+    if junitFile:
+        writeJUnitXml(records, junitFile)
+
+    if slowest:
+        FreeCAD.Console.PrintMessage("\nSlowest tests:\n")
+        for record in sorted(records, key=lambda record: record["time"], reverse=True)[:slowest]:
+            FreeCAD.Console.PrintMessage("{:10.3f} s  {}\n".format(record["time"], record["id"]))
+    return records
+
+
+def Parallel():
+    """Runs all registered tests in parallel worker processes, and returns a
+    suite replaying their results, so that they are reported like the
+    serial run. Use it with 'FreeCADCmd -t TestApp.Parallel'. It is
+    configured with the environment variables FREECAD_TEST_JOBS,
+    FREECAD_TEST_TIMEOUT (seconds per module) and FREECAD_TEST_JUNIT
+    (path of the JUnit XML report)."""
+
+    jobs = int(os.environ.get("FREECAD_TEST_JOBS", 0)) or None
+    timeout = float(os.environ.get("FREECAD_TEST_TIMEOUT", 0)) or None
+    records = testParallel(
+        jobs=jobs, timeout=timeout, junitFile=os.environ.get("FREECAD_TEST_JUNIT")
+    )
+
+    suite = unittest.TestSuite()
+    for record in records:
+        suite.addTest(RecordedTest(record))
+    return suite
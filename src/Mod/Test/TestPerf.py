@@ -21,7 +21,15 @@
 # *                                                                         *
 # ***************************************************************************
 
+import abc
+import argparse
+import json
+import os
+import platform
+import statistics
 import sys
+import tempfile
+import time
 import unittest
 import FreeCAD as App
 import Part
@@ -54,6 +62,8 @@ class PerfTestCase(unittest.TestCase):
     """
 
     def setUp(self):
+        if "--benchmark" in sys.argv:
+            self.skipTest("Benchmark run, see BenchmarkTestCase")
         if "--pass" in sys.argv:
             self.fileList = sys.argv[sys.argv.index("--pass") + 1 :]
         else:
@@ -111,3 +121,351 @@ class PerfTestCase(unittest.TestCase):
             profile.dump_stats(self.fileList[0] + self.tnp + ".cprofile")
         if Memtest:
             self.memfile.close()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark framework: a registry of timed operations, run repeatedly, with
+# results stored as JSON and compared between runs to flag regressions.
+# ---------------------------------------------------------------------------
+
+# Registered benchmarks. Key = benchmark name, value = Benchmark.
+benchmarks = {}
+
+# Operations run on every model given on the command line.
+# Key = operation name, value = function(fileName) returning a Benchmark.
+modelOperations = {}
+
+
+class Benchmark:
+    """
+    A timed operation. run() is timed; setup() and teardown() are called
+    before and after every timed run, outside of the measurement.
+    """
+
+    def __init__(self, name, run, setup=None, teardown=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+
+    def measure(self, repeat=5, warmup=1):
+        """Runs the benchmark warmup + repeat times and returns the statistics of the
+        timed runs, in seconds."""
+        if repeat < 1 or warmup < 0:
+            raise ValueError("repeat must be at least 1 and warmup at least 0")
+        times = []
+        for i in range(warmup + repeat):
+            if self.setup:
+                self.setup()
+            start = time.perf_counter()
+            self.run()
+            elapsed = time.perf_counter() - start
+            if self.teardown:
+                self.teardown()
+            if i >= warmup:
+                times.append(elapsed)
+        return {
+            "times": times,
+            "min": min(times),
+            "max": max(times),
+            "mean": statistics.mean(times),
+            "median": statistics.median(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        }
+
+
+def registerBenchmark(name, run=None, setup=None, teardown=None):
+    """Registers a benchmark without model, e.g. a hot path of a workbench. Can be used
+    as a decorator: @registerBenchmark("Part.booleanFragments")"""
+    if run is None:
+        return lambda func: registerBenchmark(name, func, setup, teardown)
+    benchmarks[name] = Benchmark(name, run, setup, teardown)
+    return run
+
+
+def registerModelOperation(name, factory=None):
+    """Registers an operation to benchmark on each model. factory(name, fileName) returns
+    a Benchmark. Can be used as a decorator."""
+    if factory is None:
+        return lambda func: registerModelOperation(name, func)
+    modelOperations[name] = factory
+    return factory
+
+
+class ModelBenchmark(Benchmark, abc.ABC):
+    """Base of the model operations, keeping the document open between the timed runs.
+    Subclasses implement runOperation()."""
+
+    def __init__(self, name, fileName):
+        super().__init__(name, self.runOperation, self.setupOperation, self.teardownOperation)
+        self.fileName = fileName
+        self.doc = None
+        self.tempDir = None
+
+    def open(self):
+        if self.doc is None:
+            self.doc = App.openDocument(self.fileName)
+        return self.doc
+
+    def close(self):
+        if self.doc is not None:
+            App.closeDocument(self.doc.Name)
+            self.doc = None
+
+    def tempFile(self, suffix):
+        if self.tempDir is None:
+            self.tempDir = tempfile.TemporaryDirectory(prefix="fcbench_")
+        return os.path.join(self.tempDir.name, "benchmark" + suffix)
+
+    def measure(self, repeat=5, warmup=1):
+        try:
+            return super().measure(repeat, warmup)
+        finally:
+            self.close()
+            if self.tempDir is not None:
+                self.tempDir.cleanup()
+                self.tempDir = None
+
+    def setupOperation(self):
+        pass
+
+    @abc.abstractmethod
+    def runOperation(self):
+        pass
+
+    def teardownOperation(self):
+        pass
+
+
+@registerModelOperation("open")
+class OpenBenchmark(ModelBenchmark):
+    def runOperation(self):
+        self.open()
+
+    def teardownOperation(self):
+        self.close()
+
+
+@registerModelOperation("recompute")
+class RecomputeBenchmark(ModelBenchmark):
+    def setupOperation(self):
+        for obj in self.open().Objects:
+            obj.touch()
+
+    def runOperation(self):
+        self.doc.recompute()
+
+
+@registerModelOperation("save")
+class SaveBenchmark(ModelBenchmark):
+    def setupOperation(self):
+        self.open()
+
+    def runOperation(self):
+        self.doc.saveAs(self.tempFile(".FCStd"))
+
+
+@registerModelOperation("exportStep")
+class ExportStepBenchmark(ModelBenchmark):
+    def setupOperation(self):
+        self.objects = [obj for obj in self.open().RootObjects if hasattr(obj, "Shape")]
+
+    def runOperation(self):
+        Part.export(self.objects, self.tempFile(".step"))
+
+
+def _boxGrid(count):
+    "Returns count x count touching boxes."
+    return [Part.makeBox(1, 1, 1, App.Vector(i, j, 0)) for i in range(count) for j in range(count)]
+
+
+@registerBenchmark("Part.booleanFragments")
+def _benchBooleanFragments():
+    from BOPTools import SplitAPI
+
+    SplitAPI.booleanFragments(_boxGrid(10), "Split")
+
+
+@registerBenchmark("Part.mergeSolids")
+def _benchMergeSolids():
+    from BOPTools import ShapeMerge
+
+    boxes = _boxGrid(10)
+    ShapeMerge.mergeSolids(boxes[0].generalFuse(boxes[1:])[0].Solids)
+
+
+def collectBenchmarks(fileList, only=None):
+    "Returns the benchmarks to run: the registered ones plus the operations on each model."
+    selected = list(benchmarks.values())
+    for fileName in fileList:
+        for operation, factory in modelOperations.items():
+            name = "{}:{}".format(os.path.basename(fileName), operation)
+            selected.append(factory(name, fileName))
+    if only:
+        selected = [bench for bench in selected if any(pattern in bench.name for pattern in only)]
+    return selected
+
+
+def runBenchmarks(fileList, repeat=5, warmup=1, only=None):
+    "Runs the benchmarks and returns the results, as stored in JSON files."
+    results = {}
+    for bench in collectBenchmarks(fileList, only):
+        App.Console.PrintMessage("Benchmark {} ...\n".format(bench.name))
+        results[bench.name] = bench.measure(repeat, warmup)
+    return {
+        "meta": {
+            "version": ".".join(App.Version()[:3]),
+            "revision": App.Version()[3] if len(App.Version()) > 3 else "",
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "tnp": Part.Shape().ElementMapVersion != "",
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def saveResults(results, fileName):
+    with open(fileName, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def loadResults(fileName):
+    with open(fileName, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compareResults(base, new, threshold=0.1):
+    """Compares the median times of two result sets. Returns a list of
+    (name, base median, new median, ratio, status) where status is "regression" when the
+    new time is more than threshold slower and the difference is above the spread of the
+    base measurements, "improvement" for the opposite, and "" otherwise. Benchmarks only
+    found in one result set have None for the missing values."""
+    comparison = []
+    baseResults = base["results"]
+    newResults = new["results"]
+    for name in sorted(set(baseResults) | set(newResults)):
+        if name not in baseResults or name not in newResults:
+            old = baseResults.get(name, {}).get("median")
+            cur = newResults.get(name, {}).get("median")
+            comparison.append((name, old, cur, None, "missing"))
+            continue
+        old = baseResults[name]["median"]
+        cur = newResults[name]["median"]
+        noise = 2 * baseResults[name].get("stdev", 0.0)
+        ratio = cur / old if old > 0 else float("inf")
+        status = ""
+        if ratio > 1 + threshold and cur - old > noise:
+            status = "regression"
+        elif ratio < 1 - threshold and old - cur > noise:
+            status = "improvement"
+        comparison.append((name, old, cur, ratio, status))
+    return comparison
+
+
+def printResults(results):
+    App.Console.PrintMessage(
+        "\n{:40} {:>10} {:>10} {:>10}\n".format("Benchmark", "median", "min", "stdev")
+    )
+    for name, stats in results["results"].items():
+        App.Console.PrintMessage(
+            "{:40} {:10.4f} {:10.4f} {:10.4f}\n".format(
+                name, stats["median"], stats["min"], stats["stdev"]
+            )
+        )
+
+
+def printComparison(comparison):
+    def fmt(value):
+        return "{:10.4f}".format(value) if value is not None else "{:>10}".format("-")
+
+    App.Console.PrintMessage(
+        "\n{:40} {:>10} {:>10} {:>7}\n".format("Benchmark", "base", "new", "ratio")
+    )
+    for name, old, cur, ratio, status in comparison:
+        App.Console.PrintMessage(
+            "{:40} {} {} {:>7} {}\n".format(
+                name, fmt(old), fmt(cur), "{:.2f}".format(ratio) if ratio else "-", status
+            )
+        )
+
+
+def _count(value, minimum):
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid count: {!r}".format(value))
+    if count < minimum:
+        raise argparse.ArgumentTypeError("must be at least {}, got {}".format(minimum, count))
+    return count
+
+
+def _positiveInt(value):
+    return _count(value, 1)
+
+
+def _nonNegativeInt(value):
+    return _count(value, 0)
+
+
+def parseArguments(argv):
+    "Parses the benchmark arguments given after --pass --benchmark."
+    parser = argparse.ArgumentParser(
+        prog="FreeCAD -t TestPerf.BenchmarkTestCase --pass --benchmark"
+    )
+    parser.add_argument("models", nargs="*", help="model files to benchmark")
+    parser.add_argument("--repeat", type=_positiveInt, default=5, help="number of timed runs")
+    parser.add_argument("--warmup", type=_nonNegativeInt, default=1, help="number of untimed runs")
+    parser.add_argument("--only", action="append", help="run benchmarks whose name contains this")
+    parser.add_argument("--output", help="JSON file to store the results in")
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="RESULTS",
+        help="compare with a stored result set; with two files, compare them without running",
+    )
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown flagged")
+    if "--benchmark" in argv:
+        argv = argv[argv.index("--benchmark") + 1 :]
+    return parser.parse_args(argv)
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    """
+    Runs the registered benchmarks and the model operations on the given models, and
+    optionally stores the results and compares them with an earlier result set. The test
+    fails if a regression is flagged.
+
+    Intended to be run headless as:
+    FreeCADCmd -t TestPerf.BenchmarkTestCase --pass --benchmark [models] [--output new.json]
+    [--compare base.json] [--repeat 5] [--only name]
+    or to compare two stored result sets without running anything:
+    FreeCADCmd -t TestPerf.BenchmarkTestCase --pass --benchmark --compare base.json new.json
+    """
+
+    def setUp(self):
+        if "--benchmark" not in sys.argv:
+            self.skipTest("Pass --benchmark to run the benchmarks")
+        self.args = parseArguments(sys.argv)
+
+    def testBenchmarks(self):
+        args = self.args
+        compare = args.compare or []
+        if len(compare) > 2:
+            self.fail("--compare takes one or two result files")
+        if len(compare) == 2:
+            base, new = loadResults(compare[0]), loadResults(compare[1])
+        else:
+            new = runBenchmarks(args.models, args.repeat, args.warmup, args.only)
+            if args.output:
+                saveResults(new, args.output)
+            if not compare:
+                printResults(new)
+                return
+            base = loadResults(compare[0])
+
+        comparison = compareResults(base, new, args.threshold)
+        printComparison(comparison)
+        regressions = [entry[0] for entry in comparison if entry[4] == "regression"]
+        self.assertFalse(regressions, "Performance regressions: " + ", ".join(regressions))